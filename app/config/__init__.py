@@ -10,10 +10,12 @@ class Config(BaseModel):
     app_name: str
     enable_cors: bool
     log_level: str
-    database: dict[str, str | bool]  # Using dict to allow flexible merging
+    database: dict[str, str | int | float | bool | list[str] | None]  # Using dict to allow flexible merging
     features: dict[str, bool]
-    redis: dict[str, str | int ]
-    env: dict[str, str | int | bool]
+    redis: dict[str, str | int | bool]
+    logging: dict[str, str | int | float | bool | list[str]]
+    auth: dict[str, str | int | float]
+    env: dict[str, str | int | float | bool | list[str] | None]
 
 
 # Environment-specific configurations
@@ -34,6 +36,8 @@ config: Config = Config(
     database=env_config.database.model_dump(),
     features=env_config.features.model_dump(),
     redis=env_config.redis.model_dump(),
+    logging=env_config.logging.model_dump(),
+    auth=env_config.auth.model_dump(),
     env=env.model_dump(),
 )
 
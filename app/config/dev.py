@@ -4,6 +4,16 @@ from pydantic import BaseModel, HttpUrl
 class DatabaseConfig(BaseModel):
     url: HttpUrl | str = "sqlite+aiosqlite:///./database.db"
     logging: bool = True
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: float = 30
+    pool_recycle: int = 1800
+    pool_pre_ping: bool = True
+    statement_cache_size: int = 100
+    replica_urls: list[str] = []
+    replica_cooldown: int = 30
+    replica_max_lag: int = 2
+    stats_reconcile_interval: int = 3600
 
 
 class FeaturesConfig(BaseModel):
@@ -13,9 +23,41 @@ class FeaturesConfig(BaseModel):
 class RedisConfig(BaseModel):
     url: HttpUrl | str = "redis://localhost"
     cache_expire: int = 300
+    warm_chunk_size: int = 500
+    warm_in_background: bool = True
+    local_cache_enabled: bool = True
+    local_cache_max_entries: int = 10_000
+    local_cache_max_bytes: int = 64 * 1024 * 1024
+    local_cache_ttl: int = 30
+    invalidation_channel: str = "fastapi-cache:invalidate"
+    stampede_lock_ttl_ms: int = 3000
+    stampede_wait_timeout_ms: int = 3000
+    stale_while_revalidate: int = 0
+
+
+class LoggingConfig(BaseModel):
+    sample_rate: float = 1.0
+    body_max_bytes: int = 2048
+    log_bodies_on_error: bool = True
+    body_routes: list[str] = []
+
+
+class AuthConfig(BaseModel):
+    argon2_time_cost: int = 3
+    argon2_memory_cost: int = 64 * 1024
+    argon2_parallelism: int = 4
+    hash_workers: int = 2
+    strength_workers: int = 1
+    token_cache_max_entries: int = 10_000
+    revocation_filter_capacity: int = 100_000
+    revocation_error_rate: float = 0.001
+    revocation_channel: str = "auth:revoked"
+    revocation_sync_interval: int = 60
 
 
 class DevConfig(BaseModel):
     database: DatabaseConfig = DatabaseConfig()
     features: FeaturesConfig = FeaturesConfig()
     redis: RedisConfig = RedisConfig()
+    logging: LoggingConfig = LoggingConfig()
+    auth: AuthConfig = AuthConfig()
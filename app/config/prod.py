@@ -5,6 +5,16 @@ from app.core.env import env
 class DatabaseConfig(BaseModel):
     url: HttpUrl | str | None = env.DB_URL  # Use validated env variable
     logging: bool = False
+    pool_size: int = env.DB_POOL_SIZE
+    max_overflow: int = env.DB_MAX_OVERFLOW
+    pool_timeout: float = env.DB_POOL_TIMEOUT
+    pool_recycle: int = env.DB_POOL_RECYCLE
+    pool_pre_ping: bool = env.DB_POOL_PRE_PING
+    statement_cache_size: int = env.DB_STATEMENT_CACHE_SIZE
+    replica_urls: list[str] = env.DB_REPLICA_URLS
+    replica_cooldown: int = env.DB_REPLICA_COOLDOWN
+    replica_max_lag: int = env.DB_REPLICA_MAX_LAG
+    stats_reconcile_interval: int = env.STATS_RECONCILE_INTERVAL
 
 
 class FeaturesConfig(BaseModel):
@@ -14,9 +24,41 @@ class FeaturesConfig(BaseModel):
 class RedisConfig(BaseModel):
     url: HttpUrl | str | None = env.REDIS_URL  # Use validated env variable
     cache_expire: int | None = env.REDIS_CACHE_EXPIRE
+    warm_chunk_size: int = env.REDIS_WARM_CHUNK_SIZE
+    warm_in_background: bool = env.REDIS_WARM_IN_BACKGROUND
+    local_cache_enabled: bool = env.LOCAL_CACHE_ENABLED
+    local_cache_max_entries: int = env.LOCAL_CACHE_MAX_ENTRIES
+    local_cache_max_bytes: int = env.LOCAL_CACHE_MAX_BYTES
+    local_cache_ttl: int = env.LOCAL_CACHE_TTL
+    invalidation_channel: str = env.CACHE_INVALIDATION_CHANNEL
+    stampede_lock_ttl_ms: int = env.CACHE_STAMPEDE_LOCK_TTL_MS
+    stampede_wait_timeout_ms: int = env.CACHE_STAMPEDE_WAIT_TIMEOUT_MS
+    stale_while_revalidate: int = env.CACHE_STALE_WHILE_REVALIDATE
+
+
+class LoggingConfig(BaseModel):
+    sample_rate: float = env.LOG_SAMPLE_RATE
+    body_max_bytes: int = env.LOG_BODY_MAX_BYTES
+    log_bodies_on_error: bool = env.LOG_BODIES_ON_ERROR
+    body_routes: list[str] = env.LOG_BODY_ROUTES
+
+
+class AuthConfig(BaseModel):
+    argon2_time_cost: int = env.ARGON2_TIME_COST
+    argon2_memory_cost: int = env.ARGON2_MEMORY_COST
+    argon2_parallelism: int = env.ARGON2_PARALLELISM
+    hash_workers: int = env.PASSWORD_HASH_WORKERS
+    strength_workers: int = env.PASSWORD_STRENGTH_WORKERS
+    token_cache_max_entries: int = env.TOKEN_CACHE_MAX_ENTRIES
+    revocation_filter_capacity: int = env.REVOCATION_FILTER_CAPACITY
+    revocation_error_rate: float = env.REVOCATION_ERROR_RATE
+    revocation_channel: str = env.REVOCATION_CHANNEL
+    revocation_sync_interval: int = env.REVOCATION_SYNC_INTERVAL
 
 
 class ProdConfig(BaseModel):
     database: DatabaseConfig = DatabaseConfig()
     features: FeaturesConfig = FeaturesConfig()
     redis: RedisConfig = RedisConfig()
+    logging: LoggingConfig = LoggingConfig()
+    auth: AuthConfig = AuthConfig()
@@ -8,11 +8,20 @@ from .exceptions import (
     UnauthorizedException,
 )
 
-from .dependencies import get_auth_service, get_task_service
+from .dependencies import (
+    get_auth_service,
+    get_current_user,
+    get_task_list_query,
+    get_task_service,
+    require_auth,
+)
 
 __all__ = [
     "get_auth_service",
+    "get_current_user",
+    "get_task_list_query",
     "get_task_service",
+    "require_auth",
     "AppException",
     "ConflictException",
     "InvalidUserPasswordException",
@@ -0,0 +1,346 @@
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, override
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.redis import RedisBackend
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from app.utils import main_logger
+from .db import replica_cache_expire
+
+# Sentinel stored for keys Redis does not have, so repeated misses on small
+# control keys (e.g. a version counter that was never bumped) stay local.
+_MISSING = object()
+
+
+class LocalCache:
+    """In-process LRU with a per-entry TTL, bounded by entry count and bytes."""
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl: float) -> None:
+        self.max_entries: int = max_entries
+        self.max_bytes: int = max_bytes
+        self.ttl: float = ttl
+        self.size_bytes: int = 0
+        self._entries: OrderedDict[str, tuple[object, float, int]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> tuple[object, float] | None:
+        """Returns (value, seconds left) or None when absent or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at, _ = entry
+        remaining = expires_at - time.monotonic()
+        if remaining <= 0:
+            self.delete(key)
+            return None
+        self._entries.move_to_end(key)
+        return value, remaining
+
+    def set(self, key: str, value: object, ttl: float | None = None) -> None:
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        size = len(value) if isinstance(value, (str, bytes)) else 0
+        if ttl <= 0 or size > self.max_bytes:
+            self.delete(key)
+            return
+        self.delete(key)
+        self._entries[key] = (value, time.monotonic() + ttl, size)
+        self.size_bytes += size
+        while len(self._entries) > self.max_entries or self.size_bytes > self.max_bytes:
+            _, (_, _, evicted_size) = self._entries.popitem(last=False)
+            self.size_bytes -= evicted_size
+
+    def delete(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size_bytes -= entry[2]
+
+    def clear(self, prefix: str | None = None) -> int:
+        keys = [k for k in self._entries if prefix is None or k.startswith(prefix)]
+        for key in keys:
+            self.delete(key)
+        return len(keys)
+
+
+class CacheMetrics:
+    """Process-wide counters for the task cache read path."""
+
+    def __init__(self) -> None:
+        self.hits: int = 0
+        self.local_hits: int = 0
+        self.misses: int = 0
+        self.coalesced: int = 0
+        self.stale_served: int = 0
+        self.lock_waits: int = 0
+        self.wait_timeouts: int = 0
+
+    def snapshot(self) -> dict[str, int]:
+        return dict(vars(self))
+
+
+cache_metrics: CacheMetrics = CacheMetrics()
+
+# Recomputes the current request leads, as (key, future) pairs; set by
+# `release_recomputes` around a cached handler.
+_leading: ContextVar[list[tuple[str, "asyncio.Future[bytes | None]"]] | None] = ContextVar(
+    "leading", default=None
+)
+
+
+class CoalescingRedisBackend(RedisBackend):
+    """
+    Redis backend that lets only one caller recompute a missing entry.
+
+    Within a worker, concurrent misses on a key wait for the first caller's
+    `set()` instead of running the query themselves. Across workers, that
+    caller also takes a short `SET NX PX` lock; a worker that loses the lock
+    polls Redis for the winner's value. With `stale_ttl` set, every entry is
+    shadowed by a longer-lived copy that waiters get while the refresh runs.
+    A waiter that times out computes the value itself.
+
+    A recompute that fails never reaches `set()`; handlers wrapped in
+    `release_recomputes` hand it back so waiters stop waiting at once.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        lock_ttl_ms: int = 3000,
+        wait_timeout: float = 3.0,
+        stale_ttl: int = 0,
+        poll_interval: float = 0.05,
+    ) -> None:
+        super().__init__(redis=redis)
+        # A lock left by a crashed worker must expire before waiters give up,
+        # or every later miss waits out the full timeout.
+        self.lock_ttl_ms: int = min(lock_ttl_ms, int(wait_timeout * 1000))
+        self.wait_timeout: float = wait_timeout
+        self.stale_ttl: int = stale_ttl
+        self.poll_interval: float = poll_interval
+        # key -> (future resolved by set() or release(), loop time the
+        # recompute started); None tells waiters to compute it themselves.
+        self._in_flight: dict[str, tuple[asyncio.Future[bytes | None], float]] = {}
+        self._locks: set[str] = set()
+
+    @override
+    async def get_with_ttl(self, key: str) -> tuple[int, bytes | None]:
+        ttl, value = await super().get_with_ttl(key)  # pyright: ignore[reportUnknownVariableType]
+        if value is not None:
+            cache_metrics.hits += 1
+            return ttl, value  # pyright: ignore[reportUnknownVariableType]
+        stale: bytes | None = (
+            await self.redis.get(self.stale_key(key)) if self.stale_ttl else None  # pyright: ignore[reportUnknownMemberType]
+        )
+
+        loop = asyncio.get_running_loop()
+        in_flight = self._in_flight.get(key)
+        # A recompute older than the wait timeout has failed without calling
+        # set(); the next caller takes over.
+        if in_flight is not None and loop.time() - in_flight[1] < self.wait_timeout:
+            if stale is not None:
+                cache_metrics.stale_served += 1
+                return 0, stale
+            cache_metrics.coalesced += 1
+            return 0, await self._wait(key, in_flight[0])
+
+        future: asyncio.Future[bytes | None] = loop.create_future()
+        self._in_flight[key] = (future, loop.time())
+        leading = _leading.get()
+        if leading is not None:
+            leading.append((key, future))
+        locked = await self.redis.set(  # pyright: ignore[reportUnknownMemberType]
+            self.lock_key(key), b"1", nx=True, px=self.lock_ttl_ms
+        )
+        if locked:
+            # This caller recomputes; set() releases the lock and the waiters.
+            self._locks.add(key)
+            cache_metrics.misses += 1
+            return 0, None
+        if stale is not None:
+            cache_metrics.stale_served += 1
+            self._resolve(key, stale)
+            return 0, stale
+        cache_metrics.lock_waits += 1
+        value = await self._poll(key)
+        if value is not None:
+            self._resolve(key, value)
+            return 0, value
+        cache_metrics.misses += 1
+        return 0, None
+
+    @override
+    async def set(self, key: str, value: bytes, expire: int | None = None) -> None:
+        expire = replica_cache_expire(expire)
+        async with self.redis.pipeline(transaction=False) as pipe:  # pyright: ignore[reportUnknownMemberType, reportUnknownVariableType]
+            _ = pipe.set(key, value, ex=expire)  # pyright: ignore[reportUnknownMemberType]
+            if self.stale_ttl:
+                _ = pipe.set(  # pyright: ignore[reportUnknownMemberType]
+                    self.stale_key(key), value, ex=(expire or 0) + self.stale_ttl
+                )
+            if key in self._locks:
+                self._locks.discard(key)
+                _ = pipe.delete(self.lock_key(key))  # pyright: ignore[reportUnknownMemberType]
+            _ = await pipe.execute()  # pyright: ignore[reportUnknownMemberType]
+        self._resolve(key, value)
+
+    async def release(self, key: str, future: "asyncio.Future[bytes | None]") -> None:
+        """Gives up a recompute that will not call `set()`, waking its waiters."""
+        in_flight = self._in_flight.get(key)
+        if in_flight is None or in_flight[0] is not future:
+            return
+        del self._in_flight[key]
+        if not future.done():
+            future.set_result(None)
+        if key in self._locks:
+            self._locks.discard(key)
+            try:
+                _ = await self.redis.delete(self.lock_key(key))  # pyright: ignore[reportUnknownMemberType]
+            except RedisError as e:
+                # The lock expires on its own; don't mask the handler's error.
+                main_logger.warning(f"Could not release cache lock for {key}: {e}")
+
+    @staticmethod
+    def stale_key(key: str) -> str:
+        return f"{key}:stale"
+
+    @staticmethod
+    def lock_key(key: str) -> str:
+        return f"{key}:lock"
+
+    async def _wait(self, key: str, future: asyncio.Future[bytes | None]) -> bytes | None:
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), self.wait_timeout)
+        except TimeoutError:
+            # The computing request is stuck; the next caller starts afresh.
+            cache_metrics.wait_timeouts += 1
+            in_flight = self._in_flight.get(key)
+            if in_flight is not None and in_flight[0] is future:
+                del self._in_flight[key]
+            return None
+
+    async def _poll(self, key: str) -> bytes | None:
+        deadline = asyncio.get_running_loop().time() + self.wait_timeout
+        while asyncio.get_running_loop().time() < deadline:
+            await asyncio.sleep(self.poll_interval)
+            _, value = await super().get_with_ttl(key)  # pyright: ignore[reportUnknownVariableType]
+            if value is not None:
+                return value  # pyright: ignore[reportUnknownVariableType]
+            if not await self.redis.exists(self.lock_key(key)):  # pyright: ignore[reportUnknownMemberType]
+                break
+        cache_metrics.wait_timeouts += 1
+        return None
+
+    def _resolve(self, key: str, value: bytes) -> None:
+        in_flight = self._in_flight.pop(key, None)
+        if in_flight is not None and not in_flight[0].done():
+            in_flight[0].set_result(value)
+
+
+def release_recomputes[**P, R](
+    func: Callable[P, Awaitable[R]],
+) -> Callable[P, Awaitable[R]]:
+    """
+    Wraps a `@cache`-decorated handler (put it above `@cache`).
+
+    If the handler raises, or its result never reaches Redis, the recompute
+    its cache miss started is released instead of blocking the key's waiters
+    until they time out.
+    """
+
+    @wraps(func)
+    async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+        leading: list[tuple[str, asyncio.Future[bytes | None]]] = []
+        token = _leading.set(leading)
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            _leading.reset(token)
+            backend = FastAPICache.get_backend() if leading else None
+            if isinstance(backend, CoalescingRedisBackend):
+                for key, future in leading:
+                    await backend.release(key, future)
+
+    return wrapper
+
+
+class TieredRedisBackend(CoalescingRedisBackend):
+    """
+    Redis backend with an in-process L1 tier in front of it.
+
+    Task cache entries are immutable under their versioned keys, so the L1
+    copy can only go stale for the per-user version keys. Those are dropped in
+    every worker through a Redis pub/sub message when a write bumps them; the
+    L1 TTL bounds staleness if a message is ever missed.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        local: LocalCache,
+        channel: str,
+        **coalescing: Any,  # pyright: ignore[reportExplicitAny, reportAny]
+    ) -> None:
+        super().__init__(redis=redis, **coalescing)  # pyright: ignore[reportAny]
+        self.local: LocalCache = local
+        self.channel: str = channel
+
+    @override
+    async def get_with_ttl(self, key: str) -> tuple[int, bytes | None]:
+        entry = self.local.get(key)
+        if entry is not None and entry[0] is not _MISSING:
+            cache_metrics.local_hits += 1
+            return int(entry[1]), entry[0]  # pyright: ignore[reportReturnType]
+        ttl, value = await super().get_with_ttl(key)  # pyright: ignore[reportUnknownVariableType]
+        if value is not None:
+            # A negative TTL means the key has no expiry in Redis.
+            self.local.set(key, value, ttl=ttl if ttl >= 0 else None)
+        return ttl, value  # pyright: ignore[reportUnknownVariableType]
+
+    @override
+    async def get(self, key: str) -> bytes | None:
+        entry = self.local.get(key)
+        if entry is not None:
+            return None if entry[0] is _MISSING else entry[0]  # pyright: ignore[reportReturnType]
+        value = await super().get(key)  # pyright: ignore[reportUnknownVariableType]
+        self.local.set(key, _MISSING if value is None else value)
+        return value  # pyright: ignore[reportUnknownVariableType]
+
+    @override
+    async def set(self, key: str, value: bytes, expire: int | None = None) -> None:
+        expire = replica_cache_expire(expire)
+        await super().set(key, value, expire=expire)
+        self.local.set(key, value, ttl=expire)
+
+    @override
+    async def clear(self, namespace: str | None = None, key: str | None = None) -> int:
+        if namespace:
+            _ = self.local.clear(prefix=f"{namespace}:")
+        elif key:
+            self.local.delete(key)
+        return await super().clear(namespace=namespace, key=key)
+
+    async def invalidate(self, key: str) -> None:
+        """Drops `key` from the L1 tier of every worker, this one included."""
+        self.local.delete(key)
+        _ = await self.redis.publish(self.channel, key)  # pyright: ignore[reportUnknownMemberType]
+
+    async def listen_for_invalidations(self, retry_delay: float = 1.0) -> None:
+        """Applies invalidation messages from other workers until cancelled."""
+        while True:
+            try:
+                async with self.redis.pubsub() as pubsub:  # pyright: ignore[reportUnknownMemberType, reportUnknownVariableType]
+                    await pubsub.subscribe(self.channel)  # pyright: ignore[reportUnknownMemberType]
+                    # Anything published before the subscription is unknown.
+                    _ = self.local.clear()
+                    async for message in pubsub.listen():  # pyright: ignore[reportUnknownMemberType, reportUnknownVariableType]
+                        if message["type"] == "message":
+                            self.local.delete(str(message["data"]))  # pyright: ignore[reportUnknownArgumentType]
+            except RedisError as e:
+                main_logger.warning(f"Cache invalidation listener lost Redis: {e}")
+                await asyncio.sleep(retry_delay)
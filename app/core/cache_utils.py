@@ -1,25 +1,33 @@
-from collections.abc import Awaitable
 from typing import Any, Callable, cast
 from fastapi import Request, Response
 from fastapi_cache import FastAPICache
+from fastapi_cache.backends.redis import RedisBackend
 from fastapi_cache.types import Backend
-from app.core.redis import SafeJsonCoder
-from app.schemas import Task, User
+from app.config import config
+from app.core.cache_backend import TieredRedisBackend
+from app.core.db import replica_cache_expire
+from app.core.pagination import DEFAULT_PAGE_SIZE, decode_cursor_position
+from app.core.redis import OrjsonCoder
+from app.schemas import Task, TaskListQuery
 from app.utils.auth import JWTPayload
 
 # The generic type for the function being decorated
 _Func = Callable[..., Any]  # pyright: ignore[reportExplicitAny]
 
+# Version keys of non-Redis backends need an expiry; keep it well past any
+# cache entry's TTL.
+TASK_CACHE_VERSION_EXPIRE: int = 7 * 24 * 60 * 60
 
-def task_list_cache_key_builder(
+
+async def task_list_cache_key_builder(
     func: _Func,  # The function being decorated
     namespace: str,
     *,  # All remaining arguments must be passed as keyword arguments
     request: Request | None = None,
     response: Response | None = None,  # pyright: ignore[reportUnusedParameter]
     args: tuple[Any, ...],  # pyright: ignore[reportUnusedParameter, reportExplicitAny]
-    kwargs: dict[str, Any],  # pyright: ignore[reportExplicitAny, reportUnusedParameter]
-) -> Awaitable[str] | str:
+    kwargs: dict[str, Any],  # pyright: ignore[reportExplicitAny]
+) -> str:
     """
     Builds unique cache keys based on query params for list endpoints.
     """
@@ -27,16 +35,38 @@ def task_list_cache_key_builder(
     if request is None:
         return f"{namespace}:{func.__name__}"
 
-    # The logic remains the same, but uses the Request object from kwargs/keyword args
-    query = "&".join([f"{k}={v}" for k, v in sorted(request.query_params.items())])
+    # Normalize the page position so equivalent requests share a key: the
+    # cursor is decoded to the task (and sort value) it points at and the
+    # validated limit (default included) is always part of the key.
+    params: dict[str, str] = dict(request.query_params)
+    for name in ("after", *TaskListQuery.model_fields):
+        _ = params.pop(name, None)
+    after = cast(str | None, kwargs.get("after"))
+    if after:
+        position = decode_cursor_position(after)
+        params["after"] = (
+            str(position.id)
+            if position.sort is None
+            else f"{position.sort}:{position.value}:{position.id}"
+        )
+    params["limit"] = str(kwargs.get("limit", DEFAULT_PAGE_SIZE))
+    # Filters and projection come from the validated query, so `fields` in any
+    # order or spelling maps to one key; defaults are left out.
+    query = kwargs.get("query")
+    if isinstance(query, TaskListQuery):
+        for name, value in query.model_dump(mode="json", exclude_defaults=True).items():  # pyright: ignore[reportAny]
+            params[name] = ",".join(value) if isinstance(value, list) else str(value)  # pyright: ignore[reportUnknownArgumentType]
+    query = "&".join([f"{k}={v}" for k, v in sorted(params.items())])
 
     # We use request.url.path which should be safe.
     user = cast(JWTPayload, request.state.user)
-    cache_key = f"{namespace}:{user.get("username")}:{request.url.path}"
-    return f"{cache_key}?{query}" if query else f"{cache_key}"
+    username = user.get("username")
+    version = await get_task_cache_version(username=username)
+    cache_key = f"{namespace}:{username}:v{version}:{request.url.path}"
+    return f"{cache_key}?{query}"
 
 
-def task_detail_cache_key_builder(
+async def task_detail_cache_key_builder(
     func: _Func,  # The function being decorated
     namespace: str,
     *,  # All remaining arguments must be passed as keyword arguments
@@ -44,7 +74,7 @@ def task_detail_cache_key_builder(
     response: Response | None = None,  # pyright: ignore[reportUnusedParameter]
     args: tuple[Any, ...],  # pyright: ignore[reportUnusedParameter, reportExplicitAny]
     kwargs: dict[str, Any],  # pyright: ignore[reportExplicitAny]
-) -> Awaitable[str] | str:
+) -> str:
     """
     Builds unique cache keys based on query params for list endpoints.
     """
@@ -52,20 +82,67 @@ def task_detail_cache_key_builder(
     if request is None:
         return f"{namespace}:{func.__name__}"
 
-    # We use request.url.path which should be safe.
     user = cast(JWTPayload, request.state.user)
+    username = user.get("username")
+    version = await get_task_cache_version(username=username)
     task_id = cast(int, kwargs.get("task_id"))
-    return f"{namespace}:{user.get("username")}:{task_id}"
+    return f"{namespace}:{username}:v{version}:{task_id}"
+
+
+def task_cache_version_key(username: str) -> str:
+    return f"{FastAPICache.get_prefix()}:task:version:{username}"
+
+
+def task_detail_cache_key(username: str, version: int, task_id: int) -> str:
+    return f"{FastAPICache.get_prefix()}:task:detail:{username}:v{version}:{task_id}"
 
 
-async def cache_task_details(tasks: list[Task]):
-    """Store individual task details in Redis."""
-    redis: Backend = FastAPICache.get_backend()
-    cache_key = FastAPICache.get_prefix()
-    expire = FastAPICache.get_expire()
-    for task in tasks:
-        user: User = cast(User, task.user)
-        username: str = user.username
-        key = f"{cache_key}:task:detail:{username}:{task.id}"
-        await redis.set(key, SafeJsonCoder.encode(task), expire=expire)
+async def get_task_cache_version(username: str) -> int:
+    """Current generation of a user's task cache entries (0 if never bumped)."""
+    value = await FastAPICache.get_backend().get(task_cache_version_key(username))
+    return int(value) if value else 0
+
+
+async def invalidate_task_cache(username: str) -> int:
+    """
+    Invalidates every cached task list and detail of a user in O(1).
+
+    The per-user generation is bumped, so the key builders stop resolving to
+    the old entries, which are left to expire by TTL. Returns the new version.
+    """
+    backend: Backend = FastAPICache.get_backend()
+    key = task_cache_version_key(username)
+    if isinstance(backend, RedisBackend):
+        # No TTL: a counter that expired and restarted could bring back stale
+        # entries written under a reused version.
+        version = int(await backend.redis.incr(key))  # pyright: ignore[reportUnknownMemberType, reportUnknownArgumentType]
+        if isinstance(backend, TieredRedisBackend):
+            await backend.invalidate(key)
+        return version
+    version = await get_task_cache_version(username) + 1
+    await backend.set(key, str(version).encode(), expire=TASK_CACHE_VERSION_EXPIRE)
+    return version
+
 
+async def cache_task_details(username: str, version: int, tasks: list[Task]) -> None:
+    """Store individual task details in Redis, one pipeline per chunk."""
+    backend: Backend = FastAPICache.get_backend()
+    expire = replica_cache_expire(FastAPICache.get_expire())
+    chunk_size = cast(int, config.redis.get("warm_chunk_size"))
+    for start in range(0, len(tasks), chunk_size):
+        # Encode one chunk at a time so a large list is never held twice.
+        entries: list[tuple[str, str]] = [
+            (
+                task_detail_cache_key(username, version, cast(int, task.id)),
+                OrjsonCoder.encode(task),
+            )
+            for task in tasks[start : start + chunk_size]
+        ]
+        if isinstance(backend, RedisBackend):
+            async with backend.redis.pipeline(transaction=False) as pipe:  # pyright: ignore[reportUnknownMemberType, reportUnknownVariableType]
+                for key, value in entries:
+                    _ = pipe.set(key, value, ex=expire)  # pyright: ignore[reportUnknownMemberType]
+                _ = await pipe.execute()  # pyright: ignore[reportUnknownMemberType]
+        else:
+            for key, value in entries:
+                await backend.set(key, value, expire=expire)
@@ -1,21 +1,219 @@
 import asyncio
+import itertools
+import time
 from sqlalchemy.ext.asyncio.engine import AsyncEngine
 from collections.abc import AsyncGenerator
-from typing import cast
+from contextvars import ContextVar
+from typing import Any, cast, override
+from sqlalchemy import Engine, event, exc, make_url
+from sqlalchemy.engine import Connection, ExceptionContext
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.sql import ClauseElement, Executable
+from sqlalchemy.sql.dml import UpdateBase
+from sqlmodel.orm.session import Session
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from app.config import config
 from app.utils import upgrade_database
 
 SYNC_DB_URL=cast(str, config.database.get("url"))
+
+
+class PoolMetrics:
+    """Checkout counters shared by every pool the engine creates."""
+
+    def __init__(self) -> None:
+        self.checkouts: int = 0
+        self.timeouts: int = 0
+        self.wait_total: float = 0.0
+        self.wait_max: float = 0.0
+
+
+pool_metrics: PoolMetrics = PoolMetrics()
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """
+    AsyncAdaptedQueuePool that times how long callers wait for a connection.
+
+    The wait covers queueing for a free connection as well as opening a new
+    one. Counters live in `pool_metrics` so they survive `engine.dispose()`,
+    which replaces the pool object.
+    """
+
+    @override
+    def connect(self) -> PoolProxiedConnection:
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            pool_metrics.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            pool_metrics.checkouts += 1
+            pool_metrics.wait_total += waited
+            pool_metrics.wait_max = max(pool_metrics.wait_max, waited)
+
+
+def engine_options(url: str) -> dict[str, Any]:  # pyright: ignore[reportExplicitAny]
+    options: dict[str, Any] = {  # pyright: ignore[reportExplicitAny]
+        "poolclass": InstrumentedAsyncPool,
+        "pool_size": config.database.get("pool_size"),
+        "max_overflow": config.database.get("max_overflow"),
+        "pool_timeout": config.database.get("pool_timeout"),
+        "pool_recycle": config.database.get("pool_recycle"),
+        "pool_pre_ping": config.database.get("pool_pre_ping"),
+    }
+    if make_url(url).get_driver_name() == "asyncpg":
+        options["connect_args"] = {
+            "prepared_statement_cache_size": config.database.get("statement_cache_size")
+        }
+    return options
+
+
+def pool_stats() -> dict[str, int | float]:
+    pool = engine.pool
+    checkouts = pool_metrics.checkouts
+    stats: dict[str, int | float] = {
+        "checkouts": checkouts,
+        "timeouts": pool_metrics.timeouts,
+        "wait_ms_avg": round(pool_metrics.wait_total / checkouts * 1000, 3) if checkouts else 0.0,
+        "wait_ms_max": round(pool_metrics.wait_max * 1000, 3),
+    }
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        stats.update(
+            {
+                "pool_size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "idle": pool.checkedin(),
+                "overflow": pool.overflow(),
+            }
+        )
+    return stats
+
+
 # Create async engine
-engine: AsyncEngine = create_async_engine(url=SYNC_DB_URL, echo=False)
+engine: AsyncEngine = create_async_engine(
+    url=SYNC_DB_URL, echo=False, **engine_options(SYNC_DB_URL)
+)
+
+
+class ReplicaSet:
+    """
+    Read replicas handed out round-robin, skipping any that recently failed.
+
+    A replica whose connection breaks (or cannot be opened) is taken out of
+    rotation for `cooldown` seconds; with none left, reads go to the primary.
+    """
+
+    def __init__(self, engines: list[AsyncEngine], cooldown: float = 30.0) -> None:
+        self.engines: list[AsyncEngine] = engines
+        self.cooldown: float = cooldown
+        self._cursor: itertools.cycle[int] = itertools.cycle(range(len(engines)))
+        self._down_until: dict[int, float] = {}
+        for index, replica in enumerate(engines):
+            event.listen(
+                replica.sync_engine,
+                "handle_error",
+                lambda context, index=index: self._on_error(index, context),  # pyright: ignore[reportUnknownLambdaType]
+            )
+
+    def pick(self) -> AsyncEngine | None:
+        now = time.monotonic()
+        for _ in self.engines:
+            index = next(self._cursor)
+            if self._down_until.get(index, 0.0) <= now:
+                return self.engines[index]
+        return None
+
+    def is_up(self, replica: AsyncEngine) -> bool:
+        index = self.engines.index(replica)
+        return self._down_until.get(index, 0.0) <= time.monotonic()
+
+    def mark_down(self, index: int) -> None:
+        self._down_until[index] = time.monotonic() + self.cooldown
+
+    def _on_error(self, index: int, context: ExceptionContext) -> None:
+        # Statement errors (bad SQL, constraint violations) say nothing about
+        # the replica's health; lost or refused connections do.
+        if context.is_disconnect or context.connection is None:
+            self.mark_down(index)
+
+
+replicas: ReplicaSet = ReplicaSet(
+    engines=[
+        create_async_engine(url=url, echo=False, **engine_options(url))
+        for url in cast(list[str], config.database.get("replica_urls") or [])
+    ],
+    cooldown=cast(float, config.database.get("replica_cooldown")),
+)
+
+
+# Set once the current request has read from a replica; uvicorn runs each
+# request in its own task, so the flag never outlives it.
+read_from_replica: ContextVar[bool] = ContextVar("read_from_replica", default=False)
+
+
+def replica_cache_expire(expire: int | None) -> int | None:
+    """
+    Caps a cache TTL to the replica lag when the cached data came from a replica.
+
+    A replica may not have the write that just bumped the cache version yet;
+    the entry then holds old data under the new version, but only briefly.
+    """
+    if not read_from_replica.get():
+        return expire
+    max_lag = cast(int, config.database.get("replica_max_lag"))
+    return max_lag if expire is None else min(expire, max_lag)
+
+
+def on_replica[T: Executable](statement: T) -> T:
+    """Marks a read statement as safe to serve from a read replica."""
+    return statement.execution_options(replica=True)
+
+
+class RoutingSession(Session):
+    """
+    Sends statements marked with `on_replica` to a replica, the rest to the primary.
+
+    Once the session has flushed or run an INSERT/UPDATE/DELETE, later reads
+    stay on the primary as well, so a request always sees its own writes.
+    A session keeps the replica it first picked while that replica is up.
+    """
+
+    @override
+    def get_bind(
+        self,
+        mapper: Any = None,  # pyright: ignore[reportExplicitAny, reportAny]
+        *,
+        clause: ClauseElement | None = None,
+        **kw: Any,  # pyright: ignore[reportExplicitAny, reportAny]
+    ) -> Engine | Connection:
+        if self._flushing or isinstance(clause, UpdateBase):  # pyright: ignore[reportUnknownMemberType]
+            self.info["wrote"] = True
+        elif (
+            clause is not None
+            and not self.info.get("wrote")
+            and isinstance(clause, Executable)
+            and clause.get_execution_options().get("replica")
+        ):
+            replica = cast(AsyncEngine | None, self.info.get("replica"))
+            if replica is None or not replicas.is_up(replica):
+                replica = replicas.pick()
+                self.info["replica"] = replica
+            if replica is not None:
+                _ = read_from_replica.set(True)
+                return replica.sync_engine
+        return super().get_bind(mapper, clause=clause, **kw)  # pyright: ignore[reportAny]
+
 
 # Create async session factory
 AsyncSessionLocal: async_sessionmaker[AsyncSession] = async_sessionmaker[AsyncSession](
     bind=engine,
     class_=AsyncSession,
+    sync_session_class=RoutingSession,
     autocommit=False,
     autoflush=False,
 )
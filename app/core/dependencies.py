@@ -1,72 +1,155 @@
-from typing import ClassVar, Self
-from fastapi import Depends
+import time
+from collections import OrderedDict
+from typing import cast
+from fastapi import Depends, Query, Request
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
 from sqlmodel.ext.asyncio.session import AsyncSession
 from app.repositories import TaskSQLRepository, AuthSQLRepository
-from app.repositories.base_repository import BaseTaskRepository, BaseAuthRepository
+from app.schemas import CurrentUser, TaskListQuery, TaskSort, User
+from app.schemas.task_schemas import TASK_FIELDS, TaskStatus
 from app.services import TaskService, AuthService
+from app.utils import JWTPayload
 from .db import get_db_session
+from .exceptions import UnauthorizedException
 
 
-class DependencyContainer:
-    _instance: ClassVar["DependencyContainer | None"] = None
-    task_repository: BaseTaskRepository | None = None
-    auth_repository: BaseAuthRepository | None = None
-    task_service: TaskService | None = None
-    auth_service: AuthService | None = None
+class RequestContainer:
+    """
+    Repositories and services for a single request, bound to its session.
 
-    def __new__(cls) -> Self | "DependencyContainer":
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-        return cls._instance
+    FastAPI caches `get_request_container` per request, so every dependency of
+    one request shares a container (and session) while concurrent requests
+    never see each other's. Services are built on first use.
+    """
 
-    async def initialize(self, db: AsyncSession) -> None:
-        if self.task_repository is None or self.auth_repository is None:
-            self.task_repository = TaskSQLRepository(db=db)
-            self.auth_repository = AuthSQLRepository(db=db)
+    __slots__ = ("db", "_task_service", "_auth_service")
 
-            # Initialize services with singleton repositories
-            self.task_service = TaskService(
-                auth_repository=self.auth_repository,
-                task_repository=self.task_repository,
-            )
-            self.auth_service = AuthService(repository=self.auth_repository)
+    def __init__(self, db: AsyncSession) -> None:
+        self.db: AsyncSession = db
+        self._task_service: TaskService | None = None
+        self._auth_service: AuthService | None = None
 
-    async def cleanup(self):
-        self.task_repository = None
-        self.auth_repository = None
-        self.task_service = None
-        self.auth_service = None
+    @property
+    def task_service(self) -> TaskService:
+        if self._task_service is None:
+            self._task_service = TaskService(task_repository=TaskSQLRepository(db=self.db))
+        return self._task_service
 
+    @property
+    def auth_service(self) -> AuthService:
+        if self._auth_service is None:
+            self._auth_service = AuthService(repository=AuthSQLRepository(db=self.db))
+        return self._auth_service
 
-# Global container instance
-dependency_container: DependencyContainer = DependencyContainer()
 
-
-async def get_task_service(
+async def get_request_container(
     session: AsyncSession = Depends(
         dependency=get_db_session
     ),  # pyright: ignore[reportCallInDefaultInitializer]
+) -> RequestContainer:
+    return RequestContainer(db=session)
+
+
+async def get_task_service(
+    container: RequestContainer = Depends(
+        dependency=get_request_container
+    ),  # pyright: ignore[reportCallInDefaultInitializer]
 ) -> TaskService:
-    await dependency_container.initialize(db=session)
-    if dependency_container.task_service is None:
-        raise ValueError(
-            "TaskService not initialized. Ensure repositories are set up first."
-        )
-    service = dependency_container.task_service
-    await dependency_container.cleanup()
-    return service
+    return container.task_service
 
 
 async def get_auth_service(
+    container: RequestContainer = Depends(
+        dependency=get_request_container
+    ),  # pyright: ignore[reportCallInDefaultInitializer]
+) -> AuthService:
+    return container.auth_service
+
+
+class UserIdCache:
+    """Bounded username -> user id map for tokens issued before the `uid` claim."""
+
+    def __init__(self, max_entries: int = 10_000, ttl: float = 300.0) -> None:
+        self.max_entries: int = max_entries
+        self.ttl: float = ttl
+        self._entries: OrderedDict[str, tuple[int, float]] = OrderedDict()
+
+    def get(self, username: str) -> int | None:
+        entry = self._entries.get(username)
+        if entry is None:
+            return None
+        user_id, expires_at = entry
+        if expires_at < time.monotonic():
+            del self._entries[username]
+            return None
+        self._entries.move_to_end(username)
+        return user_id
+
+    def set(self, username: str, user_id: int) -> None:
+        self._entries[username] = (user_id, time.monotonic() + self.ttl)
+        self._entries.move_to_end(username)
+        while len(self._entries) > self.max_entries:
+            _ = self._entries.popitem(last=False)
+
+
+user_id_cache: UserIdCache = UserIdCache()
+
+
+def get_task_list_query(
+    status: TaskStatus | None = None,
+    title_prefix: str | None = Query(  # pyright: ignore[reportCallInDefaultInitializer]
+        default=None, description="Only tasks whose title starts with this"
+    ),
+    sort: TaskSort = TaskSort.ID,
+    fields: str | None = Query(  # pyright: ignore[reportCallInDefaultInitializer]
+        default=None,
+        description="Comma-separated subset of " + ", ".join(TASK_FIELDS),
+    ),
+) -> TaskListQuery:
+    try:
+        return TaskListQuery(
+            status=status, title_prefix=title_prefix, sort=sort, fields=fields  # pyright: ignore[reportArgumentType]
+        )
+    except ValidationError as e:
+        raise RequestValidationError(
+            [{**error, "loc": ("query", *error["loc"])} for error in e.errors()]
+        ) from e
+
+
+def require_auth(request: Request) -> JWTPayload:
+    if request.state.user is None:  # pyright: ignore[reportAny]
+        raise UnauthorizedException()
+    return cast(JWTPayload, request.state.user)
+
+
+async def get_current_user(
+    request: Request,
     session: AsyncSession = Depends(
         dependency=get_db_session
     ),  # pyright: ignore[reportCallInDefaultInitializer]
-) -> AuthService:
-    await dependency_container.initialize(db=session)
-    if dependency_container.auth_service is None:
-        raise ValueError(
-            "AuthService not initialized. Ensure repositories are set up first."
+) -> CurrentUser:
+    """
+    Resolve the authenticated user once per request.
+
+    Access tokens carry the user id in the `uid` claim, so no query is needed.
+    Older tokens without it fall back to a cached username lookup.
+    """
+    payload = cast(JWTPayload | None, request.state.user)
+    if payload is None:
+        raise UnauthorizedException()
+
+    username: str = payload["username"]
+    user_id: int | None = payload.get("uid")
+    if user_id is None:
+        user_id = user_id_cache.get(username)
+    if user_id is None:
+        user: User = await AuthSQLRepository(db=session).get_user_by_username(
+            username=username
         )
-    service = dependency_container.auth_service
-    await dependency_container.cleanup()
-    return service
+        user_id = cast(int, user.id)
+        user_id_cache.set(username, user_id)
+
+    current_user = CurrentUser(id=user_id, username=username)
+    request.state.current_user = current_user
+    return current_user
@@ -10,6 +10,11 @@ class EnvConfig(BaseSettings):
     API_KEY: str = Field(default="api-secret", min_length=1)  # Required, non-empty
     SECRET_KEY: str = Field(default="secret", min_length=1)
     ALGORITHM: str = Field(default="HS256")
+    # HS* algorithms sign with SECRET_KEY and need none of the key settings.
+    JWT_BACKEND: Literal["jose", "pyjwt"] = "jose"  # EdDSA needs pyjwt
+    JWT_KEY_ID: str | None = None  # kid of the signing key, for ES256/EdDSA
+    JWT_PRIVATE_KEY_FILE: str | None = None  # PEM; only where tokens are issued
+    JWT_PUBLIC_KEYS_DIR: str | None = None  # <kid>.pem verification keys, old kids kept while rotating
     VERSION: str = Field(default="1.0.0")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = Field(default=30)
     REFRESH_TOKEN_EXPIRE_WEEKS: int = Field(default=4)
@@ -18,8 +23,47 @@ class EnvConfig(BaseSettings):
     DB_PWD: str | None = None  # Optional URL
     DB_USER: str | None = None  # Optional URL
     TEST_DB_NAME: str | None = None  # Optional URL
+    # Connections per worker: up to pool size + max overflow, so size the
+    # database's max_connections against the number of uvicorn workers.
+    DB_POOL_SIZE: int = Field(default=10, ge=1)
+    DB_MAX_OVERFLOW: int = Field(default=10, ge=0)
+    DB_POOL_TIMEOUT: float = Field(default=10, gt=0)  # Seconds to wait for a connection before erroring
+    DB_POOL_RECYCLE: int = Field(default=1800)  # Seconds before a connection is replaced
+    DB_POOL_PRE_PING: bool = True  # Test connections on checkout
+    DB_STATEMENT_CACHE_SIZE: int = Field(default=100, ge=0)  # asyncpg prepared statements per connection; 0 behind pgbouncer
+    # Read-only copies for GET traffic, as a JSON list, e.g. ["postgresql+asyncpg://..."]
+    DB_REPLICA_URLS: list[str] = []
+    DB_REPLICA_COOLDOWN: int = Field(default=30, ge=0)  # Seconds a failed replica stays out of rotation
+    DB_REPLICA_MAX_LAG: int = Field(default=2, ge=1)  # Seconds; TTL cap for cache entries read from a replica
+    STATS_RECONCILE_INTERVAL: int = Field(default=3600, ge=0)  # Seconds between task_stats rebuilds; 0 disables
     REDIS_URL: HttpUrl | str | None = None  # Optional URL
     REDIS_CACHE_EXPIRE: int = Field(default=300)
+    REDIS_WARM_CHUNK_SIZE: int = Field(default=500, ge=1)  # Detail keys written per pipeline round-trip
+    REDIS_WARM_IN_BACKGROUND: bool = True  # Warm the detail cache after the response
+    # In-process tier in front of Redis, per worker.
+    LOCAL_CACHE_ENABLED: bool = True
+    LOCAL_CACHE_MAX_ENTRIES: int = Field(default=10_000, ge=1)
+    LOCAL_CACHE_MAX_BYTES: int = Field(default=64 * 1024 * 1024, ge=1)
+    LOCAL_CACHE_TTL: int = Field(default=30, ge=1)  # Upper bound on staleness if an invalidation is missed
+    CACHE_INVALIDATION_CHANNEL: str = Field(default="fastapi-cache:invalidate", min_length=1)
+    CACHE_STAMPEDE_LOCK_TTL_MS: int = Field(default=3000, ge=1)  # Cross-worker recompute lock
+    CACHE_STAMPEDE_WAIT_TIMEOUT_MS: int = Field(default=3000, ge=1)  # How long waiters wait for the recompute
+    CACHE_STALE_WHILE_REVALIDATE: int = Field(default=0, ge=0)  # Seconds a stale copy outlives an entry; 0 disables
+    LOG_SAMPLE_RATE: float = Field(default=1.0, ge=0, le=1)  # Share of successful requests that are logged
+    LOG_BODY_MAX_BYTES: int = Field(default=2048, ge=0)  # Request/response bytes kept for the log line
+    LOG_BODIES_ON_ERROR: bool = True  # Log bodies of 4xx/5xx responses
+    LOG_BODY_ROUTES: list[str] = []  # Paths whose bodies are always logged, as a JSON list
+    # Argon2id cost; the defaults are pwdlib's recommended parameters.
+    ARGON2_TIME_COST: int = Field(default=3, ge=1)
+    ARGON2_MEMORY_COST: int = Field(default=65536, ge=8)  # KiB per hash
+    ARGON2_PARALLELISM: int = Field(default=4, ge=1)
+    PASSWORD_HASH_WORKERS: int = Field(default=2, ge=1)  # Concurrent hashes; the rest queue off the event loop
+    PASSWORD_STRENGTH_WORKERS: int = Field(default=1, ge=1)  # zxcvbn holds the GIL, so more threads buy nothing
+    TOKEN_CACHE_MAX_ENTRIES: int = Field(default=10_000, ge=0)  # Verified JWTs kept per worker; 0 disables
+    REVOCATION_FILTER_CAPACITY: int = Field(default=100_000, ge=1)  # Revoked, unexpired tokens before the filter degrades
+    REVOCATION_ERROR_RATE: float = Field(default=0.001, gt=0, lt=1)  # Share of live tokens that need a Redis lookup
+    REVOCATION_CHANNEL: str = Field(default="auth:revoked", min_length=1)
+    REVOCATION_SYNC_INTERVAL: int = Field(default=60, ge=1)  # Seconds between filter rebuilds from Redis
     FRONTEND_URL: HttpUrl | str | None = None  # Optional URL
     
     model_config: ClassVar[SettingsConfigDict] = SettingsConfigDict(
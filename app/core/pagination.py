@@ -0,0 +1,76 @@
+import base64
+import binascii
+import json
+from typing import NamedTuple
+from app.core.exceptions import AppException
+
+DEFAULT_PAGE_SIZE: int = 50
+MAX_PAGE_SIZE: int = 200
+
+
+class CursorPosition(NamedTuple):
+    """Where a page ended: the last task id, and its sort value unless sorted by id."""
+
+    id: int
+    sort: str | None = None
+    value: str | None = None
+
+
+def encode_cursor(last_id: int, sort: str | None = None, value: str | None = None) -> str:
+    """Encode the last seen task id into an opaque, url-safe cursor.
+
+    Args:
+        last_id (int): id of the last task on the current page
+        sort (str | None): sort order of the page, when it is not by id
+        value (str | None): sort column value of the last task
+
+    Returns:
+        str: cursor to pass back as ``?after=`` for the next page
+    """
+    payload: dict[str, int | str | None] = {"id": last_id}
+    if sort is not None:
+        payload.update(sort=sort, value=value)
+    raw: bytes = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor_position(cursor: str) -> CursorPosition:
+    """Decode a cursor produced by ``encode_cursor``.
+
+    Args:
+        cursor (str): opaque cursor from a previous page
+
+    Raises:
+        AppException: if the cursor is malformed
+
+    Returns:
+        CursorPosition: last task id seen by the client, with its sort value
+    """
+    try:
+        padded: str = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded))  # pyright: ignore[reportAny]
+        last_id = payload["id"]  # pyright: ignore[reportAny]
+        if not isinstance(last_id, int) or isinstance(last_id, bool):
+            raise ValueError("Cursor id must be an integer")
+        sort = payload.get("sort")  # pyright: ignore[reportAny]
+        value = payload.get("value")  # pyright: ignore[reportAny]
+        if not isinstance(sort, str | None) or not isinstance(value, str | None):
+            raise ValueError("Cursor sort and value must be strings")
+        return CursorPosition(id=last_id, sort=sort, value=value)
+    except (binascii.Error, ValueError, KeyError, TypeError, AttributeError) as e:
+        raise AppException(message="Invalid pagination cursor") from e
+
+
+def decode_cursor(cursor: str) -> int:
+    """Decode the last seen task id from a cursor produced by ``encode_cursor``.
+
+    Args:
+        cursor (str): opaque cursor from a previous page
+
+    Raises:
+        AppException: if the cursor is malformed
+
+    Returns:
+        int: id of the last task seen by the client
+    """
+    return decode_cursor_position(cursor).id
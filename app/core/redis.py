@@ -1,21 +1,47 @@
-import json
-from typing import cast
+import asyncio
+from typing import Any, cast, override
+import orjson
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
 from redis.exceptions import ConnectionError
-from fastapi_cache import FastAPICache, JsonCoder
+from starlette.responses import JSONResponse
+from fastapi_cache import FastAPICache
+from fastapi_cache.coder import Coder
 from fastapi_cache.backends.redis import RedisBackend
 from redis.asyncio import Redis
 from app.config import config
+from app.core.cache_backend import (
+    CoalescingRedisBackend,
+    LocalCache,
+    TieredRedisBackend,
+)
+from app.core.revocation import revocation_list
 
 
-class SafeJsonCoder(JsonCoder):
+def _orjson_default(value: object) -> Any:  # pyright: ignore[reportExplicitAny]
+    # SQLModel/pydantic models dump to plain python; orjson then handles the
+    # enums and datetimes inside them natively.
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    return jsonable_encoder(value)
+
+
+class OrjsonCoder(Coder):
+    """Cache coder backed by orjson; the default for the Redis cache."""
+
+    @classmethod
+    @override
+    def encode(cls, value: Any) -> bytes:  # pyright: ignore[reportExplicitAny, reportAny]
+        if isinstance(value, JSONResponse):
+            return value.body  # pyright: ignore[reportReturnType]
+        return orjson.dumps(value, default=_orjson_default)
+
     @classmethod
-    def decode(  # pyright: ignore[reportAny, reportImplicitOverride]
-        cls, value  # pyright: ignore[reportMissingParameterType]
-    ):
-        if isinstance(value, bytes):  # pyright: ignore[reportUnnecessaryIsInstance]
-            value = value.decode("utf-8")  # decode bytes to str
-        # If it's already str, just pass it directly to json.loads
-        return json.loads(value)  # pyright: ignore[reportAny]
+    @override
+    def decode(cls, value: bytes | str) -> Any:  # pyright: ignore[reportExplicitAny, reportIncompatibleMethodOverride]
+        # Redis is opened with decode_responses=True, so values come back as
+        # str; orjson parses both.
+        return orjson.loads(value)
 
 
 async def init_redis() -> None:
@@ -26,12 +52,47 @@ async def init_redis() -> None:
             decode_responses=True,
         )
         await _redis.ping()  # pyright: ignore[reportUnknownMemberType, reportUnusedCallResult, reportGeneralTypeIssues]
+        stampede: dict[str, int | float] = {
+            "lock_ttl_ms": cast(int, config.redis.get("stampede_lock_ttl_ms")),
+            "wait_timeout": cast(int, config.redis.get("stampede_wait_timeout_ms"))
+            / 1000,
+            "stale_ttl": cast(int, config.redis.get("stale_while_revalidate")),
+        }
+        backend: RedisBackend = CoalescingRedisBackend(redis=_redis, **stampede)  # pyright: ignore[reportArgumentType]
+        if config.redis.get("local_cache_enabled"):
+            backend = TieredRedisBackend(
+                redis=_redis,
+                local=LocalCache(
+                    max_entries=cast(int, config.redis.get("local_cache_max_entries")),
+                    max_bytes=cast(int, config.redis.get("local_cache_max_bytes")),
+                    ttl=cast(int, config.redis.get("local_cache_ttl")),
+                ),
+                channel=cast(str, config.redis.get("invalidation_channel")),
+                **stampede,
+            )
         FastAPICache.init(
-            coder=SafeJsonCoder,
-            backend=RedisBackend(redis=_redis),
+            coder=OrjsonCoder,
+            backend=backend,
             prefix="fastapi-cache",
             expire=cast(int, config.redis.get("cache_expire")),
         )
     except ConnectionError as e:
         print(f"❌ Redis connection failed: {e}")
         raise RuntimeError("Failed to initialize Redis cache") from e
+
+
+def start_cache_invalidation_listener() -> asyncio.Task[None] | None:
+    """Subscribes this worker's local cache tier to invalidation messages."""
+    backend = FastAPICache.get_backend()
+    if not isinstance(backend, TieredRedisBackend):
+        return None
+    return asyncio.create_task(backend.listen_for_invalidations())
+
+
+def start_revocation_sync() -> asyncio.Task[None] | None:
+    """Points the revocation list at Redis and keeps its filter in sync."""
+    backend = FastAPICache.get_backend()
+    if not isinstance(backend, RedisBackend):
+        return None
+    revocation_list.attach(backend.redis)  # pyright: ignore[reportUnknownMemberType, reportUnknownArgumentType]
+    return asyncio.create_task(revocation_list.listen())
@@ -0,0 +1,190 @@
+import asyncio
+import hashlib
+import math
+import time
+from collections.abc import Iterator
+from typing import cast
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from app.config import config
+from app.utils import main_logger
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings, sized for `capacity` at `error_rate`."""
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        self.capacity: int = capacity
+        self.error_rate: float = error_rate
+        self.size: int = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes: int = max(1, round(self.size / capacity * math.log(2)))
+        self.count: int = 0
+        self._bits: bytearray = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str) -> Iterator[int]:
+        # Double hashing: k positions from the two halves of one digest.
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8])
+        h2 = int.from_bytes(digest[8:]) | 1
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+
+class RevocationList:
+    """
+    Revoked token ids (`jti`), checked on every authenticated request.
+
+    Each worker keeps a Bloom filter of all revoked ids, so the usual answer
+    ("not revoked") costs a few hashes and no network round-trip. Only a
+    filter positive is confirmed against the exact `revoked:{jti}` key in
+    Redis, which expires with the token. Workers learn about revocations from
+    a pub/sub message and rebuild their filter from the `revoked:index`
+    sorted set (scored by expiry) every `sync_interval` seconds, which also
+    drops expired ids. Without Redis the list is local to the worker and the
+    exact check uses an in-process map instead.
+    """
+
+    key_prefix: str = "revoked:"
+    index_key: str = "revoked:index"
+
+    def __init__(
+        self,
+        capacity: int,
+        error_rate: float,
+        channel: str,
+        sync_interval: float,
+    ) -> None:
+        self.capacity: int = capacity
+        self.error_rate: float = error_rate
+        self.channel: str = channel
+        self.sync_interval: float = sync_interval
+        self.redis: Redis | None = None
+        self.filter: BloomFilter = BloomFilter(capacity, error_rate)
+        # jti -> exp of ids revoked by this worker; the exact set without Redis.
+        self._local: dict[str, float] = {}
+        self.checks: int = 0
+        self.filter_positives: int = 0
+        self.confirmed: int = 0
+
+    def attach(self, redis: Redis | None) -> None:
+        self.redis = redis
+
+    async def revoke(self, jti: str, exp: float) -> None:
+        if exp <= time.time():
+            return
+        self._local[jti] = exp
+        self.filter.add(jti)
+        if self.redis is not None:
+            async with self.redis.pipeline(transaction=False) as pipe:  # pyright: ignore[reportUnknownMemberType, reportUnknownVariableType]
+                _ = pipe.set(self.key_prefix + jti, 1, exat=math.ceil(exp))  # pyright: ignore[reportUnknownMemberType]
+                _ = pipe.zadd(self.index_key, {jti: exp})  # pyright: ignore[reportUnknownMemberType]
+                _ = pipe.publish(self.channel, jti)  # pyright: ignore[reportUnknownMemberType]
+                _ = await pipe.execute()  # pyright: ignore[reportUnknownMemberType]
+        if self.filter.count > self.capacity:
+            # Shed expired ids, but only from a complete list: the Redis index
+            # when there is one (it now holds `jti` too), else the local map.
+            if self.redis is None:
+                self._rebuild(ids=[])
+                return
+            try:
+                await self.sync()
+            except RedisError as e:
+                # Keep the overfull filter: more positives, but nothing missed.
+                main_logger.warning(f"Revocation filter rebuild could not reach Redis: {e}")
+
+    async def is_revoked(self, jti: str | None) -> bool:
+        if jti is None:
+            # Tokens issued before the jti claim cannot be revoked individually.
+            return False
+        self.checks += 1
+        if jti not in self.filter:
+            return False
+        self.filter_positives += 1
+        if self.redis is None:
+            revoked = self._local.get(jti, 0) > time.time()
+        else:
+            try:
+                revoked = bool(await self.redis.exists(self.key_prefix + jti))  # pyright: ignore[reportUnknownMemberType]
+            except RedisError as e:
+                # Fail closed: a filter positive is almost always a real revocation.
+                main_logger.warning(f"Revocation check could not reach Redis: {e}")
+                revoked = True
+        if revoked:
+            self.confirmed += 1
+        return revoked
+
+    async def sync(self) -> None:
+        """Rebuilds the filter from the Redis index, dropping expired ids."""
+        if self.redis is None:
+            return
+        async with self.redis.pipeline(transaction=False) as pipe:  # pyright: ignore[reportUnknownMemberType, reportUnknownVariableType]
+            _ = pipe.zremrangebyscore(self.index_key, "-inf", time.time())  # pyright: ignore[reportUnknownMemberType]
+            _ = pipe.zrange(self.index_key, 0, -1)  # pyright: ignore[reportUnknownMemberType]
+            _, ids = cast(tuple[int, list[str]], await pipe.execute())  # pyright: ignore[reportUnknownMemberType]
+        self._rebuild(ids=ids)
+
+    def _rebuild(self, ids: list[str]) -> None:
+        now = time.time()
+        self._local = {jti: exp for jti, exp in self._local.items() if exp > now}
+        fresh = BloomFilter(self.capacity, self.error_rate)
+        for jti in {*ids, *self._local}:
+            fresh.add(jti)
+        self.filter = fresh
+
+    async def listen(self, retry_delay: float = 1.0) -> None:
+        """Keeps the filter in step with other workers until cancelled."""
+        if self.redis is None:
+            return
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                async with self.redis.pubsub() as pubsub:  # pyright: ignore[reportUnknownMemberType, reportUnknownVariableType]
+                    await pubsub.subscribe(self.channel)  # pyright: ignore[reportUnknownMemberType]
+                    # Anything published before the subscription comes from the index.
+                    await self.sync()
+                    next_sync = loop.time() + self.sync_interval
+                    while True:
+                        message = await pubsub.get_message(  # pyright: ignore[reportUnknownMemberType, reportUnknownVariableType]
+                            ignore_subscribe_messages=True,
+                            timeout=max(0.0, next_sync - loop.time()),
+                        )
+                        if (
+                            message is not None
+                            and message["type"] == "message"
+                            # Our own revocations are in the filter already.
+                            and str(message["data"]) not in self._local  # pyright: ignore[reportUnknownArgumentType]
+                        ):
+                            self.filter.add(str(message["data"]))  # pyright: ignore[reportUnknownArgumentType]
+                        if loop.time() >= next_sync:
+                            await self.sync()
+                            next_sync = loop.time() + self.sync_interval
+            except RedisError as e:
+                main_logger.warning(f"Revocation listener lost Redis: {e}")
+                await asyncio.sleep(retry_delay)
+
+    def snapshot(self) -> dict[str, int]:
+        return {
+            "revocation_checks": self.checks,
+            "revocation_filter_positives": self.filter_positives,
+            "revocation_confirmed": self.confirmed,
+            "revocation_filter_count": self.filter.count,
+        }
+
+
+revocation_list: RevocationList = RevocationList(
+    capacity=cast(int, config.auth.get("revocation_filter_capacity")),
+    error_rate=cast(float, config.auth.get("revocation_error_rate")),
+    channel=cast(str, config.auth.get("revocation_channel")),
+    sync_interval=cast(int, config.auth.get("revocation_sync_interval")),
+)
@@ -0,0 +1,68 @@
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import cast
+from sqlalchemy import text
+from app.config import config
+from app.repositories import TaskSQLRepository
+from app.utils import main_logger
+from .db import AsyncSessionLocal
+
+# Key of the PostgreSQL advisory lock held by the worker that reconciles.
+RECONCILE_LOCK_KEY: int = 0x7461736B73  # "tasks"
+
+
+async def reconcile_task_stats(user_id: int | None = None) -> int:
+    """Rebuilds `task_stats` from `tasks`; returns the number of users counted."""
+    async with AsyncSessionLocal() as session:
+        return await TaskSQLRepository(session).rebuild_task_stats(user_id=user_id)
+
+
+@asynccontextmanager
+async def reconcile_leadership() -> AsyncIterator[bool]:
+    """
+    Yields whether this worker should run the reconciliation.
+
+    On PostgreSQL only the worker that takes a session-level advisory lock
+    does; the lock goes with its connection if the worker dies. SQLite runs
+    in a single process, so there is nobody to elect.
+    """
+    async with AsyncSessionLocal() as session:
+        if session.get_bind().dialect.name != "postgresql":
+            yield True
+            return
+        conn = await session.connection(execution_options={"isolation_level": "AUTOCOMMIT"})
+        key = {"key": RECONCILE_LOCK_KEY}
+        leader = bool(await conn.scalar(text("SELECT pg_try_advisory_lock(:key)"), key))
+        try:
+            yield leader
+        finally:
+            if leader:
+                _ = await conn.execute(text("SELECT pg_advisory_unlock(:key)"), key)
+
+
+async def reconcile_task_stats_forever(interval: float) -> None:
+    """Reconciles every `interval` seconds until cancelled, when this worker leads."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with reconcile_leadership() as leader:
+                if not leader:
+                    continue
+                users = await reconcile_task_stats()
+            main_logger.info(f"Task stats reconciled for {users} users")
+        except Exception as e:
+            main_logger.warning(f"Task stats reconciliation failed: {e}")
+
+
+def start_task_stats_reconciler() -> asyncio.Task[None] | None:
+    """Starts the periodic reconciliation, unless its interval is 0."""
+    interval = cast(int, config.database.get("stats_reconcile_interval"))
+    if not interval:
+        return None
+    return asyncio.create_task(reconcile_task_stats_forever(interval))
+
+
+if __name__ == "__main__":
+    # One-off run, e.g. from cron: python -m app.core.task_stats
+    print(f"Task stats reconciled for {asyncio.run(reconcile_task_stats())} users")
@@ -1,40 +1,57 @@
+import asyncio
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 from typing import Any, cast
 from fastapi import FastAPI
 from fastapi.exceptions import HTTPException, RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.openapi.utils import get_openapi
 from app.core import AppException
 from app.config import config
 from app.core.db import init_db
-from app.core.redis import init_redis
-from app.routers import task_router, auth_router
+from app.core.redis import (
+    init_redis,
+    start_cache_invalidation_listener,
+    start_revocation_sync,
+)
+from app.core.task_stats import start_task_stats_reconciler
+from app.routers import task_router, auth_router, db_metrics_router, metrics_router
 from app.middlewares import (
     app_exception_handler,
     global_exception_handler,
     http_exception_handler,
     jwt_decoder,
-    logging_middleware,
+    LoggingMiddleware,
     validation_exception_handler,
 )
-from app.utils import main_logger
+from app.utils import json_sink, main_logger
 
 
 @asynccontextmanager
 async def lifespan(_: FastAPI) -> AsyncGenerator[None, None]:
     main_logger.info("🚀 Starting database migration...")
+    invalidation_listener: asyncio.Task[None] | None = None
+    revocation_sync: asyncio.Task[None] | None = None
+    stats_reconciler: asyncio.Task[None] | None = None
     try:
         await init_db()
         main_logger.info("✅ Database migration completed!")
+        stats_reconciler = start_task_stats_reconciler()
         await init_redis()
         main_logger.info("✅ Redis cache initialized successfully.")
+        invalidation_listener = start_cache_invalidation_listener()
+        revocation_sync = start_revocation_sync()
     except ConnectionError as e:
         main_logger.error(f"❌ Redis connection failed: {e}")
     except Exception as e:
         main_logger.error(f"❌ Migration failed: {e}")
         raise e
     yield
+    for task in (invalidation_listener, revocation_sync, stats_reconciler):
+        if task is not None:
+            _ = task.cancel()
+    await asyncio.to_thread(json_sink.drain)
 
 
 app: FastAPI = FastAPI(
@@ -44,6 +61,7 @@ app: FastAPI = FastAPI(
     redoc_url="/redoc",
     openapi_url="/openapi.json",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 
@@ -106,11 +124,20 @@ if config.enable_cors:
         allow_headers=["*"],
     )
 _ = app.middleware(middleware_type="http")(jwt_decoder)
-_ = app.middleware(middleware_type="http")(logging_middleware)
+app.add_middleware(
+    middleware_class=LoggingMiddleware,  # pyright: ignore[reportArgumentType]
+    sample_rate=cast(float, config.logging.get("sample_rate")),
+    body_max_bytes=cast(int, config.logging.get("body_max_bytes")),
+    log_bodies_on_error=cast(bool, config.logging.get("log_bodies_on_error")),
+    body_routes=cast(list[str], config.logging.get("body_routes")),
+)
 
 
 app.include_router(router=auth_router)
 app.include_router(router=task_router)
+app.include_router(router=db_metrics_router)
+if config.features.get("enable_debug_routes"):
+    app.include_router(router=metrics_router)
 
 
 @app.get(path="/")
@@ -1,4 +1,4 @@
-from .request import jwt_decoder, logging_middleware
+from .request import LoggingMiddleware, jwt_decoder
 from .exceptions import (
     http_exception_handler,
     validation_exception_handler,
@@ -9,7 +9,7 @@ from .exceptions import (
 
 __all__ = [
     "jwt_decoder",
-    "logging_middleware",
+    "LoggingMiddleware",
     "http_exception_handler",
     "validation_exception_handler",
     "app_exception_handler",
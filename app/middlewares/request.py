@@ -1,14 +1,16 @@
-import json
+import random
+import time
 import uuid
 from fastapi import Request, status
 from fastapi.responses import JSONResponse, Response
 from jose.exceptions import ExpiredSignatureError, JWTError
 from sqlalchemy.exc import SQLAlchemyError
-from starlette.concurrency import iterate_in_threadpool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.revocation import revocation_list
 from app.schemas import TokenError
-from app.utils import jwt_auth_token, main_logger, filter_sensitive
-from typing import Any, Callable
-from collections.abc import Awaitable
+from app.utils import jwt_auth_token, main_logger, redact_text
+from typing import Callable
+from collections.abc import Awaitable, Iterable
 
 
 async def jwt_decoder(
@@ -17,7 +19,17 @@ async def jwt_decoder(
     token: str | None = request.headers.get("Authorization")
     if token and token.startswith("Bearer "):
         try:
-            payload: dict[str, str] = jwt_auth_token.decode_token(token=token.split(sep=" ")[1])
+            payload: dict[str, str] = jwt_auth_token.decode_token_cached(
+                token=token.split(sep=" ")[1]
+            )
+            # Checked on every request, cached decode or not; a filter
+            # negative costs no network round-trip.
+            if await revocation_list.is_revoked(payload.get("jti")):
+                return JSONResponse(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    content=TokenError(error="Token has been revoked").model_dump(),
+                    headers={"WWW-Authenticate": "Bearer"},
+                )
             request.state.user = payload
         except ExpiredSignatureError:
             return JSONResponse(
@@ -36,66 +48,119 @@ async def jwt_decoder(
     return await call_next(request)
 
 
-async def logging_middleware(
-    request: Request, call_next: Callable[[Request], Awaitable[Response]]
-) -> Response:
-    request.state.req_id = str(uuid.uuid4())
+# Request headers that carry credentials and never reach the logs.
+REDACTED_HEADERS: frozenset[str] = frozenset({"authorization", "cookie", "x-api-key"})
 
-    # Check if request.client exists before accessing .host
-    client_host = request.client.host if request.client else "unknown"
 
-    with main_logger.contextualize(req_id=request.state.req_id, ip=client_host):
-        try:
-            body: dict[str, str | int] = (
-                await request.json()
-                if request.headers.get("content-type") == "application/json"
-                else {}
-            )
-            # Redact body before logging
-            redacted_body: dict[str, str | int] | str = filter_sensitive(body.copy())
-            main_logger.bind(
-                method=request.method,
-                path=request.url.path,
-                headers=dict[str, str](request.headers),
-            ).info(f"Incoming request: {redacted_body}")
-        except Exception:
-            main_logger.info("Incoming request: [Non-JSON body]")
-            pass
+class LoggingMiddleware:
+    """
+    Pure ASGI request logging that never buffers the response.
 
-        try:
-            response: Response = await call_next(request)
-            response_body: list[bytes] = [
-                chunk
-                async for chunk in response.body_iterator  # pyright: ignore[reportUnknownMemberType, reportUnknownVariableType, reportAttributeAccessIssue]
-            ]
-            response.body_iterator = (  # pyright: ignore[reportAttributeAccessIssue]
-                iterate_in_threadpool(iter(response_body))
-            )
+    Body chunks are passed through as they arrive; only the first
+    `body_max_bytes` of each side are kept for the log line. Successful
+    requests are sampled at `sample_rate`; failures are always logged, and
+    bodies are only logged for error responses or for `body_routes`.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        sample_rate: float = 1.0,
+        body_max_bytes: int = 2048,
+        log_bodies_on_error: bool = True,
+        body_routes: Iterable[str] = (),
+    ) -> None:
+        self.app: ASGIApp = app
+        self.sample_rate: float = sample_rate
+        self.body_max_bytes: int = body_max_bytes
+        self.log_bodies_on_error: bool = log_bodies_on_error
+        self.body_routes: frozenset[str] = frozenset(body_routes)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        req_id = str(uuid.uuid4())
+        scope.setdefault("state", {})["req_id"] = req_id
+        client = scope.get("client")
+        client_host: str = client[0] if client else "unknown"
+        path: str = scope["path"]
+        sampled = random.random() < self.sample_rate
+        always_log_body = path in self.body_routes
+        capture_request = always_log_body or self.log_bodies_on_error
+        request_body = bytearray()
+        response_body = bytearray()
+        status_code = 500
+        started = time.perf_counter()
+
+        async def tee_receive() -> Message:
+            message = await receive()
+            if capture_request and message["type"] == "http.request":
+                self._keep(request_body, message.get("body", b""))
+            return message
+
+        async def tee_send(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body" and (
+                always_log_body or (self.log_bodies_on_error and status_code >= 400)
+            ):
+                self._keep(response_body, message.get("body", b""))
+            await send(message)
+
+        with main_logger.contextualize(req_id=req_id, ip=client_host):
+            if sampled:
+                main_logger.bind(
+                    method=scope["method"], path=path, headers=self._headers(scope)
+                ).info("Incoming request")
             try:
-                resp_body: dict[str, str | int] | str = (
-                    json.loads(s=b"".join(response_body).decode())
-                    if response.headers.get("content-type") == "application/json"
-                    else b"".join(response_body).decode()
+                await self.app(scope, tee_receive, tee_send)
+            except SQLAlchemyError as e:
+                main_logger.critical(f"Database failed: {e}")
+                raise
+            except Exception as e:
+                main_logger.exception(f"Request failed: {e}")
+                raise
+
+            failed = status_code >= 500
+            if not (sampled or failed):
+                return
+            log_bodies = always_log_body or (
+                self.log_bodies_on_error and status_code >= 400
+            )
+            log_message = "Response sent"
+            if log_bodies:
+                log_message = (
+                    f"Response sent: {self._text(response_body)}"
+                    f" | request: {self._text(request_body)}"
                 )
-                redacted_resp_body: Any = []  # pyright: ignore[reportExplicitAny]
-                # Redact response body
-                if isinstance(resp_body, list):
-                    redacted_resp_body = [
-                        filter_sensitive(data=item) for item in resp_body
-                    ]
-                elif isinstance(resp_body, dict):
-                    redacted_resp_body = filter_sensitive(data=resp_body)
-
-            except Exception:
-                redacted_resp_body = "[Non-JSON response]"
-                pass
-            main_logger.bind(status_code=response.status_code).info(
-                f"Response sent: {redacted_resp_body}"
+            main_logger.bind(
+                method=scope["method"],
+                path=path,
+                status_code=status_code,
+                duration_ms=round((time.perf_counter() - started) * 1000, 2),
+            ).log("ERROR" if failed else "INFO", log_message)
+
+    def _keep(self, buffer: bytearray, chunk: bytes) -> None:
+        room = self.body_max_bytes - len(buffer)
+        if room > 0:
+            buffer.extend(chunk[:room])
+
+    def _text(self, buffer: bytearray) -> str:
+        if not buffer:
+            return "[empty]"
+        text = redact_text(buffer.decode(errors="replace"))
+        return f"{text}..." if len(buffer) >= self.body_max_bytes else text
+
+    @staticmethod
+    def _headers(scope: Scope) -> dict[str, str]:
+        return {
+            name.decode("latin-1"): (
+                "[REDACTED]"
+                if name.decode("latin-1") in REDACTED_HEADERS
+                else value.decode("latin-1")
             )
-            return response
-        except SQLAlchemyError as e:
-            main_logger.critical(f"Database failed: {e}")
-            raise
-        except Exception as e:
-            main_logger.exception(f"Request failed: {e}")
-            raise
+            for name, value in scope["headers"]
+        }
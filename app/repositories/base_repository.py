@@ -1,16 +1,57 @@
 from abc import ABC, abstractmethod
 
 from pydantic import EmailStr
-from app.schemas import TaskCreate, Task, TaskUpdate, User, UserCreate
+from app.schemas import (
+    TaskBatchUpdateItem,
+    TaskCreate,
+    Task,
+    TaskListQuery,
+    TaskStats,
+    TaskUpdate,
+    User,
+    UserCreate,
+)
 
 
 class BaseTaskRepository(ABC):
+    __slots__ = ()
+
     @abstractmethod
     async def get_task_by_id(self, user_id: int, task_id: int) -> Task:
         pass
 
     @abstractmethod
-    async def get_all_tasks(self, user_id: int) -> list[Task]:
+    async def get_all_tasks(
+        self,
+        user_id: int,
+        after: int | None = None,
+        limit: int | None = None,
+        query: TaskListQuery | None = None,
+        after_value: str | None = None,
+    ) -> list[Task]:
+        """
+        A page of the user's tasks in `query.sort` order, after the task `after`.
+
+        `after_value` is that task's value of the sort column when sorting by
+        something other than id. With `query.fields` set, only those fields
+        (plus id and the sort column) need to be loaded.
+        """
+        pass
+
+    @abstractmethod
+    async def search_tasks(
+        self,
+        user_id: int,
+        terms: list[str],
+        limit: int,
+        after: tuple[float, int] | None = None,
+    ) -> list[tuple[Task, float]]:
+        """
+        The user's tasks matching every term, best first, with their scores.
+
+        The last term also matches as a prefix. Ties in score go by id, and
+        `after` is the (score, id) of the last task of the previous page.
+        """
         pass
 
     @abstractmethod
@@ -36,8 +77,31 @@ class BaseTaskRepository(ABC):
     async def delete_task(self, user_id: int, task_id: int) -> bool:
         pass
 
+    @abstractmethod
+    async def create_tasks(
+        self, user_id: int, task_creates: list[TaskCreate]
+    ) -> list[Task]:
+        pass
+
+    @abstractmethod
+    async def update_tasks(
+        self, user_id: int, task_updates: list[TaskBatchUpdateItem]
+    ) -> list[Task | None]:
+        pass
+
+    @abstractmethod
+    async def delete_tasks(self, user_id: int, task_ids: list[int]) -> set[int]:
+        pass
+
+    @abstractmethod
+    async def get_task_stats(self, user_id: int) -> TaskStats:
+        """How many of the user's tasks are in each status."""
+        pass
+
 
 class BaseAuthRepository(ABC):
+    __slots__ = ()
+
     @abstractmethod
     async def create_user(self, user_create: UserCreate) -> User:
         pass
@@ -1,4 +1,11 @@
 from .task_in_memory_repository import TaskInMemoryRepository
 from .auth_in_memory_repository import AuthInMemoryRepository
+from .task_store import CompactTaskStore, DictTaskStore, TaskStore
 
-__all__ = ["TaskInMemoryRepository", "AuthInMemoryRepository"]
+__all__ = [
+    "TaskInMemoryRepository",
+    "AuthInMemoryRepository",
+    "CompactTaskStore",
+    "DictTaskStore",
+    "TaskStore",
+]
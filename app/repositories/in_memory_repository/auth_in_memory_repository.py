@@ -1,3 +1,6 @@
+import asyncio
+import itertools
+from collections.abc import Iterator
 from typing import cast, override
 
 from pydantic import EmailStr
@@ -12,41 +15,52 @@ from app.repositories.base_repository import BaseAuthRepository
 from app.utils import password_validator
 
 users: dict[int, User] = {}
+users_by_username: dict[str, User] = {}
+users_by_email: dict[str, User] = {}
+user_id_sequence: Iterator[int] = itertools.count(1)
+# Held for the uniqueness check and insert only; Argon2 runs before it so
+# sign-ups do not queue behind each other's hashing.
+users_lock: asyncio.Lock = asyncio.Lock()
 
 
 class AuthInMemoryRepository(BaseAuthRepository):
     @override
     async def create_user(self, user_create: UserCreate) -> User:
-        try:
-            user_exist: User = await self.get_user_by_username(user_create.username)
-            if user_exist:
+        hashed_password: str = await password_validator.get_password_hash(
+            user_create.password
+        )
+        async with users_lock:
+            if (
+                user_create.username in users_by_username
+                or user_create.email in users_by_email
+            ):
                 raise UserExistException("User already exist")
-        except Exception:
             user: User = User.model_validate(
                 {
                     **user_create.model_dump(),
-                    "id": len(users) + 1,
-                    "hashed_password": password_validator.get_password_hash(
-                        user_create.password
-                    ),
+                    "id": next(user_id_sequence),
+                    "hashed_password": hashed_password,
                     "is_active": False,
                 }
             )
             users[cast(int, user.id)] = user
+            users_by_username[user.username] = user
+            users_by_email[user.email] = user
             return user
 
     @override
     async def activate_user_account(self, username: str) -> User:
-        user: User = await self.get_user_by_username(username=username)
+        user: User | None = users_by_username.get(username)
+        if user is None:
+            raise UserDoesnotExistException("User does not exist")
         user.is_active = True
-        users[cast(int, user.id)] = user
         return user
 
     @override
     async def authenticate_user(self, username: str, password: str) -> User:
         try:
             user: User = await self.get_user_by_username(username=username)
-            if password_validator.verify_password(
+            if await password_validator.verify_password(
                 plain_password=password, hashed_password=user.hashed_password
             ):
                 raise InvalidUserPasswordException("Invalid user credentials")
@@ -56,9 +70,7 @@ class AuthInMemoryRepository(BaseAuthRepository):
 
     @override
     async def get_user_by_username(self, username: str) -> User:
-        user: User | None = next(
-            (user for user in users.values() if user.username == username), None
-        )
+        user: User | None = users_by_username.get(username)
         if isinstance(user, User):
             if not user.is_active:
                 raise UserAccountNotActiveException("User account is not active")
@@ -67,9 +79,7 @@ class AuthInMemoryRepository(BaseAuthRepository):
 
     @override
     async def get_user_by_email(self, email: EmailStr) -> User:
-        user: User | None = next(
-            (user for user in users.values() if user.email == email), None
-        )
+        user: User | None = users_by_email.get(email)
         if isinstance(user, User):
             return user
         raise UserDoesnotExistException("User does not exist")
@@ -77,6 +87,5 @@ class AuthInMemoryRepository(BaseAuthRepository):
     @override
     async def update_user_password(self, email: EmailStr, new_password: str) -> User:
         user: User = await self.get_user_by_email(email=email)
-        user.hashed_password = password_validator.get_password_hash(new_password)
-        users[cast(int, user.id)] = user
-        return user
\ No newline at end of file
+        user.hashed_password = await password_validator.get_password_hash(new_password)
+        return user
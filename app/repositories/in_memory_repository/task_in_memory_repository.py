@@ -1,52 +1,139 @@
+import asyncio
+import re
+from bisect import bisect_right
+from collections import Counter
 from typing import cast, override
-from app.schemas import TaskCreate, Task, TaskUpdate
+from app.core import NotFoundException
+from app.schemas import (
+    TaskBatchUpdateItem,
+    TaskCreate,
+    Task,
+    TaskListQuery,
+    TaskSort,
+    TaskStats,
+    TaskUpdate,
+)
+from app.schemas.task_schemas import TaskStatus
 from app.repositories.base_repository import BaseTaskRepository
+from .task_store import DictTaskStore, TaskStore
 
-tasks: dict[int, Task] = {}
+# Shared by every repository that is not given its own store.
+task_store: TaskStore = DictTaskStore()
+# Writers never await while the indexes are half-updated; the lock keeps
+# batch operations from interleaving with each other.
+tasks_lock: asyncio.Lock = asyncio.Lock()
 
 
 class TaskInMemoryRepository(BaseTaskRepository):
-    @override
-    async def get_all_tasks(self, user_id: int) -> list[Task]:
-        task_list: list[Task] = [
-            task for task in tasks.values() if task.user_id == user_id
-        ]
-        return task_list
+    __slots__ = ("store",)
+
+    def __init__(self, store: TaskStore | None = None) -> None:
+        self.store: TaskStore = task_store if store is None else store
+
+    def _owned(self, user_id: int, task_id: int) -> Task | None:
+        task: Task | None = self.store.get(task_id)
+        if task is None or task.user_id != user_id:
+            return None
+        return task
 
     @override
-    async def get_task_by_id(self, user_id: int, task_id: int) -> Task:
-        task: Task | None = next(
+    async def get_all_tasks(
+        self,
+        user_id: int,
+        after: int | None = None,
+        limit: int | None = None,
+        query: TaskListQuery | None = None,
+        after_value: str | None = None,
+    ) -> list[Task]:
+        query = query or TaskListQuery()
+        by_id: bool = query.sort.field == "id"
+        user_task_ids = self.store.user_task_ids(user_id)
+        if query.sort == TaskSort.ID and query.status is None and query.title_prefix is None:
+            # Ascending ids without filters: the index is already the answer.
+            start: int = 0 if after is None else bisect_right(user_task_ids, after)
+            end: int | None = None if limit is None else start + limit
+            return [
+                cast(Task, self.store.get(task_id)) for task_id in user_task_ids[start:end]
+            ]
+
+        def sort_key(task: Task) -> tuple[str, int]:
+            return ("" if by_id else task.title or "", cast(int, task.id))
+
+        task_list: list[Task] = sorted(
             (
                 task
-                for task in tasks.values()
-                if task.id == task_id and task.user_id == user_id
+                for task in (cast(Task, self.store.get(task_id)) for task_id in user_task_ids)
+                if (query.status is None or task.status == query.status)
+                and (
+                    query.title_prefix is None
+                    or (task.title or "").startswith(query.title_prefix)
+                )
             ),
-            None,
+            key=sort_key,
+            reverse=query.sort.descending,
         )
+        if after is not None:
+            position = ("" if by_id else after_value or "", after)
+            task_list = [
+                task
+                for task in task_list
+                if (sort_key(task) < position if query.sort.descending else sort_key(task) > position)
+            ]
+        return task_list if limit is None else task_list[:limit]
+
+    @override
+    async def search_tasks(
+        self,
+        user_id: int,
+        terms: list[str],
+        limit: int,
+        after: tuple[float, int] | None = None,
+    ) -> list[tuple[Task, float]]:
+        # A scan of the user's tasks: term hits, title hits counted 2.5 times.
+        # Score order is (-score, id), so a later page is a greater key.
+        *whole, prefix = terms
+
+        def count(words: list[str]) -> int:
+            return sum(word in whole or word.startswith(prefix) for word in words)
+
+        hits: list[tuple[float, int, Task]] = []
+        for task_id in self.store.user_task_ids(user_id):
+            task = cast(Task, self.store.get(task_id))
+            title_words: list[str] = re.findall(r"\w+", (task.title or "").lower())
+            description_words: list[str] = re.findall(r"\w+", (task.description or "").lower())
+            words = {*title_words, *description_words}
+            if all(term in words for term in whole) and any(
+                word.startswith(prefix) for word in words
+            ):
+                score = 2.5 * count(title_words) + count(description_words)
+                hits.append((-score, task_id, task))
+        hits.sort(key=lambda hit: hit[:2])
+        if after is not None:
+            position = (-after[0], after[1])
+            hits = [hit for hit in hits if hit[:2] > position]
+        return [(task, -negated) for negated, _, task in hits[:limit]]
+
+    @override
+    async def get_task_by_id(self, user_id: int, task_id: int) -> Task:
+        task: Task | None = self._owned(user_id=user_id, task_id=task_id)
         if task:
             return task
-        raise Exception("Task not found")
+        raise NotFoundException(message=f"Task with id {task_id} does not exist")
 
     @override
     async def create_task(self, user_id: int, task_create: TaskCreate) -> Task:
-        task: Task = Task.model_validate(
-            {
-                **task_create.model_dump(),
-                "id": len(tasks) + 1,
-                "user_id": user_id,
-            }
-        )
-        tasks[cast(int, task.id)] = task
-        return task
+        async with tasks_lock:
+            return self.store.insert(user_id=user_id, values=task_create.model_dump())
 
     @override
     async def update_task(
         self, user_id: int, task_id: int, task_update: TaskUpdate
     ) -> Task:
-        task: Task = await self.get_task_by_id(user_id=user_id, task_id=task_id)
-        updated_task: Task = task.model_copy(update=task_update.model_dump())
-        tasks[cast(int, task.id)] = updated_task
-        return updated_task
+        async with tasks_lock:
+            task: Task = await self.get_task_by_id(user_id=user_id, task_id=task_id)
+            updated_task: Task = task.model_copy(update=task_update.model_dump())
+            self.store.replace(updated_task)
+            return updated_task
 
     @override
     async def partial_update_task(
@@ -58,6 +145,58 @@ class TaskInMemoryRepository(BaseTaskRepository):
 
     @override
     async def delete_task(self, user_id: int, task_id: int) -> bool:
-        task: Task = await self.get_task_by_id(user_id=user_id, task_id=task_id)
-        del tasks[cast(int, task.id)]
-        return True
+        async with tasks_lock:
+            task: Task = await self.get_task_by_id(user_id=user_id, task_id=task_id)
+            self.store.remove(task)
+            return True
+
+    @override
+    async def create_tasks(
+        self, user_id: int, task_creates: list[TaskCreate]
+    ) -> list[Task]:
+        async with tasks_lock:
+            return [
+                self.store.insert(user_id=user_id, values=task_create.model_dump())
+                for task_create in task_creates
+            ]
+
+    @override
+    async def update_tasks(
+        self, user_id: int, task_updates: list[TaskBatchUpdateItem]
+    ) -> list[Task | None]:
+        updated_tasks: list[Task | None] = []
+        async with tasks_lock:
+            for task_update in task_updates:
+                task: Task | None = self._owned(user_id=user_id, task_id=task_update.id)
+                if task is None:
+                    updated_tasks.append(None)
+                    continue
+                updated_task: Task = task.model_copy(
+                    update=task_update.model_dump(exclude={"id"}, exclude_unset=True)
+                )
+                self.store.replace(updated_task)
+                updated_tasks.append(updated_task)
+        return updated_tasks
+
+    @override
+    async def delete_tasks(self, user_id: int, task_ids: list[int]) -> set[int]:
+        deleted_ids: set[int] = set()
+        async with tasks_lock:
+            for task_id in task_ids:
+                task: Task | None = self._owned(user_id=user_id, task_id=task_id)
+                if task is not None:
+                    self.store.remove(task)
+                    deleted_ids.add(task_id)
+        return deleted_ids
+
+    @override
+    async def get_task_stats(self, user_id: int) -> TaskStats:
+        # Counted on demand: a pass over the user's index, no counters to keep.
+        counts: Counter[TaskStatus] = Counter(
+            TaskStatus(cast(Task, self.store.get(task_id)).status)
+            for task_id in self.store.user_task_ids(user_id)
+        )
+        return TaskStats(
+            **{status.counter: counts[status] for status in TaskStatus},
+            total=counts.total(),
+        )
@@ -0,0 +1,317 @@
+import itertools
+import mmap
+import os
+import struct
+from abc import ABC, abstractmethod
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterator, Sequence
+from pathlib import Path
+from typing import Any, cast, override
+from app.schemas import Task
+from app.schemas.task_schemas import TaskStatus
+
+
+class TaskStore(ABC):
+    """
+    Storage behind `TaskInMemoryRepository`.
+
+    Ids are handed out by the store and only grow, so each user's ids are
+    kept in ascending order and a page is a bisect plus a slice.
+    """
+
+    @abstractmethod
+    def insert(self, user_id: int, values: dict[str, Any]) -> Task:  # pyright: ignore[reportExplicitAny]
+        pass
+
+    @abstractmethod
+    def get(self, task_id: int) -> Task | None:
+        pass
+
+    @abstractmethod
+    def replace(self, task: Task) -> None:
+        """Stores new field values for an existing task; `user_id` never changes."""
+        pass
+
+    @abstractmethod
+    def remove(self, task: Task) -> None:
+        pass
+
+    @abstractmethod
+    def user_task_ids(self, user_id: int) -> Sequence[int]:
+        pass
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+
+class DictTaskStore(TaskStore):
+    """Keeps `Task` instances in a dict; simple, but several hundred bytes a task."""
+
+    def __init__(self) -> None:
+        self.tasks: dict[int, Task] = {}
+        self.tasks_by_user: dict[int, list[int]] = {}
+        self.id_sequence: Iterator[int] = itertools.count(1)
+
+    @override
+    def insert(self, user_id: int, values: dict[str, Any]) -> Task:  # pyright: ignore[reportExplicitAny]
+        task: Task = Task.model_validate(
+            {**values, "id": next(self.id_sequence), "user_id": user_id}
+        )
+        self.tasks[cast(int, task.id)] = task
+        self.tasks_by_user.setdefault(user_id, []).append(cast(int, task.id))
+        return task
+
+    @override
+    def get(self, task_id: int) -> Task | None:
+        return self.tasks.get(task_id)
+
+    @override
+    def replace(self, task: Task) -> None:
+        self.tasks[cast(int, task.id)] = task
+
+    @override
+    def remove(self, task: Task) -> None:
+        task_id = cast(int, task.id)
+        del self.tasks[task_id]
+        user_task_ids = self.tasks_by_user[task.user_id]
+        del user_task_ids[bisect_left(user_task_ids, task_id)]
+
+    @override
+    def user_task_ids(self, user_id: int) -> Sequence[int]:
+        return self.tasks_by_user.get(user_id, [])
+
+    @override
+    def __len__(self) -> int:
+        return len(self.tasks)
+
+
+STATUSES: tuple[TaskStatus, ...] = tuple(TaskStatus)
+STATUS_CODES: dict[TaskStatus, int] = {status: code for code, status in enumerate(STATUSES)}
+DELETED: int = 0xFF
+NO_TEXT: int = -1
+
+# magic, version, rows, next id, text bytes, users
+HEADER: struct.Struct = struct.Struct("<8sIqqqq")
+MAGIC: bytes = b"TASKSNAP"
+VERSION: int = 1
+
+
+class CompactTaskStore(TaskStore):
+    """
+    Tasks as parallel typed arrays instead of model instances.
+
+    One row per task: id, user id and text offsets in 8-byte columns, the
+    status as a one-byte code into `STATUSES`, and titles/descriptions as
+    UTF-8 slices of a single bytearray. `Task` objects are built on read.
+    Rows are in id order, so a lookup is a bisect on `ids`; a delete marks
+    the row and an edit appends the new text. `compact` (run by `snapshot`)
+    drops both kinds of garbage.
+
+    `snapshot` writes the columns to a file as raw bytes and `load` maps the
+    file and copies each column back in one step, without touching rows.
+    """
+
+    def __init__(self) -> None:
+        self.ids: array[int] = array("q")
+        self.user_ids: array[int] = array("q")
+        self.statuses: array[int] = array("B")
+        self.title_offsets: array[int] = array("q")
+        self.title_lengths: array[int] = array("i")
+        self.description_offsets: array[int] = array("q")
+        self.description_lengths: array[int] = array("i")
+        self.text: bytearray = bytearray()
+        self.tasks_by_user: dict[int, array[int]] = {}
+        self.next_id: int = 1
+        self.live: int = 0
+        self.garbage_bytes: int = 0
+
+    def _row(self, task_id: int) -> int | None:
+        row = bisect_left(self.ids, task_id)
+        if row < len(self.ids) and self.ids[row] == task_id and self.statuses[row] != DELETED:
+            return row
+        return None
+
+    def _append_text(self, value: str | None) -> tuple[int, int]:
+        if value is None:
+            return 0, NO_TEXT
+        encoded = value.encode()
+        offset = len(self.text)
+        self.text += encoded
+        return offset, len(encoded)
+
+    def _read_text(self, offset: int, length: int) -> str | None:
+        if length == NO_TEXT:
+            return None
+        return self.text[offset : offset + length].decode()
+
+    def _task(self, row: int) -> Task:
+        # Every column holds values that were validated on the way in.
+        return Task.model_construct(
+            id=self.ids[row],
+            title=self._read_text(self.title_offsets[row], self.title_lengths[row]),
+            description=self._read_text(
+                self.description_offsets[row], self.description_lengths[row]
+            ),
+            status=STATUSES[self.statuses[row]],
+            user_id=self.user_ids[row],
+        )
+
+    @override
+    def insert(self, user_id: int, values: dict[str, Any]) -> Task:  # pyright: ignore[reportExplicitAny]
+        task: Task = Task.model_validate({**values, "id": self.next_id, "user_id": user_id})
+        self.next_id += 1
+        title_offset, title_length = self._append_text(task.title)
+        description_offset, description_length = self._append_text(task.description)
+        self.ids.append(cast(int, task.id))
+        self.user_ids.append(user_id)
+        self.statuses.append(STATUS_CODES[TaskStatus(task.status)])
+        self.title_offsets.append(title_offset)
+        self.title_lengths.append(title_length)
+        self.description_offsets.append(description_offset)
+        self.description_lengths.append(description_length)
+        self.tasks_by_user.setdefault(user_id, array("q")).append(cast(int, task.id))
+        self.live += 1
+        return task
+
+    @override
+    def get(self, task_id: int) -> Task | None:
+        row = self._row(task_id)
+        return None if row is None else self._task(row)
+
+    @override
+    def replace(self, task: Task) -> None:
+        row = self._row(cast(int, task.id))
+        if row is None:
+            raise KeyError(task.id)
+        self.statuses[row] = STATUS_CODES[TaskStatus(task.status)]
+        for offsets, lengths, value in (
+            (self.title_offsets, self.title_lengths, task.title),
+            (self.description_offsets, self.description_lengths, task.description),
+        ):
+            if self._read_text(offsets[row], lengths[row]) != value:
+                self.garbage_bytes += max(lengths[row], 0)
+                offsets[row], lengths[row] = self._append_text(value)
+
+    @override
+    def remove(self, task: Task) -> None:
+        task_id = cast(int, task.id)
+        row = self._row(task_id)
+        if row is None:
+            raise KeyError(task_id)
+        self.statuses[row] = DELETED
+        self.garbage_bytes += max(self.title_lengths[row], 0)
+        self.garbage_bytes += max(self.description_lengths[row], 0)
+        self.live -= 1
+        user_task_ids = self.tasks_by_user[task.user_id]
+        del user_task_ids[bisect_left(user_task_ids, task_id)]
+
+    @override
+    def user_task_ids(self, user_id: int) -> Sequence[int]:
+        return self.tasks_by_user.get(user_id, array("q"))
+
+    @override
+    def __len__(self) -> int:
+        return self.live
+
+    def compact(self) -> None:
+        """Drops deleted rows and text no row points at."""
+        if self.live == len(self.ids) and self.garbage_bytes == 0:
+            return
+        rows = [row for row in range(len(self.ids)) if self.statuses[row] != DELETED]
+        text = bytearray()
+        text_columns: list[tuple[array[int], array[int]]] = []
+        for offsets, lengths in (
+            (self.title_offsets, self.title_lengths),
+            (self.description_offsets, self.description_lengths),
+        ):
+            fresh_offsets, fresh_lengths = array("q"), array("i")
+            for row in rows:
+                offset, length = offsets[row], lengths[row]
+                fresh_offsets.append(len(text))
+                fresh_lengths.append(length)
+                if length != NO_TEXT:
+                    text += self.text[offset : offset + length]
+            text_columns.append((fresh_offsets, fresh_lengths))
+        self.ids = array("q", (self.ids[row] for row in rows))
+        self.user_ids = array("q", (self.user_ids[row] for row in rows))
+        self.statuses = array("B", (self.statuses[row] for row in rows))
+        (self.title_offsets, self.title_lengths), (
+            self.description_offsets,
+            self.description_lengths,
+        ) = text_columns
+        self.text = text
+        self.garbage_bytes = 0
+
+    def _columns(self) -> tuple[array[int], ...]:
+        return (
+            self.ids,
+            self.user_ids,
+            self.statuses,
+            self.title_offsets,
+            self.title_lengths,
+            self.description_offsets,
+            self.description_lengths,
+        )
+
+    def snapshot(self, path: str | Path) -> None:
+        """Writes the store to `path`, replacing the file only once it is complete."""
+        self.compact()
+        users = array("q", self.tasks_by_user)
+        counts = array("q", (len(ids) for ids in self.tasks_by_user.values()))
+        target = Path(path)
+        partial = target.with_name(target.name + ".partial")
+        with partial.open("wb") as f:
+            _ = f.write(
+                HEADER.pack(MAGIC, VERSION, len(self.ids), self.next_id, len(self.text), len(users))
+            )
+            for column in (*self._columns(), users, counts, *self.tasks_by_user.values()):
+                column.tofile(f)
+            _ = f.write(self.text)
+            # On disk before the rename, or a crash could leave a short file
+            # under the final name.
+            f.flush()
+            os.fsync(f.fileno())
+        _ = partial.replace(target)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "CompactTaskStore":
+        store = cls()
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                if len(view) < HEADER.size:
+                    raise ValueError(f"{path} is not a version {VERSION} task snapshot")
+                magic, version, rows, store.next_id, text_bytes, user_count = HEADER.unpack_from(view)
+                if magic != MAGIC or version != VERSION:
+                    raise ValueError(f"{path} is not a version {VERSION} task snapshot")
+                position = HEADER.size
+
+                def take(column: array[int], count: int) -> array[int]:
+                    nonlocal position
+                    end = position + count * column.itemsize
+                    if count < 0 or end > len(view):
+                        raise ValueError(f"{path} is truncated")
+                    column.frombytes(view[position:end])
+                    position = end
+                    return column
+
+                for column in store._columns():
+                    _ = take(column, rows)
+                users = take(array("q"), user_count)
+                counts = take(array("q"), user_count)
+                # Everything left is per-user id lists and the text; a short
+                # file would otherwise load with empty titles.
+                expected = position + sum(counts) * array("q").itemsize + text_bytes
+                if text_bytes < 0 or expected != len(view):
+                    raise ValueError(
+                        f"{path} holds {len(view)} bytes, its header promises {expected}"
+                    )
+                for user_id, count in zip(users, counts):
+                    store.tasks_by_user[user_id] = take(array("q"), count)
+                store.text = bytearray(view[position : position + text_bytes])
+            finally:
+                view.release()
+        store.live = rows
+        return store
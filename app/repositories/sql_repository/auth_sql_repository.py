@@ -11,6 +11,8 @@ from typing import override
 
 
 class AuthSQLRepository(BaseAuthRepository):
+    __slots__ = ("db",)
+
     def __init__(self, db: AsyncSession) -> None:
         self.db: AsyncSession = db
 
@@ -20,7 +22,7 @@ class AuthSQLRepository(BaseAuthRepository):
             user: User = User.model_validate(
                 obj={
                     **user_create.model_dump(),
-                    "hashed_password": password_validator.get_password_hash(
+                    "hashed_password": await password_validator.get_password_hash(
                         user_create.password
                     ),
                 }
@@ -61,7 +63,7 @@ class AuthSQLRepository(BaseAuthRepository):
     async def authenticate_user(self, username: str, password: str) -> User:
         try:
             user: User = await self.get_user_by_username(username)
-            if not password_validator.verify_password(
+            if not await password_validator.verify_password(
                 plain_password=password, hashed_password=user.hashed_password
             ):
                 raise AppException(message="Incorrect username or password")
@@ -106,7 +108,7 @@ class AuthSQLRepository(BaseAuthRepository):
     async def update_user_password(self, email: EmailStr, new_password: str) -> User:
         try:
             user: User = await self.get_user_by_email(email=email)
-            user.hashed_password = password_validator.get_password_hash(new_password)
+            user.hashed_password = await password_validator.get_password_hash(new_password)
             self.db.add(instance=user)
             await self.db.commit()
             await self.db.refresh(instance=user)
@@ -0,0 +1,123 @@
+from typing import Any
+from sqlalchemy import Connection, Float, Table, TextClause, column, event, text
+from app.core import AppException
+from app.schemas import Task
+
+# Full-text search over task titles and descriptions.
+#
+# PostgreSQL: a stored, generated `search_vector` tsvector column (title
+# weighted above description) with a GIN index; being generated, it can
+# never drift from the row. SQLite: an external-content FTS5 table,
+# `tasks_fts`, kept in step with `tasks` by triggers, with a prefix index so
+# the last, partial word of a query stays cheap. Both are created by
+# the Alembic migration and, for databases built with `create_all` (tests),
+# by the listeners below. Neither is part of the SQLModel model.
+
+SEARCH_TABLE: str = "tasks_fts"
+SEARCH_COLUMN: str = "search_vector"
+
+POSTGRES_SEARCH_DDL: tuple[str, ...] = (
+    f"""ALTER TABLE tasks ADD COLUMN IF NOT EXISTS {SEARCH_COLUMN} tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A')
+        || setweight(to_tsvector('english', coalesce(description, '')), 'B')
+    ) STORED""",
+    f"CREATE INDEX IF NOT EXISTS ix_tasks_{SEARCH_COLUMN} ON tasks USING gin ({SEARCH_COLUMN})",
+)
+
+SQLITE_SEARCH_DDL: tuple[str, ...] = (
+    # `owner` holds a "u<user_id>" token, so a user's hits are an intersection
+    # of posting lists inside FTS5 instead of a filter over everyone's hits.
+    # The view gives the external-content table a source for that column.
+    f"""CREATE VIEW IF NOT EXISTS {SEARCH_TABLE}_source AS
+        SELECT id, title, description, 'u' || user_id AS owner FROM tasks""",
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5(
+        title, description, owner, content='{SEARCH_TABLE}_source', content_rowid='id',
+        tokenize='porter unicode61 remove_diacritics 2', prefix='2 3'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks BEGIN
+        INSERT INTO {SEARCH_TABLE}(rowid, title, description, owner)
+        VALUES (new.id, new.title, new.description, 'u' || new.user_id);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks BEGIN
+        INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, title, description, owner)
+        VALUES ('delete', old.id, old.title, old.description, 'u' || old.user_id);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS tasks_fts_update AFTER UPDATE OF title, description ON tasks BEGIN
+        INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, title, description, owner)
+        VALUES ('delete', old.id, old.title, old.description, 'u' || old.user_id);
+        INSERT INTO {SEARCH_TABLE}(rowid, title, description, owner)
+        VALUES (new.id, new.title, new.description, 'u' || new.user_id);
+    END""",
+    f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('rebuild')",
+)
+
+# Ranked hits with a keyset seek on (score desc, id). The inner query finds
+# the user's matches; scoring in a subquery lets the seek filter on it.
+# bm25() is lower-is-better, so it is negated to match ts_rank. Title hits
+# weigh 2.5x description hits, as ts_rank's default A/B weights do.
+_TASK_COLUMNS: str = ", ".join(
+    f"tasks.{column.name}" for column in Task.__table__.columns  # pyright: ignore[reportAttributeAccessIssue, reportUnknownMemberType, reportUnknownVariableType]
+)
+_HITS: dict[str, str] = {
+    "postgresql": f"""
+        SELECT {_TASK_COLUMNS}, ts_rank(tasks.{SEARCH_COLUMN}, query) AS score
+        FROM tasks, to_tsquery('english', :query) AS query
+        WHERE tasks.user_id = :user_id AND tasks.{SEARCH_COLUMN} @@ query
+    """,
+    "sqlite": f"""
+        SELECT {_TASK_COLUMNS}, -bm25({SEARCH_TABLE}, 2.5, 1.0, 0.0) AS score
+        FROM {SEARCH_TABLE} JOIN tasks ON tasks.id = {SEARCH_TABLE}.rowid
+        WHERE {SEARCH_TABLE} MATCH :query AND tasks.user_id = :user_id
+    """,
+}
+
+
+def match_expression(dialect_name: str, terms: list[str], user_id: int) -> str:
+    """
+    All terms must match; the last one as a prefix, so results follow typing.
+
+    Terms come from `search_terms`, so they are `\\w+` only and stay literal
+    in both query languages.
+    """
+    if dialect_name == "postgresql":
+        return " & ".join([*terms[:-1], f"{terms[-1]}:*"])
+    words = " ".join([*(f'"{term}"' for term in terms[:-1]), f'"{terms[-1]}"*'])
+    return f'owner:"u{user_id}" AND {{title description}}: ({words})'
+
+
+def search_statement(dialect_name: str, after: tuple[float, int] | None) -> TextClause:
+    if dialect_name not in _HITS:
+        raise AppException(
+            message=f"Task search is not available on {dialect_name}", status_code=501
+        )
+    seek = (
+        "WHERE hits.score < :after_score OR (hits.score = :after_score AND hits.id > :after_id)"
+        if after is not None
+        else ""
+    )
+    return text(
+        f"SELECT * FROM ({_HITS[dialect_name]}) AS hits {seek} "
+        "ORDER BY hits.score DESC, hits.id LIMIT :limit"
+    ).columns(
+        # Same order as _TASK_COLUMNS; typed like the table, so status comes
+        # back as a TaskStatus.
+        *Task.__table__.columns,  # pyright: ignore[reportAttributeAccessIssue, reportUnknownMemberType, reportUnknownArgumentType]
+        column("score", Float),
+    )
+
+
+@event.listens_for(Task.__table__, "after_create")  # pyright: ignore[reportAttributeAccessIssue, reportUnknownMemberType, reportUntypedFunctionDecorator]
+def create_search_index(target: Table, connection: Connection, **kw: Any) -> None:  # pyright: ignore[reportUnusedParameter, reportExplicitAny, reportAny]
+    ddl = {"postgresql": POSTGRES_SEARCH_DDL, "sqlite": SQLITE_SEARCH_DDL}
+    for statement in ddl.get(connection.dialect.name, ()):
+        _ = connection.exec_driver_sql(statement)
+
+
+@event.listens_for(Task.__table__, "before_drop")  # pyright: ignore[reportAttributeAccessIssue, reportUnknownMemberType, reportUntypedFunctionDecorator]
+def drop_search_index(target: Table, connection: Connection, **kw: Any) -> None:  # pyright: ignore[reportUnusedParameter, reportExplicitAny, reportAny]
+    # The triggers and generated column go with the table; the FTS table and
+    # its source view do not.
+    if connection.dialect.name == "sqlite":
+        _ = connection.exec_driver_sql(f"DROP TABLE IF EXISTS {SEARCH_TABLE}")
+        _ = connection.exec_driver_sql(f"DROP VIEW IF EXISTS {SEARCH_TABLE}_source")
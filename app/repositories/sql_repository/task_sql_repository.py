@@ -1,27 +1,114 @@
-from typing import override
+from collections import Counter
+from typing import Any, cast, override
 from sqlalchemy.exc import DataError, IntegrityError, NoResultFound
 from app.core import AppException, ConflictException, NotFoundException
-from app.core.cache_utils import cache_task_details
-from app.schemas import TaskCreate, Task, TaskUpdate
+from app.core.db import on_replica
+from app.schemas import (
+    TaskBatchUpdateItem,
+    TaskCreate,
+    Task,
+    TaskListQuery,
+    TaskStats,
+    TaskUpdate,
+    User,
+)
+from app.schemas.task_schemas import TASK_FIELDS, TaskStatus
+from app.schemas.user_task_relation_schemas import TaskStatsModel
 from app.repositories.base_repository import BaseTaskRepository
+from .task_search import match_expression, search_statement
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlalchemy.engine import ScalarResult
-from sqlmodel import select
+from sqlalchemy.engine import Dialect, ScalarResult
+from sqlalchemy import func, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import delete, insert, select, update
 
 
 class TaskSQLRepository(BaseTaskRepository):
+    __slots__ = ("db",)
+
     def __init__(self, db: AsyncSession) -> None:
         self.db: AsyncSession = db
 
     @override
-    async def get_all_tasks(self, user_id: int) -> list[Task]:
+    async def get_all_tasks(
+        self,
+        user_id: int,
+        after: int | None = None,
+        limit: int | None = None,
+        query: TaskListQuery | None = None,
+        after_value: str | None = None,
+    ) -> list[Task]:
         try:
-            result: ScalarResult[Task] = await self.db.exec(
-                select(Task).where(Task.user_id == user_id)
+            query = query or TaskListQuery()
+            by_id: bool = query.sort.field == "id"
+            sort_column = Task.id if by_id else Task.title
+            if query.fields is None:
+                statement = select(Task)
+            else:
+                # Only the requested columns, plus the ones the cursor needs.
+                names = {*query.fields, "id", query.sort.field}
+                statement = select(*(getattr(Task, name) for name in TASK_FIELDS if name in names))  # pyright: ignore[reportAny]
+            # Keyset seek on (user_id, [sort column,] id): the cost of a page
+            # does not depend on how many pages came before it.
+            statement = statement.where(Task.user_id == user_id)
+            if query.status is not None:
+                statement = statement.where(Task.status == query.status)
+            if query.title_prefix is not None:
+                statement = statement.where(
+                    Task.title.startswith(query.title_prefix, autoescape=True)  # pyright: ignore[reportOptionalMemberAccess, reportAttributeAccessIssue, reportUnknownMemberType, reportUnknownArgumentType]
+                )
+            if after is not None:
+                if by_id:
+                    seek = Task.id < after if query.sort.descending else Task.id > after  # pyright: ignore[reportOptionalOperand]
+                else:
+                    position = tuple_(sort_column, Task.id)
+                    seek = (
+                        position < (after_value, after)
+                        if query.sort.descending
+                        else position > (after_value, after)
+                    )
+                statement = statement.where(seek)
+            order = [Task.id] if by_id else [sort_column, Task.id]
+            statement = statement.order_by(
+                *(column.desc() if query.sort.descending else column for column in order)  # pyright: ignore[reportAttributeAccessIssue, reportUnknownMemberType, reportUnknownArgumentType]
+            )
+            if limit is not None:
+                statement = statement.limit(limit)
+            if query.fields is None:
+                result: ScalarResult[Task] = await self.db.exec(on_replica(statement))  # pyright: ignore[reportArgumentType, reportCallIssue]
+                task_list = list[Task](result.all())
+                return task_list
+            rows = await self.db.exec(on_replica(statement))  # pyright: ignore[reportArgumentType, reportCallIssue]
+            # Rows come straight from the table, so they skip validation.
+            return [Task.model_construct(**row) for row in rows.mappings()]  # pyright: ignore[reportUnknownMemberType, reportUnknownVariableType, reportUnknownArgumentType]
+        except Exception as e:
+            raise e
+
+    @override
+    async def search_tasks(
+        self,
+        user_id: int,
+        terms: list[str],
+        limit: int,
+        after: tuple[float, int] | None = None,
+    ) -> list[tuple[Task, float]]:
+        try:
+            dialect_name: str = self.__dialect().name
+            params: dict[str, Any] = {  # pyright: ignore[reportExplicitAny]
+                "query": match_expression(dialect_name, terms, user_id),
+                "user_id": user_id,
+                "limit": limit,
+            }
+            if after is not None:
+                params.update(after_score=after[0], after_id=after[1])
+            result = await self.db.exec(
+                on_replica(search_statement(dialect_name, after)),  # pyright: ignore[reportArgumentType, reportCallIssue]
+                params=params,
             )
-            task_list = list[Task](result.all())
-            await cache_task_details(tasks=task_list)
-            return task_list
+            return [
+                (Task.model_construct(**{name: row[name] for name in TASK_FIELDS}), row["score"])  # pyright: ignore[reportAny]
+                for row in result.mappings()  # pyright: ignore[reportUnknownMemberType, reportUnknownVariableType]
+            ]
         except Exception as e:
             raise e
 
@@ -29,7 +116,7 @@ class TaskSQLRepository(BaseTaskRepository):
     async def get_task_by_id(self, user_id: int, task_id: int) -> Task:
         try:
             result: ScalarResult[Task] = await self.db.exec(
-                select(Task).where(Task.id == task_id and Task.user_id == user_id)
+                on_replica(select(Task).where(Task.user_id == user_id, Task.id == task_id))
             )
             return result.one()
         except NoResultFound as e:
@@ -46,6 +133,7 @@ class TaskSQLRepository(BaseTaskRepository):
                 obj={**task_create.model_dump(), "user_id": user_id}
             )
             self.db.add(instance=new_task)
+            await self.__count_statuses(user_id, Counter([new_task.status]))
             await self.db.commit()
             await self.db.refresh(instance=new_task)
             return new_task
@@ -68,14 +156,52 @@ class TaskSQLRepository(BaseTaskRepository):
         task_update: TaskUpdate,
     ) -> Task:
         try:
-
-            task: Task = await self.get_task_by_id(user_id=user_id, task_id=task_id)
             task_data: dict[str, str | int] = task_update.model_dump(exclude_unset=True)
-            for key, value in task_data.items():
-                setattr(task, key, value)
-            self.db.add(instance=task)
+            if not task_data:
+                return await self.get_task_by_id(user_id=user_id, task_id=task_id)
+            dialect: Dialect = self.__dialect()
+            owned = (Task.user_id == user_id, Task.id == task_id)
+            statement = update(Task).where(*owned).values(**task_data)  # pyright: ignore[reportArgumentType]
+            returning = [*Task.__table__.columns]  # pyright: ignore[reportAttributeAccessIssue, reportUnknownMemberType, reportUnknownVariableType]
+            previous: TaskStatus | None = None
+            if "status" in task_data and dialect.name == "postgresql":
+                # The counters move from the status the row really had: the
+                # CTE locks the row and hands its old status to RETURNING,
+                # so this stays a single statement.
+                old = select(Task.id, Task.status).where(*owned).with_for_update().cte("old")
+                statement = update(Task).where(Task.id == old.c.id).values(**task_data)  # pyright: ignore[reportArgumentType]
+                returning.append(old.c.status.label("previous_status"))
+            elif "status" in task_data:
+                # SQLite's RETURNING cannot read the tables of an UPDATE ...
+                # FROM, so the old status is read (and locked) first.
+                previous = (
+                    await self.db.exec(select(Task.status).where(*owned).with_for_update())
+                ).one_or_none()
+            if dialect.update_returning:
+                # Single round-trip: UPDATE ... RETURNING the full row.
+                result = await self.db.exec(statement.returning(*returning))  # pyright: ignore[reportUnknownArgumentType]
+                row = result.mappings().one_or_none()
+                if row is None:
+                    raise NotFoundException(
+                        message=f"Task with id {task_id} does not exist",
+                    )
+                values: dict[str, Any] = dict(row)  # pyright: ignore[reportExplicitAny]
+                previous = values.pop("previous_status", previous)
+                task: Task = Task.model_validate(obj=values)
+                await self.__move_status(user_id, previous, task)
+                await self.db.commit()
+                return task
+
+            result = await self.db.exec(statement)
+            if result.rowcount == 0:
+                raise NotFoundException(
+                    message=f"Task with id {task_id} does not exist",
+                )
+            # Copy before commit: committing expires the session's instance.
+            task = await self.get_task_by_id(user_id=user_id, task_id=task_id)
+            task = Task.model_validate(obj=task.model_dump())
+            await self.__move_status(user_id, previous, task)
             await self.db.commit()
-            await self.db.refresh(instance=task)
             return task
         except Exception as e:
             raise e
@@ -94,9 +220,277 @@ class TaskSQLRepository(BaseTaskRepository):
     @override
     async def delete_task(self, user_id: int, task_id: int) -> bool:
         try:
-            task: Task = await self.get_task_by_id(user_id=user_id, task_id=task_id)
-            await self.db.delete(instance=task)
+            statement = delete(Task).where(
+                Task.user_id == user_id, Task.id == task_id  # pyright: ignore[reportArgumentType]
+            )
+            if self.__dialect().delete_returning:
+                result = await self.db.exec(statement.returning(Task.status))  # pyright: ignore[reportArgumentType]
+                status: TaskStatus | None = result.scalar_one_or_none()
+            else:
+                status = (
+                    await self.db.exec(
+                        select(Task.status).where(Task.user_id == user_id, Task.id == task_id)
+                    )
+                ).one_or_none()
+                if status is not None:
+                    _ = await self.db.exec(statement)
+            if status is None:
+                raise NotFoundException(
+                    message=f"Task with id {task_id} does not exist",
+                )
+            await self.__count_statuses(user_id, Counter({status: -1}))
             await self.db.commit()
             return True
         except Exception as e:
             raise e
+
+    @override
+    async def create_tasks(
+        self, user_id: int, task_creates: list[TaskCreate]
+    ) -> list[Task]:
+        try:
+            rows: list[dict[str, Any]] = [  # pyright: ignore[reportExplicitAny]
+                {**task_create.model_dump(), "user_id": user_id}
+                for task_create in task_creates
+            ]
+            if self.__dialect().insert_executemany_returning_sort_by_parameter_order:
+                # One multi-row INSERT ... RETURNING, rows in input order.
+                result = await self.db.exec(
+                    insert(Task).returning(
+                        *Task.__table__.columns,  # pyright: ignore[reportAttributeAccessIssue, reportUnknownMemberType, reportUnknownArgumentType]
+                        sort_by_parameter_order=True,
+                    ),
+                    params=rows,
+                )
+                tasks: list[Task] = [
+                    Task.model_validate(obj=dict(row)) for row in result.mappings()
+                ]
+            else:
+                new_tasks: list[Task] = [Task.model_validate(obj=row) for row in rows]
+                self.db.add_all(instances=new_tasks)
+                await self.db.flush()
+                tasks = [Task.model_validate(obj=task.model_dump()) for task in new_tasks]
+            await self.__count_statuses(user_id, Counter(task.status for task in tasks))
+            await self.db.commit()
+            return tasks
+        except IntegrityError as e:
+            raise ConflictException(
+                message="Task must be unique",
+            )
+        except DataError as e:
+            raise AppException(
+                message="Invalid data type or value too long",
+            )
+        except Exception as e:
+            raise e
+
+    @override
+    async def update_tasks(
+        self, user_id: int, task_updates: list[TaskBatchUpdateItem]
+    ) -> list[Task | None]:
+        try:
+            requested_ids: set[int] = {task_update.id for task_update in task_updates}
+            owned = await self.db.exec(
+                select(Task.id, Task.status)
+                .where(
+                    Task.user_id == user_id, Task.id.in_(requested_ids)  # pyright: ignore[reportOptionalMemberAccess, reportAttributeAccessIssue, reportUnknownMemberType]
+                )
+                .with_for_update()
+            )
+            previous: dict[int, TaskStatus] = {
+                cast(int, task_id): status for task_id, status in owned.all()
+            }
+            owned_ids: set[int] = set(previous)
+            rows: list[dict[str, Any]] = [  # pyright: ignore[reportExplicitAny]
+                {**task_update.model_dump(exclude_unset=True), "id": task_update.id}
+                for task_update in task_updates
+                if task_update.id in owned_ids
+            ]
+            rows = [row for row in rows if len(row) > 1]
+            if rows:
+                # ORM bulk UPDATE by primary key: one executemany statement.
+                # Rows are re-read below, so skip syncing the identity map.
+                _ = await self.db.exec(
+                    update(Task).where(Task.user_id == user_id),  # pyright: ignore[reportArgumentType]
+                    params=rows,
+                    execution_options={"synchronize_session": None},
+                )
+            updated: ScalarResult[Task] = await self.db.exec(
+                select(Task)
+                .where(Task.id.in_(owned_ids))  # pyright: ignore[reportOptionalMemberAccess, reportAttributeAccessIssue, reportUnknownMemberType, reportUnknownArgumentType]
+                .execution_options(populate_existing=True)
+            )
+            tasks: dict[int, Task] = {
+                cast(int, task.id): Task.model_validate(obj=task.model_dump())
+                for task in updated.all()
+            }
+            moves: Counter[TaskStatus] = Counter(task.status for task in tasks.values())
+            moves.subtract(previous.values())
+            await self.__count_statuses(user_id, moves)
+            await self.db.commit()
+            return [tasks.get(task_update.id) for task_update in task_updates]
+        except IntegrityError as e:
+            raise ConflictException(
+                message="Task must be unique",
+            )
+        except DataError as e:
+            raise AppException(
+                message="Invalid data type or value too long",
+            )
+        except Exception as e:
+            raise e
+
+    @override
+    async def delete_tasks(self, user_id: int, task_ids: list[int]) -> set[int]:
+        try:
+            statement = delete(Task).where(
+                Task.user_id == user_id, Task.id.in_(task_ids)  # pyright: ignore[reportOptionalMemberAccess, reportAttributeAccessIssue, reportUnknownMemberType, reportArgumentType]
+            )
+            if self.__dialect().delete_returning:
+                result = await self.db.exec(statement.returning(Task.id, Task.status))  # pyright: ignore[reportArgumentType]
+                deleted: dict[int, TaskStatus] = dict(result.tuples().all())  # pyright: ignore[reportUnknownMemberType, reportUnknownArgumentType]
+            else:
+                owned = await self.db.exec(
+                    select(Task.id, Task.status).where(
+                        Task.user_id == user_id, Task.id.in_(task_ids)  # pyright: ignore[reportOptionalMemberAccess, reportAttributeAccessIssue, reportUnknownMemberType]
+                    )
+                )
+                deleted = {cast(int, task_id): status for task_id, status in owned.all()}
+                _ = await self.db.exec(statement)
+            moves: Counter[TaskStatus] = Counter()
+            moves.subtract(deleted.values())
+            await self.__count_statuses(user_id, moves)
+            await self.db.commit()
+            return set(deleted)
+        except Exception as e:
+            raise e
+
+    @override
+    async def get_task_stats(self, user_id: int) -> TaskStats:
+        try:
+            result: ScalarResult[TaskStatsModel] = await self.db.exec(
+                on_replica(select(TaskStatsModel).where(TaskStatsModel.user_id == user_id))
+            )
+            row: TaskStatsModel | None = result.one_or_none()
+            if row is None:
+                return TaskStats()
+            counts = row.model_dump(include={status.counter for status in TaskStatus})
+            return TaskStats(**counts, total=sum(counts.values()))
+        except Exception as e:
+            raise e
+
+    async def rebuild_task_stats(
+        self, user_id: int | None = None, batch_size: int = 500
+    ) -> int:
+        """
+        Recounts `task_stats` from `tasks`, for one user or for all of them.
+
+        Corrects counters that drifted (say, rows changed outside the app).
+        Users are recounted `batch_size` at a time, each batch in its own
+        short transaction, so a run never holds up writes by everyone at
+        once. Returns the number of users counted.
+        """
+        try:
+            counted = 0
+            after = 0
+            while True:
+                if user_id is not None:
+                    user_ids: list[int] = [user_id]
+                else:
+                    user_ids = [
+                        cast(int, id_)
+                        for id_ in (
+                            await self.db.exec(
+                                select(User.id)
+                                .where(User.id > after)  # pyright: ignore[reportOptionalOperand]
+                                .order_by(User.id)  # pyright: ignore[reportArgumentType]
+                                .limit(batch_size)
+                            )
+                        ).all()
+                    ]
+                if not user_ids:
+                    return counted
+                await self.__recount_statuses(user_ids)
+                await self.db.commit()
+                counted += len(user_ids)
+                if user_id is not None or len(user_ids) < batch_size:
+                    return counted
+                after = user_ids[-1]
+        except Exception as e:
+            raise e
+
+    async def __recount_statuses(self, user_ids: list[int]) -> None:
+        """Overwrites the counters of `user_ids` with a count of their tasks."""
+        table = TaskStatsModel.__table__  # pyright: ignore[reportAttributeAccessIssue, reportUnknownMemberType, reportUnknownVariableType]
+        dialect = postgresql if self.__dialect().name == "postgresql" else sqlite
+        _ = await self.db.exec(
+            dialect.insert(table)  # pyright: ignore[reportUnknownArgumentType, reportArgumentType, reportCallIssue]
+            .values([{"user_id": user_id} for user_id in user_ids])
+            .on_conflict_do_nothing()
+        )
+        # Writers bump these rows in the transaction that changes their tasks,
+        # so with the rows locked the count below sees every committed write
+        # and any write still in flight lands after the overwrite.
+        _ = await self.db.exec(
+            select(TaskStatsModel.user_id)
+            .where(TaskStatsModel.user_id.in_(user_ids))  # pyright: ignore[reportAttributeAccessIssue, reportUnknownMemberType]
+            .with_for_update()
+        )
+        counts = await self.db.exec(
+            select(
+                Task.user_id,
+                *(
+                    func.count().filter(Task.status == status).label(status.counter)
+                    for status in TaskStatus
+                ),
+            )
+            .where(Task.user_id.in_(user_ids))  # pyright: ignore[reportOptionalMemberAccess, reportAttributeAccessIssue, reportUnknownMemberType]
+            .group_by(Task.user_id)
+        )
+        by_user: dict[int, dict[str, int]] = {
+            row["user_id"]: {status.counter: row[status.counter] for status in TaskStatus}  # pyright: ignore[reportAny]
+            for row in counts.mappings()  # pyright: ignore[reportUnknownMemberType, reportUnknownVariableType]
+        }
+        zero = {status.counter: 0 for status in TaskStatus}
+        # ORM bulk UPDATE by primary key: one executemany statement.
+        _ = await self.db.exec(
+            update(TaskStatsModel),
+            params=[
+                {"user_id": user_id, **by_user.get(user_id, zero)} for user_id in user_ids
+            ],
+            execution_options={"synchronize_session": None},
+        )
+
+    async def __count_statuses(self, user_id: int, moves: Counter[TaskStatus]) -> None:
+        """
+        Adds `moves` (tasks gained or lost per status) to the user's counters.
+
+        Runs in the caller's transaction, so counters commit or roll back with
+        the task rows; an upsert, so a user's first task creates their row.
+        """
+        changes: dict[str, int] = {
+            TaskStatus(status).counter: count for status, count in moves.items() if count
+        }
+        if not changes:
+            return
+        table = TaskStatsModel.__table__  # pyright: ignore[reportAttributeAccessIssue, reportUnknownMemberType, reportUnknownVariableType]
+        dialect = postgresql if self.__dialect().name == "postgresql" else sqlite
+        statement = (
+            dialect.insert(table)  # pyright: ignore[reportUnknownArgumentType]
+            .values(user_id=user_id, **changes)
+            .on_conflict_do_update(
+                index_elements=[table.c.user_id],  # pyright: ignore[reportUnknownMemberType]
+                set_={name: table.c[name] + count for name, count in changes.items()},  # pyright: ignore[reportUnknownMemberType]
+            )
+        )
+        _ = await self.db.exec(statement)  # pyright: ignore[reportArgumentType, reportCallIssue]
+
+    async def __move_status(
+        self, user_id: int, previous: TaskStatus | None, task: Task
+    ) -> None:
+        if previous is not None and previous != task.status:
+            await self.__count_statuses(user_id, Counter({previous: -1, task.status: 1}))
+
+    def __dialect(self) -> Dialect:
+        """Dialect of the bound engine, used to pick RETURNING or a fallback."""
+        return self.db.get_bind().dialect
@@ -1,4 +1,5 @@
 from .task_router import router as task_router
 from .auth_router import auth_router
+from .metrics_router import db_metrics_router, metrics_router
 
-__all__ = ["task_router", "auth_router"]
+__all__ = ["task_router", "auth_router", "db_metrics_router", "metrics_router"]
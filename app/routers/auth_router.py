@@ -6,6 +6,7 @@ from app.config import config
 from app.services.auth_service import (
     ActivateUserAccountResponse,
     ActivationEmail,
+    LogoutRequest,
     RestPassword,
     UserResponse,
 )
@@ -15,8 +16,8 @@ from fastapi import Depends, Request, status
 from app.routers.base import CustomRouter
 from app.schemas import AccessToken, AuthLogin, UserCreate
 from app.services import AuthService
-from app.core import get_auth_service
-from app.utils import email_service, is_valid_url
+from app.core import get_auth_service, require_auth
+from app.utils import JWTPayload, email_service, is_valid_url
 
 
 auth_router: CustomRouter = CustomRouter(prefix="/auth", tags=["auth"])
@@ -73,6 +74,30 @@ async def get_access_token(
     return await auth_service.get_access_token(token_string=token_string)
 
 
+@auth_router.post(
+    path="/logout",
+    response_model=dict[str, str],
+    status_code=status.HTTP_200_OK,
+    dependencies=[
+        Depends(dependency=require_auth),
+    ],
+)
+async def log_out(
+    logout_request: LogoutRequest | None = None,
+    access_payload: JWTPayload = Depends(  # pyright: ignore[reportCallInDefaultInitializer]
+        dependency=require_auth
+    ),
+    auth_service: AuthService = Depends(
+        dependency=get_auth_service
+    ),  # pyright: ignore[reportCallInDefaultInitializer]
+) -> dict[str, str]:
+    await auth_service.log_out(
+        access_payload=access_payload,
+        refresh_token=logout_request.refresh_token if logout_request else None,
+    )
+    return {"message": "Logged out successfully."}
+
+
 @auth_router.get(
     path="/activate-account",
     response_model=dict[str, str],
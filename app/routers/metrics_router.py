@@ -0,0 +1,58 @@
+from fastapi import Depends, status
+from app.core import require_auth
+from app.core.cache_backend import cache_metrics
+from app.core.db import pool_stats
+from app.core.revocation import revocation_list
+from app.routers.base import CustomRouter
+from app.utils import json_sink, jwt_auth_token, password_validator
+
+# Only mounted when `features.enable_debug_routes` is on.
+metrics_router: CustomRouter = CustomRouter(prefix="/metrics", tags=["metrics"])
+# Always mounted, for pool dashboards and alerts in production.
+db_metrics_router: CustomRouter = CustomRouter(prefix="/metrics", tags=["metrics"])
+
+
+@metrics_router.get(
+    path="/cache", response_model=dict[str, int], status_code=status.HTTP_200_OK
+)
+async def cache_stats() -> dict[str, int]:
+    return cache_metrics.snapshot()
+
+
+@metrics_router.get(
+    path="/logging", response_model=dict[str, int], status_code=status.HTTP_200_OK
+)
+async def logging_stats() -> dict[str, int]:
+    return {"dropped": json_sink.dropped, "queued": json_sink.pending}
+
+
+@metrics_router.get(
+    path="/passwords",
+    response_model=dict[str, dict[str, int]],
+    status_code=status.HTTP_200_OK,
+)
+async def password_stats() -> dict[str, dict[str, int]]:
+    return {
+        "hashing": password_validator.hashing_pool.snapshot(),
+        "strength": password_validator.strength_pool.snapshot(),
+    }
+
+
+@metrics_router.get(
+    path="/tokens", response_model=dict[str, int], status_code=status.HTTP_200_OK
+)
+async def token_stats() -> dict[str, int]:
+    return {
+        **jwt_auth_token.verified_cache.snapshot(),
+        **revocation_list.snapshot(),
+    }
+
+
+@db_metrics_router.get(
+    path="/db",
+    response_model=dict[str, int | float],
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(dependency=require_auth)],
+)
+async def db_stats() -> dict[str, int | float]:
+    return pool_stats()
@@ -1,51 +1,262 @@
-from fastapi import Depends, Request, status
+from fastapi import BackgroundTasks, Depends, Query, Request, status
 from fastapi_cache import FastAPICache
 from fastapi_cache.decorator import cache
 from typing import cast
 from app.config import config
 from app.core.cache_utils import (
+    cache_task_details,
+    get_task_cache_version,
+    invalidate_task_cache,
+    task_detail_cache_key,
     task_detail_cache_key_builder,
     task_list_cache_key_builder,
 )
-from app.core.redis import SafeJsonCoder
+from app.core.cache_backend import release_recomputes
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.core.redis import OrjsonCoder
 from app.routers.base import CustomRouter
-from app.schemas import TaskCreate, Task, TaskUpdate
+from app.schemas import (
+    CurrentUser,
+    TaskBatchCreate,
+    TaskBatchDelete,
+    TaskBatchResult,
+    TaskBatchUpdate,
+    TaskCreate,
+    Task,
+    TaskListQuery,
+    TaskPage,
+    TaskStats,
+    TaskUpdate,
+    SparseTaskPage,
+)
 from app.services import TaskService
-from app.core import UnauthorizedException, get_task_service
-from app.utils.auth import JWTPayload
+from app.core import get_current_user, get_task_list_query, get_task_service, require_auth
 
 router: CustomRouter = CustomRouter(prefix="/tasks", tags=["tasks"])
 
 
-def require_auth(request: Request) -> JWTPayload:
-    if request.state.user is None:  # pyright: ignore[reportAny]
-        raise UnauthorizedException()
-    return cast(JWTPayload, request.state.user)
-
-
 @router.get(
     path="/",
     status_code=status.HTTP_200_OK,
-    response_model=list[Task],
+    # Sparse pages (`fields=`) leave fields out, which TaskPage would refill.
+    response_model=None,
+    responses={
+        status.HTTP_200_OK: {
+            "model": TaskPage,
+            "description": "A page of tasks; with `fields`, items only carry id and those fields",
+        },
+    },
     dependencies=[
         Depends(dependency=require_auth),
     ],
 )
+@release_recomputes
 @cache(
-    coder=SafeJsonCoder,
+    coder=OrjsonCoder,
     expire=cast(int, config.redis.get("cache_expire")),
     namespace="task:list",
     key_builder=task_list_cache_key_builder,  # pyright: ignore[reportArgumentType]
 )
 async def read_tasks(
     request: Request,
+    background_tasks: BackgroundTasks,
+    query: TaskListQuery = Depends(  # pyright: ignore[reportCallInDefaultInitializer]
+        dependency=get_task_list_query
+    ),
+    after: str | None = Query(  # pyright: ignore[reportCallInDefaultInitializer]
+        default=None, description="Cursor returned as `next_cursor` by the previous page"
+    ),
+    limit: int = Query(  # pyright: ignore[reportCallInDefaultInitializer]
+        default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE
+    ),
+    current_user: CurrentUser = Depends(  # pyright: ignore[reportCallInDefaultInitializer]
+        dependency=get_current_user
+    ),
     task_service: TaskService = Depends(
         dependency=get_task_service
     ),  # pyright: ignore[reportCallInDefaultInitializer]
-) -> list[Task]:
-    user: JWTPayload = cast(JWTPayload, request.state.user)
-    all_task: list[Task] = await task_service.get_all_tasks(username=user["username"])
-    return all_task
+) -> TaskPage | SparseTaskPage:
+    # Read the version before the tasks: if a write lands in between, the
+    # warmed entries are already stale under the bumped version.
+    version: int = await get_task_cache_version(username=current_user.username)
+    task_page: TaskPage | SparseTaskPage = await task_service.get_tasks_page(
+        user=current_user, after=after, limit=limit, query=query
+    )
+    if isinstance(task_page, SparseTaskPage):
+        # Partial items must not be served as task details.
+        return task_page
+    if config.redis.get("warm_in_background"):
+        background_tasks.add_task(
+            cache_task_details,
+            username=current_user.username,
+            version=version,
+            tasks=task_page.items,
+        )
+    else:
+        await cache_task_details(
+            username=current_user.username, version=version, tasks=task_page.items
+        )
+    return task_page
+
+
+@router.post(
+    path="/batch",
+    status_code=status.HTTP_201_CREATED,
+    response_model=TaskBatchResult,
+    responses={
+        status.HTTP_201_CREATED: {
+            "model": TaskBatchResult,
+            "description": "Items created successfully",
+        }
+    },
+    dependencies=[
+        Depends(dependency=require_auth),
+    ],
+)
+async def create_tasks_batch(
+    task_batch: TaskBatchCreate,
+    current_user: CurrentUser = Depends(  # pyright: ignore[reportCallInDefaultInitializer]
+        dependency=get_current_user
+    ),
+    task_service: TaskService = Depends(  # pyright: ignore[reportCallInDefaultInitializer]
+        dependency=get_task_service
+    ),
+) -> TaskBatchResult:
+    batch_result: TaskBatchResult = await task_service.create_tasks(
+        user=current_user, task_batch=task_batch
+    )
+    _ = await invalidate_task_cache(username=current_user.username)
+    return batch_result
+
+
+@router.patch(
+    path="/batch",
+    response_model=TaskBatchResult,
+    responses={
+        status.HTTP_200_OK: {
+            "model": TaskBatchResult,
+            "description": "Per-item results of the batch update",
+        },
+    },
+    dependencies=[
+        Depends(dependency=require_auth),
+    ],
+)
+async def update_tasks_batch(
+    task_batch: TaskBatchUpdate,
+    current_user: CurrentUser = Depends(  # pyright: ignore[reportCallInDefaultInitializer]
+        dependency=get_current_user
+    ),
+    task_service: TaskService = Depends(  # pyright: ignore[reportCallInDefaultInitializer]
+        dependency=get_task_service
+    ),
+) -> TaskBatchResult:
+    batch_result: TaskBatchResult = await task_service.update_tasks(
+        user=current_user, task_batch=task_batch
+    )
+    _ = await invalidate_task_cache(username=current_user.username)
+    return batch_result
+
+
+@router.delete(
+    path="/batch",
+    response_model=TaskBatchResult,
+    responses={
+        status.HTTP_200_OK: {
+            "model": TaskBatchResult,
+            "description": "Per-item results of the batch delete",
+        },
+    },
+    dependencies=[
+        Depends(dependency=require_auth),
+    ],
+)
+async def delete_tasks_batch(
+    task_batch: TaskBatchDelete,
+    current_user: CurrentUser = Depends(  # pyright: ignore[reportCallInDefaultInitializer]
+        dependency=get_current_user
+    ),
+    task_service: TaskService = Depends(  # pyright: ignore[reportCallInDefaultInitializer]
+        dependency=get_task_service
+    ),
+) -> TaskBatchResult:
+    batch_result: TaskBatchResult = await task_service.delete_tasks(
+        user=current_user, task_batch=task_batch
+    )
+    _ = await invalidate_task_cache(username=current_user.username)
+    return batch_result
+
+
+@router.get(
+    path="/search",
+    status_code=status.HTTP_200_OK,
+    response_model=TaskPage,
+    responses={
+        status.HTTP_200_OK: {
+            "model": TaskPage,
+            "description": "Tasks matching every word of `q`, best matches first",
+        },
+    },
+    dependencies=[
+        Depends(dependency=require_auth),
+    ],
+)
+@release_recomputes
+@cache(
+    coder=OrjsonCoder,
+    expire=cast(int, config.redis.get("cache_expire")),
+    namespace="task:search",
+    key_builder=task_list_cache_key_builder,  # pyright: ignore[reportArgumentType]
+)
+async def search_tasks(
+    request: Request,
+    q: str = Query(  # pyright: ignore[reportCallInDefaultInitializer]
+        min_length=1,
+        max_length=200,
+        description="Words to find in titles and descriptions; the last one may be partial",
+    ),
+    after: str | None = Query(  # pyright: ignore[reportCallInDefaultInitializer]
+        default=None, description="Cursor returned as `next_cursor` by the previous page"
+    ),
+    limit: int = Query(  # pyright: ignore[reportCallInDefaultInitializer]
+        default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE
+    ),
+    current_user: CurrentUser = Depends(  # pyright: ignore[reportCallInDefaultInitializer]
+        dependency=get_current_user
+    ),
+    task_service: TaskService = Depends(  # pyright: ignore[reportCallInDefaultInitializer]
+        dependency=get_task_service
+    ),
+) -> TaskPage:
+    return await task_service.search_tasks(
+        user=current_user, q=q, limit=limit, after=after
+    )
+
+
+@router.get(
+    path="/stats",
+    status_code=status.HTTP_200_OK,
+    response_model=TaskStats,
+    responses={
+        status.HTTP_200_OK: {
+            "model": TaskStats,
+            "description": "Number of tasks in each status",
+        },
+    },
+    dependencies=[
+        Depends(dependency=require_auth),
+    ],
+)
+async def read_task_stats(
+    current_user: CurrentUser = Depends(  # pyright: ignore[reportCallInDefaultInitializer]
+        dependency=get_current_user
+    ),
+    task_service: TaskService = Depends(  # pyright: ignore[reportCallInDefaultInitializer]
+        dependency=get_task_service
+    ),
+) -> TaskStats:
+    # A primary-key read of one counter row: no cheaper with a cache in front.
+    return await task_service.get_task_stats(user=current_user)
 
 
 @router.get(
@@ -62,8 +273,9 @@ async def read_tasks(
         Depends(dependency=require_auth),
     ],
 )
+@release_recomputes
 @cache(
-    coder=SafeJsonCoder,
+    coder=OrjsonCoder,
     expire=cast(int, config.redis.get("cache_expire")),
     namespace="task:detail",
     key_builder=task_detail_cache_key_builder,  # pyright: ignore[reportArgumentType]
@@ -71,13 +283,15 @@ async def read_tasks(
 async def read_task_by_id(
     request: Request,
     task_id: int,
+    current_user: CurrentUser = Depends(  # pyright: ignore[reportCallInDefaultInitializer]
+        dependency=get_current_user
+    ),
     task_service: TaskService = Depends(  # pyright: ignore[reportCallInDefaultInitializer]
         dependency=get_task_service
     ),
 ) -> Task:
-    user: JWTPayload = cast(JWTPayload, request.state.user)
     task: Task = await task_service.get_task_by_id(
-        username=user["username"], task_id=task_id
+        user=current_user, task_id=task_id
     )
     return task
 
@@ -97,20 +311,23 @@ async def read_task_by_id(
     ],
 )
 async def create_post(
-    request: Request,
     task_create: TaskCreate,
+    current_user: CurrentUser = Depends(  # pyright: ignore[reportCallInDefaultInitializer]
+        dependency=get_current_user
+    ),
     task_service: TaskService = Depends(  # pyright: ignore[reportCallInDefaultInitializer]
         dependency=get_task_service
     ),
 ) -> Task:
-    user: JWTPayload = cast(JWTPayload, request.state.user)
     new_task: Task = await task_service.create_task(
-        username=user["username"], task_create=task_create
+        user=current_user, task_create=task_create
     )
-    _ = await FastAPICache.clear(namespace=f"task:list:{user.get("username")}")
+    version: int = await invalidate_task_cache(username=current_user.username)
     await FastAPICache.get_backend().set(
-        key=f"{FastAPICache.get_prefix()}:task:detail:{user.get("username")}:{new_task.id}",
-        value=SafeJsonCoder.encode(new_task),
+        key=task_detail_cache_key(
+            current_user.username, version, cast(int, new_task.id)
+        ),
+        value=OrjsonCoder.encode(new_task),
         expire=FastAPICache.get_expire(),
     )
     return new_task
@@ -130,21 +347,19 @@ async def create_post(
     ],
 )
 async def update_task(
-    request: Request,
     task_id: int,
     task_update: TaskUpdate,
+    current_user: CurrentUser = Depends(  # pyright: ignore[reportCallInDefaultInitializer]
+        dependency=get_current_user
+    ),
     task_service: TaskService = Depends(  # pyright: ignore[reportCallInDefaultInitializer]
         dependency=get_task_service
     ),
 ) -> Task:
-    user: JWTPayload = cast(JWTPayload, request.state.user)
     updated_task: Task = await task_service.update_task(
-        username=user["username"], task_id=task_id, task_update=task_update
-    )
-    _ = await FastAPICache.clear(namespace=f"task:list:{user.get("username")}")
-    _ = await FastAPICache.clear(
-        namespace=f"task:detail:{user.get("username")}:{updated_task.id}"
+        user=current_user, task_id=task_id, task_update=task_update
     )
+    _ = await invalidate_task_cache(username=current_user.username)
     return updated_task
 
 
@@ -162,21 +377,19 @@ async def update_task(
     ],
 )
 async def partial_update_task(
-    request: Request,
     task_id: int,
     task_update: TaskUpdate,
+    current_user: CurrentUser = Depends(  # pyright: ignore[reportCallInDefaultInitializer]
+        dependency=get_current_user
+    ),
     task_service: TaskService = Depends(  # pyright: ignore[reportCallInDefaultInitializer]
         dependency=get_task_service
     ),
 ) -> Task:
-    user: JWTPayload = cast(JWTPayload, request.state.user)
     partial_updated_task: Task = await task_service.update_task(
-        username=user["username"], task_id=task_id, task_update=task_update
-    )
-    _ = await FastAPICache.clear(namespace=f"task:list:{user.get("username")}")
-    _ = await FastAPICache.clear(
-        namespace=f"task:detail:{user.get("username")}:{partial_updated_task.id}"
+        user=current_user, task_id=task_id, task_update=task_update
     )
+    _ = await invalidate_task_cache(username=current_user.username)
     return partial_updated_task
 
 
@@ -188,18 +401,16 @@ async def partial_update_task(
     ],
 )
 async def delete_task(
-    request: Request,
     task_id: int,
+    current_user: CurrentUser = Depends(  # pyright: ignore[reportCallInDefaultInitializer]
+        dependency=get_current_user
+    ),
     task_service: TaskService = Depends(  # pyright: ignore[reportCallInDefaultInitializer]
         dependency=get_task_service
     ),
 ) -> None:
-    user: JWTPayload = cast(JWTPayload, request.state.user)
     success: bool = await task_service.delete_task(
-        username=user["username"], task_id=task_id
+        user=current_user, task_id=task_id
     )
     if success:
-        _ = await FastAPICache.clear(namespace=f"task:list:{user.get("username")}")
-        _ = await FastAPICache.clear(
-            namespace=f"task:detail:{user.get("username")}:{task_id}"
-        )
+        _ = await invalidate_task_cache(username=current_user.username)
@@ -1,5 +1,24 @@
-from .user_schemas import UserCreate, UserUpdate, UserError, UserBase, AuthLogin
-from .task_schemas import TaskCreate, TaskUpdate, TaskError
+from .user_schemas import (
+    UserCreate,
+    UserUpdate,
+    UserError,
+    UserBase,
+    AuthLogin,
+    CurrentUser,
+)
+from .task_schemas import (
+    TaskCreate,
+    TaskUpdate,
+    TaskError,
+    TaskBatchCreate,
+    TaskBatchUpdate,
+    TaskBatchUpdateItem,
+    TaskBatchDelete,
+    TaskBatchItemStatus,
+    TaskListQuery,
+    TaskSort,
+    TaskStats,
+)
 from .token_schemas import (
     TokenModel as Token,
     TokenError,
@@ -8,13 +27,32 @@ from .token_schemas import (
     AccessToken,
     ActivateAccountToken,
 )
-from .user_task_relation_schemas import UserModel as User, TaskModel as Task
+from .user_task_relation_schemas import (
+    UserModel as User,
+    TaskModel as Task,
+    TaskPage,
+    SparseTaskPage,
+    TaskBatchItemResult,
+    TaskBatchResult,
+)
 
 __all__ = [
     "TaskCreate",
     "Task",
+    "TaskPage",
+    "SparseTaskPage",
+    "TaskListQuery",
+    "TaskSort",
+    "TaskStats",
     "TaskUpdate",
     "TaskError",
+    "TaskBatchCreate",
+    "TaskBatchUpdate",
+    "TaskBatchUpdateItem",
+    "TaskBatchDelete",
+    "TaskBatchItemStatus",
+    "TaskBatchItemResult",
+    "TaskBatchResult",
     "UserCreate",
     "User",
     "UserBase",
@@ -27,4 +65,5 @@ __all__ = [
     "AccessToken",
     "ActivateAccountToken",
     "AuthLogin",
+    "CurrentUser",
 ]
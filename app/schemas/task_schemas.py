@@ -1,7 +1,8 @@
 # app/models/task.py
 from sqlmodel import Enum, SQLModel, Field
 import enum
-from pydantic import ConfigDict
+import re
+from pydantic import ConfigDict, field_validator
 
 
 # Define the Enum for task status
@@ -10,6 +11,47 @@ class TaskStatus(str, enum.Enum):
     IN_PROGRESS = "in-progress"
     COMPLETED = "completed"
 
+    @property
+    def counter(self) -> str:
+        """Field of `TaskStatsBase` counting the tasks in this status."""
+        return self.name.lower()
+
+
+# Outcome of a single item in a batch request
+class TaskBatchItemStatus(str, enum.Enum):
+    CREATED = "created"
+    UPDATED = "updated"
+    DELETED = "deleted"
+    NOT_FOUND = "not_found"
+
+
+# Orders accepted by GET /tasks; a leading "-" sorts descending
+class TaskSort(str, enum.Enum):
+    ID = "id"
+    ID_DESC = "-id"
+    TITLE = "title"
+    TITLE_DESC = "-title"
+
+    @property
+    def field(self) -> str:
+        return self.value.lstrip("-")
+
+    @property
+    def descending(self) -> bool:
+        return self.value.startswith("-")
+
+
+MAX_BATCH_SIZE: int = 500
+# Fields a client can ask for with `fields=`; `id` is always returned
+TASK_FIELDS: tuple[str, ...] = ("id", "title", "description", "status", "user_id")
+# Words of a GET /tasks/search query that are matched; the rest are ignored
+MAX_SEARCH_TERMS: int = 8
+
+
+def search_terms(q: str) -> list[str]:
+    """Lower-cased words of a search query; operators and punctuation are dropped."""
+    return re.findall(r"\w+", q.lower())[:MAX_SEARCH_TERMS]
+
 
 # Base model for shared fields
 class TaskBase(SQLModel):
@@ -36,6 +78,72 @@ class TaskUpdate(TaskBase):
     pass
 
 
+# Filters, order and projection of GET /tasks (query parameters)
+class TaskListQuery(SQLModel):
+    status: TaskStatus | None = None
+    title_prefix: str | None = Field(default=None, min_length=1, max_length=255)
+    sort: TaskSort = TaskSort.ID
+    fields: tuple[str, ...] | None = Field(
+        default=None, description="Comma-separated subset of " + ", ".join(TASK_FIELDS)
+    )
+
+    @field_validator("fields", mode="before")
+    @classmethod
+    def normalize_fields(cls, value: object) -> tuple[str, ...] | None:
+        # Accepts `fields=a,b` and `fields=a&fields=b`; the result is in
+        # TASK_FIELDS order so equivalent requests compare (and cache) equal.
+        if value is None:
+            return None
+        parts = [value] if isinstance(value, str) else list(value)  # pyright: ignore[reportArgumentType]
+        names = {name.strip() for part in parts for name in str(part).split(",")} - {""}
+        unknown = names - set(TASK_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+        return tuple(name for name in TASK_FIELDS if name in names or name == "id")
+
+
+# Number of tasks in each status; one row per user in `task_stats`
+class TaskStatsBase(SQLModel):
+    pending: int = Field(default=0, nullable=False, sa_column_kwargs={"server_default": "0"})
+    in_progress: int = Field(default=0, nullable=False, sa_column_kwargs={"server_default": "0"})
+    completed: int = Field(default=0, nullable=False, sa_column_kwargs={"server_default": "0"})
+
+
+# Model for GET /tasks/stats responses
+class TaskStats(TaskStatsBase):
+    total: int = 0
+
+
+# Model for one item of a batch update (used in PATCH /tasks/batch)
+class TaskBatchUpdateItem(SQLModel):
+    id: int
+    title: str | None = None
+    description: str | None = None
+    status: TaskStatus | None = None
+
+    @field_validator("title", "status")
+    @classmethod
+    def reject_null(cls, value: object) -> object:
+        # None only means "leave unchanged" when the field is omitted; an
+        # explicit null would reach a NOT NULL column.
+        if value is None:
+            raise ValueError("may be omitted but not null")
+        return value
+
+
+# Request bodies for the batch endpoints
+class TaskBatchCreate(SQLModel):
+    tasks: list[TaskCreate] = Field(min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class TaskBatchUpdate(SQLModel):
+    tasks: list[TaskBatchUpdateItem] = Field(min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class TaskBatchDelete(SQLModel):
+    ids: list[int] = Field(min_length=1, max_length=MAX_BATCH_SIZE)
+
+
 # Model for error responses
 class TaskError(SQLModel):
     error: str
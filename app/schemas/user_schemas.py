@@ -1,8 +1,7 @@
-from typing import Any, cast
 from sqlmodel import SQLModel, Field
-from pydantic import ConfigDict, EmailStr, ValidationInfo, field_validator
+from pydantic import ConfigDict, EmailStr
 
-from app.utils import password_validator
+from app.utils.auth.password import PASSWORD_MAX_LENGTH
 
 
 class UserBase(SQLModel):
@@ -15,36 +14,9 @@ class UserBase(SQLModel):
 
 
 class UserCreate(UserBase):
-    password: str = Field(nullable=False, min_length=8)
-
-    @field_validator("password")
-    @classmethod
-    def validate_full_password(cls, v: str, info: ValidationInfo) -> str:
-        """Validate password strength and similarity"""
-        values: dict[str, Any] = info.data  # pyright: ignore[reportExplicitAny]
-        username: str | None = values.get("username")
-        email: EmailStr | None = values.get("email")
-
-        if not all([username, email]):
-            validation: dict[str, Any] = ( #pyright: ignore[reportExplicitAny, reportRedeclaration]
-                password_validator.validate_password(  
-                    password=v, username="", email=""
-                )
-            )
-            if not validation["is_valid"]:
-                raise ValueError(validation["errors"][0])  # pyright: ignore[reportAny]
-            return v
-
-        validation: dict[str, Any] = (  # pyright: ignore[reportExplicitAny]
-            password_validator.validate_password(
-                password=v, username=cast(str, username), email=cast(str, email)
-            )
-        )
-        if not validation["is_valid"]:
-            raise ValueError(
-                "; ".join(validation["errors"])  # pyright: ignore[reportAny]
-            )
-        return v
+    # Strength and similarity checks need a worker pool, so they run in
+    # AuthService.sign_up rather than in a validator here.
+    password: str = Field(nullable=False, min_length=8, max_length=PASSWORD_MAX_LENGTH)
 
 
 class UserUpdate(UserCreate):
@@ -55,6 +27,13 @@ class UserError(SQLModel):
     error: str
 
 
+class CurrentUser(SQLModel):
+    """Authenticated user resolved once per request from the access token."""
+
+    id: int
+    username: str
+
+
 class AuthLogin(SQLModel):
     username: str = Field(index=True, nullable=False, unique=True)
     password: str = Field(nullable=False, min_length=8)
@@ -1,7 +1,7 @@
-from typing import cast
-from sqlmodel import Field, Relationship
+from typing import Any, cast
+from sqlmodel import Field, Index, Relationship, SQLModel
 from .user_schemas import UserBase
-from .task_schemas import TaskBase
+from .task_schemas import TaskBase, TaskBatchItemStatus, TaskStatsBase
 
 
 class UserModel(UserBase, table=True):
@@ -17,8 +17,46 @@ class UserModel(UserBase, table=True):
 # Model for database and full task response (used in GET/POST responses)
 class TaskModel(TaskBase, table=True):
     __tablename__ = "tasks"  # pyright: ignore[reportUnannotatedClassAttribute, reportAssignmentType]
+    # Composite indexes matching the per-user access paths: keyset listing and
+    # lookup by id on (user_id, id), status filtering on (user_id, status, id),
+    # title sorting and prefix filtering on (user_id, title, id).
+    __table_args__ = (  # pyright: ignore[reportUnannotatedClassAttribute]
+        Index("ix_tasks_user_id_id", "user_id", "id"),
+        Index("ix_tasks_user_id_status_id", "user_id", "status", "id"),
+        Index("ix_tasks_user_id_title_id", "user_id", "title", "id"),
+    )
     id: int | None = Field(default=None, primary_key=True, index=True)
     # Foreign key referencing the User model
     user_id: int | None = Field(default=None, foreign_key="users.id")
     # Define the relationship to the User model
     user: UserModel | None = cast(UserModel, Relationship(back_populates="tasks"))
+
+
+# Per-user task counts, kept in step by every task write in the SQL
+# repository and rebuilt from `tasks` by the reconcile job.
+class TaskStatsModel(TaskStatsBase, table=True):
+    __tablename__ = "task_stats"  # pyright: ignore[reportUnannotatedClassAttribute, reportAssignmentType]
+    user_id: int = Field(primary_key=True, foreign_key="users.id")
+
+
+# Model for a keyset-paginated page of tasks (used in GET list responses)
+class TaskPage(SQLModel):
+    items: list[TaskModel]
+    next_cursor: str | None = None
+
+
+# A page of tasks reduced to the fields asked for with `fields=`
+class SparseTaskPage(SQLModel):
+    items: list[dict[str, Any]]  # pyright: ignore[reportExplicitAny]
+    next_cursor: str | None = None
+
+
+# Models for per-item batch results (used in /tasks/batch responses)
+class TaskBatchItemResult(SQLModel):
+    id: int | None = None
+    status: TaskBatchItemStatus
+    task: TaskModel | None = None
+
+
+class TaskBatchResult(SQLModel):
+    results: list[TaskBatchItemResult]
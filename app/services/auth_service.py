@@ -3,6 +3,7 @@ from jose import ExpiredSignatureError, JWTError
 from pydantic import BaseModel, EmailStr, ValidationInfo, field_validator
 from sqlmodel import Field, SQLModel
 from app.core.exceptions import AppException, UnauthorizedException
+from app.core.revocation import revocation_list
 from app.schemas import (
     AccessToken,
     ActivateAccountToken,
@@ -13,7 +14,8 @@ from app.schemas import (
     UserBase,
 )
 from app.repositories.base_repository import BaseAuthRepository
-from app.utils import jwt_auth_token, password_validator
+from app.utils import JWTPayload, jwt_auth_token, password_validator
+from app.utils.auth.password import PASSWORD_MAX_LENGTH
 
 
 class UserResponse(UserBase):
@@ -24,13 +26,17 @@ class ActivationEmail(BaseModel):
     email: EmailStr
 
 
+class LogoutRequest(BaseModel):
+    refresh_token: str | None = None
+
+
 class ActivateUserAccountResponse(UserBase):
     token: ActivateAccountToken
 
 
 class RestPassword(SQLModel):
-    password_one: str = Field(nullable=False, min_length=8)
-    password_two: str = Field(nullable=False, min_length=8)
+    password_one: str = Field(nullable=False, min_length=8, max_length=PASSWORD_MAX_LENGTH)
+    password_two: str = Field(nullable=False, min_length=8, max_length=PASSWORD_MAX_LENGTH)
 
     @field_validator("password_two")
     @classmethod
@@ -45,10 +51,22 @@ class RestPassword(SQLModel):
 
 
 class AuthService:
+    __slots__ = ("repository",)
+
     def __init__(self, repository: BaseAuthRepository) -> None:
         self.repository: BaseAuthRepository = repository
 
     async def sign_up(self, user_create: UserCreate) -> ActivateUserAccountResponse:
+        validation = await password_validator.validate_password(
+            password=user_create.password,
+            username=user_create.username,
+            email=user_create.email,
+        )
+        if not validation["is_valid"]:
+            raise AppException(
+                message="; ".join(cast(list[str], validation["errors"])),
+                status_code=422,
+            )
         user: User = await self.repository.create_user(user_create)
         return self.__prepare_activate_token_data(user)
 
@@ -87,10 +105,10 @@ class AuthService:
 
     def __prepare_token_data(self, user: User) -> UserResponse:
         access_token, access_timestamp = jwt_auth_token.access_token(
-            data={"username": user.username, "email": user.email},
+            data={"username": user.username, "email": user.email, "uid": cast(int, user.id)},
         )
         refresh_token, refresh_timestamp = jwt_auth_token.refresh_token(
-            data={"username": user.username, "email": user.email},
+            data={"username": user.username, "email": user.email, "uid": cast(int, user.id)},
         )
         return UserResponse(
             username=user.username,
@@ -114,13 +132,16 @@ class AuthService:
     async def get_access_token(self, token_string: str) -> AccessToken | None:
         try:
             payload: dict[str, str] = jwt_auth_token.decode_token(token=token_string)
+            if await revocation_list.is_revoked(payload.get("jti")):
+                raise UnauthorizedException(message="Token has been revoked")
             if payload:
-                access_token, access_timestamp = jwt_auth_token.access_token(
-                    data={
-                        "username": payload.get("username", ""),
-                        "email": payload.get("email", ""),
-                    },
-                )
+                data: JWTPayload = {
+                    "username": payload.get("username", ""),
+                    "email": payload.get("email", ""),
+                }
+                if "uid" in payload:
+                    data["uid"] = cast(int, payload["uid"])
+                access_token, access_timestamp = jwt_auth_token.access_token(data=data)
                 return AccessToken.model_validate(
                     {"token": access_token, "duration": access_timestamp}
                 )
@@ -131,10 +152,34 @@ class AuthService:
         except JWTError:
             raise UnauthorizedException(message="Invalid token")
 
+    async def log_out(
+        self, access_payload: JWTPayload, refresh_token: str | None = None
+    ) -> None:
+        """Revokes the presented access token and, if given, the user's refresh token."""
+        claims = cast(dict[str, str | int], access_payload)
+        if "jti" in claims:
+            await revocation_list.revoke(jti=str(claims["jti"]), exp=float(claims["exp"]))
+        if refresh_token is None:
+            return
+        try:
+            refresh_claims = cast(
+                dict[str, str | int], jwt_auth_token.decode_token(token=refresh_token)
+            )
+        except ExpiredSignatureError:
+            return  # Already unusable
+        except JWTError:
+            raise UnauthorizedException(message="Invalid token")
+        if refresh_claims.get("username") != access_payload["username"]:
+            raise UnauthorizedException(message="Invalid token")
+        if "jti" in refresh_claims:
+            await revocation_list.revoke(
+                jti=str(refresh_claims["jti"]), exp=float(refresh_claims["exp"])
+            )
+
     async def password_reset(self, token: str, rest_password: RestPassword):
         try:
             payload: dict[str, str] = jwt_auth_token.decode_token(token=token)
-            validation = password_validator.validate_password(
+            validation = await password_validator.validate_password(
                 password=rest_password.password_one,
                 username=payload.get("username", ""),
                 email=payload.get("email", ""),
@@ -1,67 +1,214 @@
 from typing import cast
-from app.schemas import TaskCreate, Task, TaskUpdate, User
-from app.repositories.base_repository import BaseTaskRepository, BaseAuthRepository
+from app.core.exceptions import AppException
+from app.core.pagination import CursorPosition, decode_cursor_position, encode_cursor
+from app.schemas import (
+    CurrentUser,
+    TaskBatchCreate,
+    TaskBatchDelete,
+    TaskBatchItemResult,
+    TaskBatchItemStatus,
+    TaskBatchResult,
+    TaskBatchUpdate,
+    TaskCreate,
+    Task,
+    TaskListQuery,
+    TaskPage,
+    TaskSort,
+    TaskStats,
+    TaskUpdate,
+    SparseTaskPage,
+)
+from app.schemas.task_schemas import search_terms
+from app.repositories.base_repository import BaseTaskRepository
 
 
 class TaskService:
-    def __init__(
-        self, task_repository: BaseTaskRepository, auth_repository: BaseAuthRepository
-    ) -> None:
+    __slots__ = ("task_repository",)
+
+    def __init__(self, task_repository: BaseTaskRepository) -> None:
         self.task_repository: BaseTaskRepository = task_repository
-        self.auth_repository: BaseAuthRepository = auth_repository
 
-    async def get_all_tasks(self, username: str) -> list[Task]:
+    async def get_tasks_page(
+        self,
+        user: CurrentUser,
+        limit: int,
+        after: str | None = None,
+        query: TaskListQuery | None = None,
+    ) -> TaskPage | SparseTaskPage:
+        try:
+            query = query or TaskListQuery()
+            # Cursors of id-ordered pages carry no sort; others must match it.
+            sort: str | None = None if query.sort == TaskSort.ID else query.sort.value
+            position: CursorPosition | None = decode_cursor_position(after) if after else None
+            if position is not None and position.sort != sort:
+                raise AppException(message="Pagination cursor belongs to another sort order")
+            # Fetch one extra row to learn whether another page exists.
+            task_list: list[Task] = await self.task_repository.get_all_tasks(
+                user_id=user.id,
+                after=position.id if position else None,
+                limit=limit + 1,
+                query=query,
+                after_value=position.value if position else None,
+            )
+            next_cursor: str | None = None
+            if len(task_list) > limit:
+                task_list = task_list[:limit]
+                last: Task = task_list[-1]
+                next_cursor = encode_cursor(
+                    cast(int, last.id),
+                    sort=sort,
+                    value=None if query.sort.field == "id" else last.title,
+                )
+            if query.fields is None:
+                return TaskPage(items=task_list, next_cursor=next_cursor)
+            fields: set[str] = set(query.fields)
+            return SparseTaskPage(
+                items=[task.model_dump(include=fields) for task in task_list],
+                next_cursor=next_cursor,
+            )
+        except Exception as e:
+            raise e
+
+    async def search_tasks(
+        self, user: CurrentUser, q: str, limit: int, after: str | None = None
+    ) -> TaskPage:
         try:
-            user: User = await self.auth_repository.get_user_by_username(username=username)
-            return await self.task_repository.get_all_tasks(user_id=cast(int, user.id))
+            terms: list[str] = search_terms(q)
+            if not terms:
+                return TaskPage(items=[], next_cursor=None)
+            position: CursorPosition | None = decode_cursor_position(after) if after else None
+            seek: tuple[float, int] | None = None
+            if position is not None:
+                if position.sort != "rank" or position.value is None:
+                    raise AppException(message="Pagination cursor belongs to another sort order")
+                try:
+                    seek = (float(position.value), position.id)
+                except ValueError as e:
+                    raise AppException(message="Invalid pagination cursor") from e
+            hits: list[tuple[Task, float]] = await self.task_repository.search_tasks(
+                user_id=user.id, terms=terms, limit=limit + 1, after=seek
+            )
+            next_cursor: str | None = None
+            if len(hits) > limit:
+                hits = hits[:limit]
+                last, score = hits[-1]
+                # repr() round-trips the float, so the seek resumes exactly.
+                next_cursor = encode_cursor(cast(int, last.id), sort="rank", value=repr(score))
+            return TaskPage(items=[task for task, _ in hits], next_cursor=next_cursor)
         except Exception as e:
             raise e
 
-    async def get_task_by_id(self, username: str, task_id: int) -> Task:
+    async def get_task_stats(self, user: CurrentUser) -> TaskStats:
+        try:
+            return await self.task_repository.get_task_stats(user_id=user.id)
+        except Exception as e:
+            raise e
+
+    async def get_task_by_id(self, user: CurrentUser, task_id: int) -> Task:
         try:
-            user: User = await self.auth_repository.get_user_by_username(username=username)
             return await self.task_repository.get_task_by_id(
-                user_id=cast(int, user.id), task_id=task_id
+                user_id=user.id, task_id=task_id
             )
         except Exception as e:
             raise e
 
-    async def create_task(self, username: str, task_create: TaskCreate) -> Task:
+    async def create_task(self, user: CurrentUser, task_create: TaskCreate) -> Task:
         try:
-            user: User = await self.auth_repository.get_user_by_username(username=username)
             return await self.task_repository.create_task(
-                user_id=cast(int, user.id), task_create=task_create
+                user_id=user.id, task_create=task_create
             )
         except Exception as e:
             raise e
 
     async def update_task(
-        self, username: str, task_id: int, task_update: TaskUpdate
+        self, user: CurrentUser, task_id: int, task_update: TaskUpdate
     ) -> Task:
         try:
-            user: User = await self.auth_repository.get_user_by_username(username=username)
             return await self.task_repository.update_task(
-                user_id=cast(int, user.id), task_id=task_id, task_update=task_update
+                user_id=user.id, task_id=task_id, task_update=task_update
             )
         except Exception as e:
             raise e
 
     async def partial_update_task(
-        self, username: str, task_id: int, task_update: TaskUpdate
+        self, user: CurrentUser, task_id: int, task_update: TaskUpdate
     ) -> Task:
         try:
-            user: User = await self.auth_repository.get_user_by_username(username=username)
             return await self.task_repository.partial_update_task(
-                user_id=cast(int, user.id), task_id=task_id, task_update=task_update
+                user_id=user.id, task_id=task_id, task_update=task_update
             )
         except Exception as e:
             raise e
 
-    async def delete_task(self, username: str, task_id: int) -> bool:
+    async def delete_task(self, user: CurrentUser, task_id: int) -> bool:
         try:
-            user: User = await self.auth_repository.get_user_by_username(username=username)
             return await self.task_repository.delete_task(
-                user_id=cast(int, user.id), task_id=task_id
+                user_id=user.id, task_id=task_id
+            )
+        except Exception as e:
+            raise e
+
+    async def create_tasks(
+        self, user: CurrentUser, task_batch: TaskBatchCreate
+    ) -> TaskBatchResult:
+        try:
+            new_tasks: list[Task] = await self.task_repository.create_tasks(
+                user_id=user.id, task_creates=task_batch.tasks
+            )
+            return TaskBatchResult(
+                results=[
+                    TaskBatchItemResult(
+                        id=task.id, status=TaskBatchItemStatus.CREATED, task=task
+                    )
+                    for task in new_tasks
+                ]
+            )
+        except Exception as e:
+            raise e
+
+    async def update_tasks(
+        self, user: CurrentUser, task_batch: TaskBatchUpdate
+    ) -> TaskBatchResult:
+        try:
+            updated_tasks: list[Task | None] = await self.task_repository.update_tasks(
+                user_id=user.id, task_updates=task_batch.tasks
+            )
+            return TaskBatchResult(
+                results=[
+                    TaskBatchItemResult(
+                        id=task_update.id,
+                        status=(
+                            TaskBatchItemStatus.UPDATED
+                            if task
+                            else TaskBatchItemStatus.NOT_FOUND
+                        ),
+                        task=task,
+                    )
+                    for task_update, task in zip(task_batch.tasks, updated_tasks)
+                ]
+            )
+        except Exception as e:
+            raise e
+
+    async def delete_tasks(
+        self, user: CurrentUser, task_batch: TaskBatchDelete
+    ) -> TaskBatchResult:
+        try:
+            deleted_ids: set[int] = await self.task_repository.delete_tasks(
+                user_id=user.id, task_ids=task_batch.ids
+            )
+            return TaskBatchResult(
+                results=[
+                    TaskBatchItemResult(
+                        id=task_id,
+                        status=(
+                            TaskBatchItemStatus.DELETED
+                            if task_id in deleted_ids
+                            else TaskBatchItemStatus.NOT_FOUND
+                        ),
+                    )
+                    for task_id in task_batch.ids
+                ]
             )
         except Exception as e:
             raise e
@@ -26,6 +26,16 @@ target_metadata = SQLModel.metadata
 # my_important_option = config.get_main_option("my_important_option")
 # ... etc.
 SYNC_DB_URL = cast(str, app_config.database.get("url"))
+# Full-text search objects live outside the models (see the
+# add_task_full_text_search revision); keep autogenerate from dropping them.
+SEARCH_OBJECTS = {"search_vector", "ix_tasks_search_vector"}
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    if type_ == "table" and name is not None and name.startswith("tasks_fts"):
+        return False
+    return name not in SEARCH_OBJECTS
+
 
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
@@ -43,6 +53,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -65,7 +76,11 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
+        )
 
         with context.begin_transaction():
             context.run_migrations()
@@ -0,0 +1,95 @@
+"""add task full text search
+
+Revision ID: f2a9c7d4e1b8
+Revises: e8b3f5a1c6d2
+Create Date: 2025-11-17 10:42:08.913377
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2a9c7d4e1b8'
+down_revision: Union[str, Sequence[str], None] = 'e8b3f5a1c6d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Written by hand: neither object is part of the SQLModel metadata.
+    if op.get_bind().dialect.name == 'postgresql':
+        # Generated column: PostgreSQL keeps it in sync on every write.
+        op.execute(
+            """
+            ALTER TABLE tasks ADD COLUMN search_vector tsvector
+            GENERATED ALWAYS AS (
+                setweight(to_tsvector('english', coalesce(title, '')), 'A')
+                || setweight(to_tsvector('english', coalesce(description, '')), 'B')
+            ) STORED
+            """
+        )
+        op.create_index(
+            'ix_tasks_search_vector', 'tasks', ['search_vector'], unique=False, postgresql_using='gin'
+        )
+        return
+    # SQLite: an external-content FTS5 table kept in sync by triggers. The
+    # "u<user_id>" owner token lets FTS5 match one user's tasks directly.
+    op.execute(
+        """
+        CREATE VIEW tasks_fts_source AS
+        SELECT id, title, description, 'u' || user_id AS owner FROM tasks
+        """
+    )
+    op.execute(
+        """
+        CREATE VIRTUAL TABLE tasks_fts USING fts5(
+            title, description, owner, content='tasks_fts_source', content_rowid='id',
+            tokenize='porter unicode61 remove_diacritics 2', prefix='2 3'
+        )
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER tasks_fts_insert AFTER INSERT ON tasks BEGIN
+            INSERT INTO tasks_fts(rowid, title, description, owner)
+            VALUES (new.id, new.title, new.description, 'u' || new.user_id);
+        END
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER tasks_fts_delete AFTER DELETE ON tasks BEGIN
+            INSERT INTO tasks_fts(tasks_fts, rowid, title, description, owner)
+            VALUES ('delete', old.id, old.title, old.description, 'u' || old.user_id);
+        END
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER tasks_fts_update AFTER UPDATE OF title, description ON tasks BEGIN
+            INSERT INTO tasks_fts(tasks_fts, rowid, title, description, owner)
+            VALUES ('delete', old.id, old.title, old.description, 'u' || old.user_id);
+            INSERT INTO tasks_fts(rowid, title, description, owner)
+            VALUES (new.id, new.title, new.description, 'u' || new.user_id);
+        END
+        """
+    )
+    # Index the tasks that already exist.
+    op.execute("INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        op.drop_index('ix_tasks_search_vector', table_name='tasks', postgresql_using='gin')
+        op.drop_column('tasks', 'search_vector')
+        return
+    for trigger in ('tasks_fts_update', 'tasks_fts_delete', 'tasks_fts_insert'):
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    op.execute("DROP TABLE IF EXISTS tasks_fts")
+    op.execute("DROP VIEW IF EXISTS tasks_fts_source")
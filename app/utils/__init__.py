@@ -5,7 +5,7 @@ from .auth import (
 )
 from .alembic_utils import upgrade_database, downgrade_database
 from .email import email_service, EmailService
-from .logging import main_logger, filter_sensitive
+from .logging import json_sink, main_logger, filter_sensitive, redact_text
 from urllib.parse import urlparse
 
 def is_valid_url(url: str) -> bool:
@@ -25,7 +25,9 @@ __all__ = [
     "email_service",
     "EmailService",
     "main_logger",
+    "json_sink",
     "filter_sensitive",
+    "redact_text",
     "JWTPayload",
     "upgrade_database",
     "downgrade_database",
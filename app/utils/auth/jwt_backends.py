@@ -0,0 +1,156 @@
+import os
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, override
+import jwt as pyjwt
+from jose import jwt as jose_jwt
+from jose.exceptions import ExpiredSignatureError, JWTClaimsError, JWTError
+
+# python-jose's exceptions are the error vocabulary of the app: middleware and
+# services catch ExpiredSignatureError / JWTError, whichever backend runs.
+
+SYMMETRIC_ALGORITHMS: frozenset[str] = frozenset({"HS256", "HS384", "HS512"})
+
+
+class JWTBackend(ABC):
+    """Signs and verifies compact JWS tokens with a given key."""
+
+    name: str
+
+    @abstractmethod
+    def encode(
+        self, claims: dict[str, Any], key: str, algorithm: str, kid: str | None  # pyright: ignore[reportExplicitAny]
+    ) -> str:
+        pass
+
+    @abstractmethod
+    def decode(self, token: str, key: str, algorithm: str) -> dict[str, Any]:  # pyright: ignore[reportExplicitAny]
+        """Verifies signature and `exp`; raises ExpiredSignatureError/JWTError."""
+        pass
+
+    @abstractmethod
+    def unverified_kid(self, token: str) -> str | None:
+        """Reads `kid` from the header without verifying anything."""
+        pass
+
+
+class JoseBackend(JWTBackend):
+    """python-jose; supports HMAC, RSA and ECDSA keys but not EdDSA."""
+
+    name: str = "jose"
+
+    @override
+    def encode(
+        self, claims: dict[str, Any], key: str, algorithm: str, kid: str | None  # pyright: ignore[reportExplicitAny]
+    ) -> str:
+        return jose_jwt.encode(
+            claims=claims,
+            key=key,
+            algorithm=algorithm,
+            headers={"kid": kid} if kid else None,
+        )
+
+    @override
+    def decode(self, token: str, key: str, algorithm: str) -> dict[str, Any]:  # pyright: ignore[reportExplicitAny]
+        return jose_jwt.decode(token, key, algorithms=[algorithm])
+
+    @override
+    def unverified_kid(self, token: str) -> str | None:
+        return jose_jwt.get_unverified_header(token).get("kid")
+
+
+class PyJWTBackend(JWTBackend):
+    """PyJWT; faster, and supports EdDSA."""
+
+    name: str = "pyjwt"
+
+    @override
+    def encode(
+        self, claims: dict[str, Any], key: str, algorithm: str, kid: str | None  # pyright: ignore[reportExplicitAny]
+    ) -> str:
+        return pyjwt.encode(
+            claims, key, algorithm=algorithm, headers={"kid": kid} if kid else None
+        )
+
+    @override
+    def decode(self, token: str, key: str, algorithm: str) -> dict[str, Any]:  # pyright: ignore[reportExplicitAny]
+        try:
+            return pyjwt.decode(token, key, algorithms=[algorithm])
+        except pyjwt.ExpiredSignatureError as e:
+            raise ExpiredSignatureError(str(e)) from e
+        except (pyjwt.ImmatureSignatureError, pyjwt.MissingRequiredClaimError) as e:
+            raise JWTClaimsError(str(e)) from e
+        except pyjwt.PyJWTError as e:
+            raise JWTError(str(e)) from e
+
+    @override
+    def unverified_kid(self, token: str) -> str | None:
+        try:
+            return pyjwt.get_unverified_header(token).get("kid")
+        except pyjwt.PyJWTError as e:
+            raise JWTError(str(e)) from e
+
+
+def get_jwt_backend(name: str) -> JWTBackend:
+    backends: dict[str, type[JWTBackend]] = {
+        JoseBackend.name: JoseBackend,
+        PyJWTBackend.name: PyJWTBackend,
+    }
+    if name not in backends:
+        raise ValueError(f"Unknown JWT backend '{name}', expected one of {sorted(backends)}")
+    return backends[name]()
+
+
+class KeySet:
+    """
+    Signing key plus the verification keys accepted, selected by `kid`.
+
+    With an HMAC algorithm this is the single shared secret and tokens carry
+    no `kid`. With ES256/EdDSA the private key only lives where tokens are
+    issued; verifiers need just the public keys. Keeping the previous public
+    keys in the set lets old tokens verify while a new key is rolled out.
+    """
+
+    def __init__(
+        self,
+        algorithm: str,
+        signing_key: str | None,
+        signing_kid: str | None = None,
+        verification_keys: dict[str | None, str] | None = None,
+    ) -> None:
+        self.algorithm: str = algorithm
+        self.signing_key: str | None = signing_key
+        self.signing_kid: str | None = signing_kid
+        self.verification_keys: dict[str | None, str] = verification_keys or {}
+
+    @classmethod
+    def symmetric(cls, secret: str, algorithm: str = "HS256") -> "KeySet":
+        return cls(algorithm, signing_key=secret, verification_keys={None: secret})
+
+    @classmethod
+    def from_files(
+        cls,
+        algorithm: str,
+        private_key_file: str | None,
+        signing_kid: str | None,
+        public_keys_dir: str,
+    ) -> "KeySet":
+        """Loads `<kid>.pem` public keys from a directory and an optional private key."""
+        verification_keys: dict[str | None, str] = {
+            path.stem: path.read_text()
+            for path in sorted(Path(public_keys_dir).glob("*.pem"))
+        }
+        signing_key: str | None = (
+            Path(private_key_file).read_text() if private_key_file else None
+        )
+        if signing_key is not None and signing_kid not in verification_keys:
+            raise ValueError(
+                f"No public key '{signing_kid}.pem' in {os.path.abspath(public_keys_dir)} for the signing key"
+            )
+        return cls(algorithm, signing_key, signing_kid, verification_keys)
+
+    def verification_key(self, kid: str | None) -> str:
+        key = self.verification_keys.get(kid)
+        if key is None:
+            raise JWTError(f"Unknown key id: {kid}")
+        return key
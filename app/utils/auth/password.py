@@ -1,14 +1,100 @@
-from typing import Any
+import asyncio
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, cast
 from pwdlib import PasswordHash
+from pwdlib.hashers.argon2 import Argon2Hasher
 from zxcvbn import  zxcvbn
 import re
+from app.config import config
+
+
+PASSWORD_MAX_LENGTH: int = 128
+
+
+class WorkerPool:
+    """
+    Bounded thread pool for password work, with queue-depth counters.
+
+    argon2-cffi releases the GIL while it hashes, so Argon2 workers run in
+    parallel with each other and with the event loop. zxcvbn is pure Python
+    and holds the GIL, but on a worker thread the event loop still gets the
+    interpreter back every switch interval instead of waiting for the whole
+    check. `max_workers` caps how many calls are in flight at once; anything
+    beyond that waits in the pool's queue.
+    """
+
+    def __init__(self, max_workers: int, thread_name_prefix: str) -> None:
+        self.max_workers: int = max_workers
+        self.submitted: int = 0
+        self.completed: int = 0
+        self.running: int = 0
+        self.max_queued: int = 0
+        self._lock: threading.Lock = threading.Lock()
+        self._executor: ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=thread_name_prefix
+        )
+
+    @property
+    def queued(self) -> int:
+        with self._lock:
+            return self.submitted - self.completed - self.running
+
+    async def run[T](self, fn: Callable[..., T], *args: object) -> T:
+        with self._lock:
+            self.submitted += 1
+            self.max_queued = max(
+                self.max_queued, self.submitted - self.completed - self.running
+            )
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, self._call, fn, *args
+        )
+
+    def snapshot(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "running": self.running,
+                "queued": self.submitted - self.completed - self.running,
+                "max_queued": self.max_queued,
+                "completed": self.completed,
+            }
+
+    def _call[T](self, fn: Callable[..., T], *args: object) -> T:
+        with self._lock:
+            self.running += 1
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self.running -= 1
+                self.completed += 1
 
 
 class PasswordValidator:
     def __init__(self):
-        self.pwd_context: PasswordHash = PasswordHash.recommended()
+        self.pwd_context: PasswordHash = PasswordHash(
+            (
+                Argon2Hasher(
+                    time_cost=cast(int, config.auth.get("argon2_time_cost")),
+                    memory_cost=cast(int, config.auth.get("argon2_memory_cost")),
+                    parallelism=cast(int, config.auth.get("argon2_parallelism")),
+                ),
+            )
+        )
+        self.hashing_pool: WorkerPool = WorkerPool(
+            max_workers=cast(int, config.auth.get("hash_workers")),
+            thread_name_prefix="argon2",
+        )
+        self.strength_pool: WorkerPool = WorkerPool(
+            max_workers=cast(int, config.auth.get("strength_workers")),
+            thread_name_prefix="zxcvbn",
+        )
         self.min_score: int = 2  # zxcvbn score (0-4, 2 = good)
         self.max_similarity: float = 0.8  # 80% similarity threshold
+        self.max_length: int = PASSWORD_MAX_LENGTH
+        self.max_strength_length: int = 32  # zxcvbn input cap; ~3 ms at 32 chars
         self.common_passwords: set[str] = {
             "password",
             "123456",
@@ -44,29 +130,74 @@ class PasswordValidator:
         self, password: str, username: str, email: str
     ) -> tuple[bool, str]:
         """Check if password is too similar to username or email"""
-        similarity_username: float = self.calculate_similarity(password, other_field=username)
-        similarity_email: float = self.calculate_similarity(password, other_field=email.split(sep="@")[0])
+        message: str | None = self._similarity_error(
+            similarity_username=self.calculate_similarity(password, other_field=username),
+            similarity_email=self.calculate_similarity(password, other_field=email.split(sep="@")[0]),
+        )
+        return message is not None, message or ""
 
+    def _similarity_error(
+        self, similarity_username: float, similarity_email: float
+    ) -> str | None:
         if similarity_username > self.max_similarity:
-            return (
-                True,
-                f"Password is too similar to username (similarity: {similarity_username:.1%})",
-            )
+            return f"Password is too similar to username (similarity: {similarity_username:.1%})"
         if similarity_email > self.max_similarity:
-            return (
-                True,
-                f"Password is too similar to email (similarity: {similarity_email:.1%})",
-            )
-        return False, ""
+            return f"Password is too similar to email (similarity: {similarity_email:.1%})"
+        return None
 
-    def validate_password(
+    async def validate_password(
         self, password: str, username: str, email: str
     ) -> dict[str,Any]:  # pyright: ignore[reportExplicitAny]
-        """Complete Django-like password validation"""
+        """
+        Complete Django-like password validation
+
+        The cheap checks run first, on the event loop, and a password that
+        fails one of them never reaches zxcvbn. zxcvbn only sees the first
+        `max_strength_length` characters and runs on the strength pool, since
+        its cost grows quickly with length.
+        """
         errors: list[str] = []
 
-        # 1. Strength validation (zxcvbn)
-        strength_result = zxcvbn(password)
+        # 1. Length
+        if len(password) > self.max_length:
+            return {
+                "is_valid": False,
+                "errors": [f"Password must be at most {self.max_length} characters"],
+                "score": None,
+                "feedback": None,
+                "similarity_username": 0.0,
+                "similarity_email": 0.0,
+            }
+
+        # 2. Similarity validation
+        similarity_username: float = self.calculate_similarity(password, other_field=username)
+        similarity_email: float = self.calculate_similarity(
+            password, other_field=email.split(sep="@")[0]
+        )
+        similarity_msg: str | None = self._similarity_error(
+            similarity_username, similarity_email
+        )
+        if similarity_msg:
+            errors.append(similarity_msg)
+
+        # 3. Common passwords
+        if password.lower() in self.common_passwords:
+            errors.append("Password is too common")
+
+        if errors:
+            return {
+                "is_valid": False,
+                "errors": errors,
+                "score": None,
+                "feedback": None,
+                "similarity_username": similarity_username,
+                "similarity_email": similarity_email,
+            }
+
+        # 4. Strength validation (zxcvbn)
+        strength_result: dict[str, Any] = await self.strength_pool.run(  # pyright: ignore[reportExplicitAny]
+            zxcvbn, password[: self.max_strength_length]
+        )
         if strength_result["score"] < self.min_score:
             score_map: dict[int, str] = {
                 0: "very weak",
@@ -75,42 +206,33 @@ class PasswordValidator:
                 3: "strong",
                 4: "very strong",
             }
-            feedback = strength_result["feedback"]
+            feedback = strength_result["feedback"]  # pyright: ignore[reportAny]
             error_msg: str = (
                 f"Password is too weak (score: {score_map[strength_result['score']]}). "
                 f"Suggestions: {feedback['suggestions'][0] if feedback['suggestions'] else 'Use a stronger password'}"
             )
             errors.append(error_msg)
 
-        # 2. Similarity validation
-        is_similar, similarity_msg = self.is_too_similar(password, username, email)
-        if is_similar:
-            errors.append(similarity_msg)
-
-        # 3. Common passwords
-        if password.lower() in self.common_passwords:
-            errors.append("Password is too common")
-
         return {
             "is_valid": len(errors) == 0,
             "errors": errors,
             "score": strength_result["score"],
             "feedback": strength_result["feedback"],
-            "similarity_username": self.calculate_similarity(
-                password, other_field=username
-            ),
-            "similarity_email": self.calculate_similarity(
-                password, other_field=email.split("@")[0]
-            ),
+            "similarity_username": similarity_username,
+            "similarity_email": similarity_email,
         }
 
-    def verify_password(
+    async def verify_password(
         self, plain_password: str | bytes, hashed_password: str | bytes
     ) -> bool:
-        return self.pwd_context.verify(password=plain_password, hash=hashed_password)
+        """Argon2 verification runs on the hashing pool, off the event loop."""
+        return await self.hashing_pool.run(
+            self.pwd_context.verify, plain_password, hashed_password
+        )
 
-    def get_password_hash(self, password: str | bytes) -> str:
-        return self.pwd_context.hash(password)
+    async def get_password_hash(self, password: str | bytes) -> str:
+        """Argon2 hashing runs on the hashing pool, off the event loop."""
+        return await self.hashing_pool.run(self.pwd_context.hash, password)
 
 
 # Global instance
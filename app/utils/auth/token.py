@@ -1,7 +1,11 @@
+import hashlib
+import secrets
+import time
+from collections import OrderedDict
 from datetime import timedelta, datetime, timezone
-from jose import jwt
 from app.config import config
-from typing import Any, TypedDict, cast
+from typing import Any, NotRequired, TypedDict, cast
+from .jwt_backends import SYMMETRIC_ALGORITHMS, JWTBackend, KeySet, get_jwt_backend
 
 SECRET_KEY: str | int | bool | None = config.env.get("SECRET_KEY")
 ALGORITHM: str | int | bool | None = config.env.get("ALGORITHM")
@@ -14,18 +18,97 @@ REFRESH_TOKEN_EXPIRE_WEEKS: str | int | bool | None = config.env.get(
 )
 
 
+def load_key_set() -> KeySet:
+    """HMAC with SECRET_KEY unless an asymmetric ALGORITHM and key files are set."""
+    public_keys_dir = cast(str | None, config.env.get("JWT_PUBLIC_KEYS_DIR"))
+    if public_keys_dir is None:
+        if ALGORITHM not in SYMMETRIC_ALGORITHMS:
+            raise ValueError(f"ALGORITHM={ALGORITHM} needs JWT_PUBLIC_KEYS_DIR")
+        return KeySet.symmetric(cast(str, SECRET_KEY), algorithm=cast(str, ALGORITHM))
+    return KeySet.from_files(
+        algorithm=cast(str, ALGORITHM),
+        private_key_file=cast(str | None, config.env.get("JWT_PRIVATE_KEY_FILE")),
+        signing_kid=cast(str | None, config.env.get("JWT_KEY_ID")),
+        public_keys_dir=public_keys_dir,
+    )
+
+
 class JWTPayload(TypedDict):
     username: str
     email: str
+    uid: NotRequired[int]
 
 
 class JWTPayloadWithExp(JWTPayload):
     exp: datetime
+    jti: str
+
+
+class VerifiedTokenCache:
+    """
+    Bounded LRU of verified token payloads, keyed by the SHA-256 of the token.
+
+    An entry lives until the token's own `exp`, so a hit is exactly as valid
+    as a fresh `jwt.decode`. Only verified payloads are stored; tokens that
+    fail verification are decoded (and rejected) again every time.
+    """
+
+    def __init__(self, max_entries: int = 10_000) -> None:
+        self.max_entries: int = max_entries
+        self.hits: int = 0
+        self.misses: int = 0
+        self._entries: OrderedDict[bytes, tuple[dict[str, Any], float]] = OrderedDict()  # pyright: ignore[reportExplicitAny]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> dict[str, Any] | None:  # pyright: ignore[reportExplicitAny]
+        key = self.key(token)
+        entry = self._entries.get(key)
+        if entry is None or entry[1] <= time.time():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return dict(entry[0])
+
+    def set(self, token: str, payload: dict[str, Any]) -> None:  # pyright: ignore[reportExplicitAny]
+        exp = payload.get("exp")
+        if not isinstance(exp, (int, float)) or self.max_entries <= 0:
+            return
+        key = self.key(token)
+        self._entries[key] = (dict(payload), float(exp))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            _ = self._entries.popitem(last=False)
+
+    def discard(self, token: str) -> None:
+        _ = self._entries.pop(self.key(token), None)
+
+    def snapshot(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
 
 
 class JWTAuthToken:
     """Creates refresh and access tokens"""
 
+    def __init__(
+        self, backend: JWTBackend | None = None, keys: KeySet | None = None
+    ) -> None:
+        self.backend: JWTBackend = backend or get_jwt_backend(
+            cast(str, config.env.get("JWT_BACKEND", "jose"))
+        )
+        self.keys: KeySet = keys or load_key_set()
+        self.verified_cache: VerifiedTokenCache = VerifiedTokenCache(
+            max_entries=cast(int, config.auth.get("token_cache_max_entries"))
+        )
+
     def __create_token(
         self, data: JWTPayload, expires_delta: timedelta | None = None
     ) -> tuple[str, datetime]:
@@ -46,11 +129,14 @@ class JWTAuthToken:
         else:
             expire: datetime = datetime.now(timezone.utc) + timedelta(minutes=15)
         claims: JWTPayloadWithExp = cast(JWTPayloadWithExp, to_encode)
-        claims.update({"exp": expire})
-        encoded_jwt = jwt.encode(
+        claims.update({"exp": expire, "jti": secrets.token_urlsafe(16)})
+        if self.keys.signing_key is None:
+            raise RuntimeError("No JWT signing key configured; this instance can only verify")
+        encoded_jwt = self.backend.encode(
             claims=dict(claims),
-            key=cast(str, SECRET_KEY),
-            algorithm=cast(str, ALGORITHM),
+            key=self.keys.signing_key,
+            algorithm=self.keys.algorithm,
+            kid=self.keys.signing_kid,
         )
 
         return encoded_jwt, expire
@@ -111,12 +197,31 @@ class JWTAuthToken:
             dict[str, str]: Payload
         """
         try:
-            payload: dict[str, Any] = jwt.decode(  # pyright: ignore[reportExplicitAny]
-                token, cast(str, SECRET_KEY), algorithms=[cast(str, ALGORITHM)]
+            key: str = self.keys.verification_key(self.backend.unverified_kid(token))
+            payload: dict[str, Any] = self.backend.decode(  # pyright: ignore[reportExplicitAny]
+                token, key, algorithm=self.keys.algorithm
             )
             return payload
         except Exception as e:
             raise e
 
+    def decode_token_cached(self, token: str) -> dict[str, str]:
+        """Decodes a token, reusing the payload of an earlier verification
+
+        Revocation is not the cache's concern: callers must check it against
+        the returned payload on every request, hit or miss.
+
+        Args:
+            token (str): Accepts access or refresh token
+
+        Returns:
+            dict[str, str]: Payload
+        """
+        payload = self.verified_cache.get(token)
+        if payload is None:
+            payload = self.decode_token(token=token)
+            self.verified_cache.set(token, payload)
+        return payload
+
 
 jwt_auth_token: JWTAuthToken = JWTAuthToken()
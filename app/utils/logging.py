@@ -1,12 +1,139 @@
-import json
+import os
+import queue
 import re
+import threading
+import time
 from re import Pattern
-from typing import Any
+from typing import Any, BinaryIO
+import orjson
 from loguru import logger
 from loguru._handler import Message
 from app.config import config
 
 
+class BatchedJsonSink:
+    """
+    Loguru sink that writes JSON lines from a background thread.
+
+    Records are queued by the logging call and written in batches through a
+    persistent file handle, which is rotated by size. When the queue is full
+    a record is dropped and counted instead of blocking the event loop.
+
+    There is deliberately no `flush()`: loguru would call it after every
+    record, turning each log call back into a blocking write.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_queue: int = 10_000,
+        batch_size: int = 256,
+        flush_interval: float = 0.5,
+        max_bytes: int = 10 * 1024 * 1024,
+        backup_count: int = 5,
+    ) -> None:
+        self.path: str = path
+        self.batch_size: int = batch_size
+        self.flush_interval: float = flush_interval
+        self.max_bytes: int = max_bytes
+        self.backup_count: int = backup_count
+        self.dropped: int = 0
+        self._queue: queue.Queue[dict[str, Any] | None] = queue.Queue(maxsize=max_queue)  # pyright: ignore[reportExplicitAny]
+        self._file: BinaryIO | None = None
+        self._thread: threading.Thread = threading.Thread(
+            target=self._run, name="json-log-sink", daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def write(self, message: Message) -> None:
+        record = message.record
+        try:
+            self._queue.put_nowait(
+                {
+                    "time": record["time"].strftime("%Y-%m-%d %H:%M:%S"),
+                    "level": record["level"].name,
+                    "module": record["name"],
+                    "function": record["function"],
+                    "line": record["line"],
+                    "message": record["message"],
+                    "extra": record["extra"],
+                }
+            )
+        except queue.Full:
+            self.dropped += 1
+
+    def drain(self, timeout: float = 5.0) -> None:
+        """Blocks until every queued record is on disk (or `timeout` passes)."""
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def stop(self) -> None:
+        """Called by loguru when the sink is removed, including at exit."""
+        if not self._thread.is_alive():
+            return
+        self._queue.put(None)
+        self._thread.join(timeout=5.0)
+
+    def _run(self) -> None:
+        while True:
+            try:
+                entry = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            batch = [entry]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            entries = [e for e in batch if e is not None]
+            if entries:
+                self._write(entries)
+            for _ in batch:
+                self._queue.task_done()
+            if len(entries) < len(batch):
+                self._close()
+                return
+
+    def _write(self, entries: list[dict[str, Any]]) -> None:  # pyright: ignore[reportExplicitAny]
+        try:
+            handle = self._open()
+            _ = handle.write(
+                b"".join(orjson.dumps(e, default=str) + b"\n" for e in entries)
+            )
+            handle.flush()
+            if handle.tell() >= self.max_bytes:
+                self._rotate()
+        except OSError:
+            self.dropped += len(entries)
+
+    def _open(self) -> BinaryIO:
+        if self._file is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._file = open(self.path, "ab")
+        return self._file
+
+    def _rotate(self) -> None:
+        self._close()
+        for index in range(self.backup_count - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{index}"):
+                os.replace(f"{self.path}.{index}", f"{self.path}.{index + 1}")
+        if self.backup_count > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+    def _close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
 def app_logger():
     """
     Configure Loguru logger with file sink, rotation, and sensitive data filter.
@@ -24,21 +151,7 @@ def app_logger():
     )
 
     # Add JSON sink for structured logging
-    def json_sink(message: Message) -> None:
-        record = message.record
-        log_entry: dict[str, Any] = {  # pyright: ignore[reportExplicitAny]
-            "time": record["time"].strftime("%Y-%m-%d %H:%M:%S"),
-            "level": record["level"].name,
-            "module": record["name"],
-            "function": record["function"],
-            "line": record["line"],
-            "message": record["message"],
-            "extra": record["extra"],
-        }
-        with open("logs/json.log", "a") as f:
-            _ = f.write(json.dumps(log_entry) + "\n")
-
-    logger.add(json_sink, format="{message}")  # pyright: ignore[reportCallIssue, reportArgumentType]
+    _ = logger.add(json_sink, format="{message}")  # pyright: ignore[reportCallIssue, reportArgumentType]
     return logger
 
 
@@ -57,4 +170,23 @@ def filter_sensitive(data: dict[str, str | int] | str):
     return data
 
 
+# JSON string members whose key looks sensitive; also matches a value cut
+# short by truncation so a partial secret is never logged.
+SENSITIVE_MEMBER_PATTERN: Pattern[str] = re.compile(
+    r'("(?P<key>[^"]*(?:password|token|api_key|secret|auth)[^"]*)"\s*:\s*)"(?:[^"\\]|\\.)*(?:"|$)',
+    re.IGNORECASE,
+)
+
+
+def redact_text(text: str) -> str:
+    """Redacts sensitive members of a raw (possibly truncated) JSON body."""
+
+    def replace(match: re.Match[str]) -> str:
+        mask = "***" if PASSWORD_PATTERN.search(match.group("key")) else "[REDACTED]"
+        return f'{match.group(1)}"{mask}"'
+
+    return SENSITIVE_MEMBER_PATTERN.sub(replace, text)
+
+
+json_sink: BatchedJsonSink = BatchedJsonSink("logs/json.log")
 main_logger = app_logger()
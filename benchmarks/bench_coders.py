@@ -0,0 +1,70 @@
+"""
+Compares the stdlib JSON path with orjson for task list payloads.
+
+Covers the cache coder (encode on write, decode on hit) and the response
+class (render of the validated page). Run from the project root:
+
+    python -m benchmarks.bench_coders
+"""
+
+import timeit
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi_cache.coder import JsonCoder
+from app.core.redis import OrjsonCoder
+from app.schemas import Task, TaskPage
+from app.schemas.task_schemas import TaskStatus
+
+SIZES: tuple[int, ...] = (1_000, 10_000)
+REPEAT: int = 5
+
+
+def make_page(size: int) -> TaskPage:
+    return TaskPage(
+        items=[
+            Task(
+                id=i,
+                title=f"Task {i}",
+                description="Benchmark payload " * 4,
+                status=TaskStatus.PENDING if i % 2 else TaskStatus.COMPLETED,
+                user_id=1,
+            )
+            for i in range(1, size + 1)
+        ],
+        next_cursor="eyJpZCI6MTAwMDB9",
+    )
+
+
+def best_of(stmt: object, number: int) -> float:
+    """Best per-call time in milliseconds."""
+    return min(timeit.repeat(stmt, number=number, repeat=REPEAT)) / number * 1000  # pyright: ignore[reportArgumentType]
+
+
+def main() -> None:
+    print(f"{'payload':>8} {'step':<10} {'json (ms)':>10} {'orjson (ms)':>12} {'speedup':>8}")
+    for size in SIZES:
+        page = make_page(size)
+        number = max(1, 10_000 // size)
+        stdlib_blob = JsonCoder.encode(page)
+        orjson_blob = OrjsonCoder.encode(page)
+        content = jsonable_encoder(page)
+        steps: dict[str, tuple[float, float]] = {
+            "encode": (
+                best_of(lambda: JsonCoder.encode(page), number),
+                best_of(lambda: OrjsonCoder.encode(page), number),
+            ),
+            "decode": (
+                best_of(lambda: JsonCoder.decode(stdlib_blob), number),
+                best_of(lambda: OrjsonCoder.decode(orjson_blob), number),
+            ),
+            "response": (
+                best_of(lambda: JSONResponse(content=content), number),
+                best_of(lambda: ORJSONResponse(content=content), number),
+            ),
+        }
+        for step, (stdlib, fast) in steps.items():
+            print(f"{size:>8} {step:<10} {stdlib:>10.2f} {fast:>12.2f} {stdlib / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Lookup latency of the in-memory task repository as the store grows.
+
+Tasks are spread over USERS users; each size is loaded on top of the last.
+Reports the mean time of a first page, a deep keyset page and a lookup by
+id, which should stay flat now that they go through the per-user index.
+Run from the project root:
+
+    python -m benchmarks.bench_in_memory_repository
+"""
+
+import asyncio
+import random
+import time
+from collections.abc import Awaitable, Callable
+from app.repositories import TaskInMemoryRepository
+from app.schemas import TaskCreate
+
+SIZES: tuple[int, ...] = (10_000, 100_000, 1_000_000)
+USERS: int = 1_000
+BATCH: int = 1_000
+ROUNDS: int = 2_000
+
+
+async def mean_us(call: Callable[[], Awaitable[object]]) -> float:
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        _ = await call()
+    return (time.perf_counter() - started) / ROUNDS * 1e6
+
+
+async def main() -> None:
+    repository = TaskInMemoryRepository()
+    task_create = TaskCreate(title="Benchmark task", status="pending")
+    created_ids: list[int] = []
+    print(f"{'tasks':>10} {'load s':>8} {'page us':>9} {'deep us':>9} {'by id us':>9}")
+    for size in SIZES:
+        started = time.perf_counter()
+        while len(created_ids) < size:
+            user_id = len(created_ids) // BATCH % USERS + 1
+            created = await repository.create_tasks(
+                user_id=user_id, task_creates=[task_create] * BATCH
+            )
+            created_ids.extend(task.id for task in created if task.id is not None)
+        load = time.perf_counter() - started
+
+        probe = random.choice(created_ids)
+        task = await repository.get_task_by_id(user_id=(probe - 1) // BATCH % USERS + 1, task_id=probe)
+        page = await mean_us(lambda: repository.get_all_tasks(user_id=task.user_id, limit=50))
+        deep = await mean_us(
+            lambda: repository.get_all_tasks(user_id=task.user_id, after=probe, limit=50)
+        )
+        by_id = await mean_us(lambda: repository.get_task_by_id(user_id=task.user_id, task_id=probe))
+        print(f"{size:>10} {load:>8.1f} {page:>9.1f} {deep:>9.1f} {by_id:>9.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,81 @@
+"""
+Encode/decode throughput of each JWT backend and algorithm.
+
+Keys are generated on the fly; combinations a backend does not support
+(python-jose has no EdDSA) or backends that are not installed are skipped.
+Run from the project root:
+
+    python -m benchmarks.bench_jwt
+"""
+
+import timeit
+from datetime import datetime, timedelta, timezone
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+from app.utils.auth.jwt_backends import JWTBackend, get_jwt_backend
+
+BACKENDS: tuple[str, ...] = ("jose", "pyjwt")
+NUMBER: int = 2_000
+REPEAT: int = 5
+
+
+def pem_pair(private: ec.EllipticCurvePrivateKey | ed25519.Ed25519PrivateKey) -> tuple[str, str]:
+    return (
+        private.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        ).decode(),
+        private.public_key()
+        .public_bytes(
+            serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+        )
+        .decode(),
+    )
+
+
+KEYS: dict[str, tuple[str, str]] = {
+    "HS256": ("benchmark-secret", "benchmark-secret"),
+    "ES256": pem_pair(ec.generate_private_key(ec.SECP256R1())),
+    "EdDSA": pem_pair(ed25519.Ed25519PrivateKey.generate()),
+}
+
+
+def ops_per_second(stmt: object) -> float:
+    return NUMBER / min(timeit.repeat(stmt, number=NUMBER, repeat=REPEAT))  # pyright: ignore[reportArgumentType]
+
+
+def bench(backend: JWTBackend, algorithm: str) -> tuple[float, float]:
+    signing_key, verification_key = KEYS[algorithm]
+    claims = {
+        "username": "alice",
+        "email": "alice@example.com",
+        "uid": 1,
+        "exp": datetime.now(timezone.utc) + timedelta(minutes=30),
+    }
+    token = backend.encode(claims, signing_key, algorithm, kid="bench")
+    return (
+        ops_per_second(lambda: backend.encode(claims, signing_key, algorithm, kid="bench")),
+        ops_per_second(lambda: backend.decode(token, verification_key, algorithm)),
+    )
+
+
+def main() -> None:
+    print(f"{'backend':<7} {'alg':<6} {'encode/s':>10} {'decode/s':>10}")
+    for name in BACKENDS:
+        try:
+            backend = get_jwt_backend(name)
+        except ImportError:
+            print(f"{name:<7} not installed")
+            continue
+        for algorithm in KEYS:
+            try:
+                encode, decode = bench(backend, algorithm)
+            except Exception as e:
+                print(f"{name:<7} {algorithm:<6} unsupported ({type(e).__name__})")
+                continue
+            print(f"{name:<7} {algorithm:<6} {encode:>10.0f} {decode:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
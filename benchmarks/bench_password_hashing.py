@@ -0,0 +1,59 @@
+"""
+Measures event-loop lag while a burst of sign-ins hashes passwords.
+
+A ticker coroutine sleeps in short steps and records how late it wakes up.
+"inline" hashes on the event loop (the old behaviour); "pool" awaits the
+hashing pool. Uses the Argon2 parameters of the current ENV_MODE. Run from
+the project root:
+
+    python -m benchmarks.bench_password_hashing
+"""
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from app.utils import password_validator
+
+CONCURRENCY: tuple[int, ...] = (1, 10, 50)
+TICK: float = 0.005
+
+
+async def measure(sign_in: Callable[[], Awaitable[object]], concurrency: int) -> tuple[float, float, float]:
+    """Returns (wall time s, max lag ms, mean lag ms)."""
+    lags: list[float] = []
+    done = asyncio.Event()
+
+    async def ticker() -> None:
+        while not done.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(TICK)
+            lags.append((time.perf_counter() - started - TICK) * 1000)
+
+    ticking = asyncio.create_task(ticker())
+    await asyncio.sleep(TICK)
+    started = time.perf_counter()
+    _ = await asyncio.gather(*(sign_in() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    done.set()
+    await ticking
+    return elapsed, max(lags), sum(lags) / len(lags)
+
+
+async def main() -> None:
+    context = password_validator.pwd_context
+
+    async def inline() -> object:
+        return context.hash("correct horse battery staple")
+
+    async def pool() -> object:
+        return await password_validator.get_password_hash("correct horse battery staple")
+
+    print(f"{'sign-ins':>8} {'mode':<7} {'wall (s)':>9} {'max lag (ms)':>13} {'mean lag (ms)':>14}")
+    for concurrency in CONCURRENCY:
+        for mode, sign_in in (("inline", inline), ("pool", pool)):
+            elapsed, worst, mean = await measure(sign_in, concurrency)
+            print(f"{concurrency:>8} {mode:<7} {elapsed:>9.2f} {worst:>13.1f} {mean:>14.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
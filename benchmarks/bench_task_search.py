@@ -0,0 +1,105 @@
+"""
+Latency of GET /tasks/search's repository query on SQLite FTS5 as the table
+grows to 1M tasks.
+
+Tasks are spread over USERS users and loaded into a temporary database file
+built from the models, which creates the FTS table and its triggers. Reports
+the median and p95 of a first page (one word and a two-word prefix query)
+and of a later page for a user with 5,000 tasks. The vocabulary is tiny, so
+each word matches about half of a user's tasks, all of which get ranked: a
+worst case. Run from the project root:
+
+    python -m benchmarks.bench_task_search
+"""
+
+import asyncio
+import random
+import statistics
+import tempfile
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.repositories import TaskSQLRepository
+from app.schemas import TaskCreate
+
+SIZES: tuple[int, ...] = (10_000, 100_000, 1_000_000)
+USERS: int = 1_000
+BATCH: int = 5_000
+ROUNDS: int = 200
+WORDS: tuple[str, ...] = (
+    "report", "budget", "invoice", "meeting", "review", "deploy", "release",
+    "customer", "backlog", "design", "hiring", "roadmap", "migration", "audit",
+)
+
+
+async def percentiles_ms(call: Callable[[], Awaitable[object]]) -> tuple[float, float]:
+    timings: list[float] = []
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        _ = await call()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), statistics.quantiles(timings, n=20)[-1]
+
+
+def task_create(n: int, rng: random.Random) -> TaskCreate:
+    return TaskCreate(
+        title=f"{rng.choice(WORDS).title()} {rng.choice(WORDS)} #{n}",
+        description=" ".join(rng.choices(WORDS, k=8)) if n % 3 else None,
+    )
+
+
+async def main() -> None:
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{Path(directory) / 'search.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+        print(
+            f"{'tasks':>10} {'load s':>8} {'word p50/p95 ms':>16} "
+            f"{'prefix p50/p95':>16} {'page 2 p50/p95':>16}"
+        )
+        loaded = 0
+        async with AsyncSession(engine) as session:
+            repository = TaskSQLRepository(session)
+            for size in SIZES:
+                started = time.perf_counter()
+                while loaded < size:
+                    user_id = loaded // BATCH % USERS + 1
+                    _ = await repository.create_tasks(
+                        user_id=user_id,
+                        task_creates=[task_create(loaded + n, rng) for n in range(BATCH)],
+                    )
+                    loaded += BATCH
+                load = time.perf_counter() - started
+
+                user_id = rng.randint(1, min(USERS, size // BATCH))
+                first = await repository.search_tasks(user_id=user_id, terms=["report"], limit=50)
+                task, score = first[-1]
+                word = await percentiles_ms(
+                    lambda: repository.search_tasks(user_id=user_id, terms=["report"], limit=50)
+                )
+                prefix = await percentiles_ms(
+                    lambda: repository.search_tasks(
+                        user_id=user_id, terms=["budget", "rev"], limit=50
+                    )
+                )
+                page = await percentiles_ms(
+                    lambda: repository.search_tasks(
+                        user_id=user_id,
+                        terms=["report"],
+                        limit=50,
+                        after=(score, task.id or 0),
+                    )
+                )
+                print(
+                    f"{size:>10} {load:>8.1f} {word[0]:>7.2f}/{word[1]:<8.2f} "
+                    f"{prefix[0]:>7.2f}/{prefix[1]:<8.2f} {page[0]:>7.2f}/{page[1]:<8.2f}"
+                )
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,67 @@
+"""
+Memory per task of each in-memory task store, and the compact store's
+snapshot/load times.
+
+Memory is what tracemalloc sees allocated while TASKS tasks are inserted,
+divided by TASKS; titles and descriptions are typical short strings.
+Run from the project root:
+
+    python -m benchmarks.bench_task_store
+"""
+
+import gc
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from app.repositories.in_memory_repository import CompactTaskStore, DictTaskStore, TaskStore
+from app.schemas import TaskCreate
+
+TASKS: int = 200_000
+USERS: int = 1_000
+
+
+def fill(store: TaskStore) -> None:
+    for n in range(TASKS):
+        task_create = TaskCreate(
+            title=f"Task {n}: review the quarterly report",
+            description=f"Follow up with team {n % 97} before Friday" if n % 3 else None,
+        )
+        _ = store.insert(user_id=n % USERS + 1, values=task_create.model_dump())
+
+
+def bytes_per_task(store: TaskStore) -> float:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    fill(store)
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / TASKS
+
+
+def main() -> None:
+    for store in (DictTaskStore(), CompactTaskStore()):
+        print(f"{type(store).__name__:>18}: {bytes_per_task(store):7.1f} bytes/task")
+
+    compact = CompactTaskStore()
+    fill(compact)
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "tasks.snap"
+        started = time.perf_counter()
+        compact.snapshot(path)
+        written = time.perf_counter() - started
+        started = time.perf_counter()
+        loaded = CompactTaskStore.load(path)
+        read = time.perf_counter() - started
+        size = path.stat().st_size
+    assert len(loaded) == TASKS
+    print(
+        f"snapshot {size / TASKS:.1f} bytes/task on disk, "
+        f"written in {written * 1000:.1f} ms, loaded in {read * 1000:.1f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
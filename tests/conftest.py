@@ -1,13 +1,18 @@
+from collections.abc import AsyncIterator, Callable
+from types import SimpleNamespace
 from typing import TypedDict, cast
 import pytest_asyncio
 from faker import Faker
+from fastapi import Request
 from sqlmodel import SQLModel
 from sqlalchemy.ext.asyncio import create_async_engine
-from unittest.mock import AsyncMock, Mock
+from sqlalchemy.pool import StaticPool
+from unittest.mock import AsyncMock, MagicMock, Mock
 
 from sqlmodel.ext.asyncio.session import AsyncSession
 from app.core.db import AsyncSessionLocal
 from app.config import config
+from app.schemas import User
 from app.schemas.task_schemas import TaskStatus
 
 # Create async engine
@@ -35,6 +40,33 @@ async def session():
         await session.close()
 
 
+@pytest_asyncio.fixture
+async def sqlite_session() -> AsyncIterator[AsyncSession]:
+    # Isolated in-memory database per test, built from the model metadata
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    async with AsyncSession(engine) as session:
+        yield session
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def sqlite_user(sqlite_session: AsyncSession, mock_user: "UserTyped") -> User:
+    user = User(
+        username=mock_user["username"],
+        email=mock_user["email"],
+        hashed_password="not-a-real-hash",
+        is_active=True,
+    )
+    sqlite_session.add(user)
+    await sqlite_session.commit()
+    await sqlite_session.refresh(user)
+    # Detach so later commits in the test do not expire the loaded attributes
+    sqlite_session.expunge(user)
+    return user
+
+
 @pytest_asyncio.fixture
 async def task_mock_session():
     session = Mock(spec=AsyncSession)
@@ -57,6 +89,47 @@ async def auth_mock_session():
     return session
 
 
+@pytest_asyncio.fixture
+async def mock_redis() -> MagicMock:
+    # `pipeline()` is an async context manager; set what `execute` returns
+    # on `mock_redis.pipeline.return_value`.
+    pipe = MagicMock()
+    # RedisBackend.get_with_ttl chains `pipe.ttl(key).get(key)`.
+    pipe.ttl.return_value = pipe
+    pipe.get.return_value = pipe
+    pipe.execute = AsyncMock(return_value=[])
+    pipe.__aenter__ = AsyncMock(return_value=pipe)
+    pipe.__aexit__ = AsyncMock(return_value=None)
+    redis = MagicMock()
+    redis.pipeline = MagicMock(return_value=pipe)
+    redis.get = AsyncMock(return_value=None)
+    redis.set = AsyncMock()
+    redis.exists = AsyncMock(return_value=0)
+    redis.incr = AsyncMock(return_value=1)
+    redis.publish = AsyncMock(return_value=1)
+    return redis
+
+
+MakeRequest = Callable[[dict[str, str | int] | None], Request]
+
+
+@pytest_asyncio.fixture
+async def make_request() -> MakeRequest:
+    # Stand-in for the request seen by dependencies and cache key builders,
+    # with `user` as the decoded token payload.
+    def make(user: dict[str, str | int] | None) -> Request:
+        return cast(
+            Request,
+            SimpleNamespace(
+                state=SimpleNamespace(user=user),
+                query_params={},
+                url=SimpleNamespace(path="/tasks/"),
+            ),
+        )
+
+    return make
+
+
 @pytest_asyncio.fixture
 async def faker_session() -> Faker:
     # Create a Faker instance with a fixed seed for reproducible data
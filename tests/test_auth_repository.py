@@ -1,5 +1,7 @@
+import asyncio
 import pytest
-from app.schemas import UserCreate
+from app.core import UserExistException
+from app.schemas import User, UserCreate
 from app.repositories import AuthInMemoryRepository
 from tests.conftest import UserTyped
 
@@ -36,3 +38,26 @@ class TestAuthInMemoryRepository:
         assert user.username == mocked_user["username"]
         assert user.email == mocked_user["email"]
         assert user.id is not None
+
+    async def test_concurrent_sign_ups_cannot_share_a_username(
+        self, in_memory_auth_repository: AuthInMemoryRepository
+    ):
+        user_creates = [
+            UserCreate(
+                username="index-race",
+                email=f"index-race-{n}@example.com",
+                password="correct-horse-battery",
+            )
+            for n in range(5)
+        ]
+
+        results = await asyncio.gather(
+            *(in_memory_auth_repository.create_user(user) for user in user_creates),
+            return_exceptions=True,
+        )
+
+        [created] = [r for r in results if isinstance(r, User)]
+        assert all(isinstance(r, UserExistException) for r in results if r is not created)
+        activated = await in_memory_auth_repository.activate_user_account("index-race")
+        assert activated is created
+        assert await in_memory_auth_repository.get_user_by_email(created.email) is created
@@ -0,0 +1,282 @@
+import asyncio
+from typing import Any, cast
+from unittest.mock import MagicMock, patch
+import pytest
+from redis.asyncio import Redis
+from fastapi_cache import FastAPICache
+from app.core.cache_backend import (
+    CoalescingRedisBackend,
+    LocalCache,
+    TieredRedisBackend,
+    cache_metrics,
+    release_recomputes,
+)
+from app.config import config
+from app.core.db import read_from_replica
+
+
+def make_backend(redis: MagicMock) -> TieredRedisBackend:
+    return TieredRedisBackend(
+        redis=redis,
+        local=LocalCache(max_entries=100, max_bytes=1024, ttl=30),
+        channel="invalidate",
+    )
+
+
+class TestLocalCache:
+    def test_evicts_least_recently_used_entry(self):
+        cache = LocalCache(max_entries=2, max_bytes=1024, ttl=30)
+        cache.set("a", b"1")
+        cache.set("b", b"2")
+        _ = cache.get("a")
+        cache.set("c", b"3")
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
+
+    def test_byte_limit_evicts_until_it_fits(self):
+        cache = LocalCache(max_entries=100, max_bytes=10, ttl=30)
+        cache.set("a", b"x" * 6)
+        cache.set("b", b"y" * 6)
+
+        assert len(cache) == 1
+        assert cache.size_bytes == 6
+        assert cache.get("a") is None
+
+    def test_oversized_value_is_not_stored(self):
+        cache = LocalCache(max_entries=100, max_bytes=10, ttl=30)
+        cache.set("a", b"x" * 11)
+
+        assert len(cache) == 0
+
+    def test_entries_expire(self):
+        cache = LocalCache(max_entries=100, max_bytes=1024, ttl=30)
+        with patch("app.core.cache_backend.time.monotonic", return_value=100.0):
+            cache.set("a", b"1", ttl=5)
+        with patch("app.core.cache_backend.time.monotonic", return_value=106.0):
+            assert cache.get("a") is None
+        assert cache.size_bytes == 0
+
+
+@pytest.mark.asyncio
+class TestTieredRedisBackend:
+    async def test_repeated_reads_are_served_locally(self, mock_redis: MagicMock):
+        mock_redis.pipeline.return_value.execute.return_value = [60, b"payload"]
+        backend = make_backend(mock_redis)
+
+        first = await backend.get_with_ttl("task:list:alice:v0:/tasks/")
+        second = await backend.get_with_ttl("task:list:alice:v0:/tasks/")
+
+        assert first[1] == second[1] == b"payload"
+        assert 0 < second[0] <= 30
+        mock_redis.pipeline.return_value.execute.assert_awaited_once()
+
+    async def test_missing_control_key_is_cached_locally(self, mock_redis: MagicMock):
+        backend = make_backend(mock_redis)
+
+        assert await backend.get("task:version:alice") is None
+        assert await backend.get("task:version:alice") is None
+        mock_redis.get.assert_awaited_once()
+
+    async def test_invalidate_drops_local_copy_and_notifies_workers(
+        self, mock_redis: MagicMock
+    ):
+        mock_redis.get.return_value = b"3"
+        backend = make_backend(mock_redis)
+        _ = await backend.get("task:version:alice")
+
+        await backend.invalidate("task:version:alice")
+        _ = await backend.get("task:version:alice")
+
+        mock_redis.publish.assert_awaited_once_with("invalidate", "task:version:alice")
+        assert mock_redis.get.await_count == 2
+
+    async def test_set_writes_through(self, mock_redis: MagicMock):
+        backend = make_backend(mock_redis)
+
+        await backend.set("task:detail:alice:v0:1", b"task", expire=60)
+
+        mock_redis.pipeline.return_value.set.assert_called_once_with(
+            "task:detail:alice:v0:1", b"task", ex=60
+        )
+        assert await backend.get("task:detail:alice:v0:1") == b"task"
+        mock_redis.get.assert_not_awaited()
+
+    async def test_entries_read_from_a_replica_expire_early(self, mock_redis: MagicMock):
+        backend = make_backend(mock_redis)
+
+        token = read_from_replica.set(True)
+        try:
+            await backend.set("task:detail:alice:v1:1", b"task", expire=60)
+        finally:
+            read_from_replica.reset(token)
+
+        max_lag = config.database.get("replica_max_lag")
+        mock_redis.pipeline.return_value.set.assert_called_once_with(
+            "task:detail:alice:v1:1", b"task", ex=max_lag
+        )
+
+
+class FakeRedis:
+    """Just enough of redis.asyncio.Redis for the coalescing backend."""
+
+    def __init__(self) -> None:
+        self.data: dict[str, bytes] = {}
+
+    async def get(self, key: str) -> bytes | None:
+        return self.data.get(key)
+
+    async def set(
+        self,
+        key: str,
+        value: bytes,
+        ex: int | None = None,
+        px: int | None = None,
+        nx: bool = False,
+    ) -> bool:
+        if nx and key in self.data:
+            return False
+        self.data[key] = value
+        return True
+
+    async def exists(self, key: str) -> int:
+        return int(key in self.data)
+
+    async def delete(self, key: str) -> int:
+        return int(self.data.pop(key, None) is not None)
+
+    def pipeline(self, transaction: bool = True) -> "FakePipeline":
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, redis: FakeRedis) -> None:
+        self.redis: FakeRedis = redis
+        self.commands: list[tuple[str, tuple[object, ...], dict[str, object]]] = []
+
+    async def __aenter__(self) -> "FakePipeline":
+        return self
+
+    async def __aexit__(self, *_: object) -> None:
+        pass
+
+    def __getattr__(self, name: str):
+        def queue(*args: object, **kwargs: object) -> "FakePipeline":
+            self.commands.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    async def execute(self) -> list[object]:
+        results: list[object] = []
+        for name, args, kwargs in self.commands:
+            key = str(args[0])
+            if name == "ttl":
+                results.append(60 if key in self.redis.data else -2)
+            elif name == "get":
+                results.append(self.redis.data.get(key))
+            elif name == "delete":
+                results.append(int(self.redis.data.pop(key, None) is not None))
+            elif name == "set":
+                self.redis.data[key] = cast(bytes, args[1])
+                results.append(True)
+        return results
+
+
+def make_coalescing(redis: FakeRedis, **options: Any) -> CoalescingRedisBackend:  # pyright: ignore[reportExplicitAny, reportAny]
+    return CoalescingRedisBackend(
+        redis=cast(Redis, redis), poll_interval=0.01, **options  # pyright: ignore[reportAny]
+    )
+
+
+@pytest.mark.asyncio
+class TestCoalescingRedisBackend:
+    async def test_concurrent_misses_recompute_once(self):
+        backend = make_coalescing(FakeRedis())
+        before = cache_metrics.snapshot()
+
+        async def read() -> bytes:
+            _, value = await backend.get_with_ttl("task:list:alice:v0")
+            if value is None:
+                await asyncio.sleep(0.02)  # The database query
+                value = b"fresh"
+                await backend.set("task:list:alice:v0", value, expire=60)
+            return value
+
+        results = await asyncio.gather(*(read() for _ in range(10)))
+
+        after = cache_metrics.snapshot()
+        assert results == [b"fresh"] * 10
+        assert after["misses"] - before["misses"] == 1
+        assert after["coalesced"] - before["coalesced"] == 9
+
+    async def test_other_worker_waits_for_lock_holder(self):
+        redis = FakeRedis()
+        worker_a = make_coalescing(redis)
+        worker_b = make_coalescing(redis)
+
+        _, value = await worker_a.get_with_ttl("task:list:bob:v0")
+        assert value is None  # worker_a holds the lock and recomputes
+
+        async def finish() -> None:
+            await asyncio.sleep(0.03)
+            await worker_a.set("task:list:bob:v0", b"fresh", expire=60)
+
+        (_, waited), _ = await asyncio.gather(
+            worker_b.get_with_ttl("task:list:bob:v0"), finish()
+        )
+
+        assert waited == b"fresh"
+        assert "task:list:bob:v0:lock" not in redis.data
+
+    async def test_stale_copy_is_served_during_refresh(self):
+        redis = FakeRedis()
+        backend = make_coalescing(redis, stale_ttl=60)
+        await backend.set("task:list:carol:v0", b"old", expire=60)
+        del redis.data["task:list:carol:v0"]  # The entry expires
+
+        _, leader = await backend.get_with_ttl("task:list:carol:v0")
+        _, follower = await backend.get_with_ttl("task:list:carol:v0")
+
+        assert leader is None
+        assert follower == b"old"
+
+    async def test_waiter_gives_up_when_recompute_never_lands(self):
+        backend = make_coalescing(FakeRedis(), wait_timeout=0.05)
+
+        _, leader = await backend.get_with_ttl("task:list:dave:v0")
+        _, follower = await backend.get_with_ttl("task:list:dave:v0")
+
+        assert leader is None
+        assert follower is None
+
+    async def test_failed_recompute_releases_waiters_and_lock(self):
+        redis = FakeRedis()
+        backend = make_coalescing(redis, wait_timeout=1.0)
+        FastAPICache.init(backend=backend, prefix="test-release")
+
+        @release_recomputes
+        async def handler() -> bytes:
+            # What @cache does on a miss when the handler then raises (a 404).
+            _, value = await backend.get_with_ttl("task:detail:erin:v0:9")
+            if value is None:
+                await asyncio.sleep(0.02)
+                raise LookupError("Task with id 9 does not exist")
+            return value
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        outcomes = await asyncio.gather(*(handler() for _ in range(3)), return_exceptions=True)
+        _ = await asyncio.gather(handler(), return_exceptions=True)
+        FastAPICache.reset()
+
+        assert all(isinstance(outcome, LookupError) for outcome in outcomes)
+        assert loop.time() - started < 0.5
+        assert "task:detail:erin:v0:9:lock" not in redis.data
+        assert backend._in_flight == {}  # pyright: ignore[reportPrivateUsage]
+
+    async def test_lock_never_outlives_the_wait(self):
+        backend = make_coalescing(FakeRedis(), lock_ttl_ms=5000, wait_timeout=3.0)
+
+        assert backend.lock_ttl_ms == 3000
@@ -0,0 +1,213 @@
+from collections.abc import Iterator
+from datetime import datetime, timezone
+from typing import cast
+from unittest.mock import AsyncMock, MagicMock, patch
+import pytest
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.inmemory import InMemoryBackend
+from fastapi_cache.backends.redis import RedisBackend
+from app.config import config
+from app.core.cache_backend import LocalCache, TieredRedisBackend
+from app.core.cache_utils import (
+    cache_task_details,
+    get_task_cache_version,
+    invalidate_task_cache,
+    task_detail_cache_key_builder,
+    task_list_cache_key_builder,
+)
+from app.core.pagination import encode_cursor
+from app.core.redis import OrjsonCoder
+from app.schemas import Task, TaskListQuery, TaskPage
+from app.schemas.task_schemas import TaskStatus
+from tests.conftest import MakeRequest
+
+
+def make_tasks(count: int) -> list[Task]:
+    return [
+        Task(id=i, title=f"Task {i}", status=TaskStatus.PENDING, user_id=1)
+        for i in range(1, count + 1)
+    ]
+
+
+@pytest.fixture
+def redis_pipeline(mock_redis: MagicMock) -> Iterator[MagicMock]:
+    mock_redis.incr.return_value = 8
+    FastAPICache.init(
+        backend=RedisBackend(redis=mock_redis),
+        prefix="test-cache",
+        expire=60,
+        coder=OrjsonCoder,
+    )
+    yield mock_redis.pipeline.return_value
+    FastAPICache.reset()
+
+
+@pytest.mark.asyncio
+class TestCacheTaskDetails:
+    async def test_writes_go_through_chunked_pipelines(self, redis_pipeline: MagicMock):
+        with patch.dict(config.redis, {"warm_chunk_size": 2}):
+            await cache_task_details(username="alice", version=3, tasks=make_tasks(5))
+
+        # 5 tasks in chunks of 2: three round-trips, not five.
+        assert redis_pipeline.execute.await_count == 3
+        assert redis_pipeline.set.call_count == 5
+        key, value = redis_pipeline.set.call_args_list[0].args
+        assert key == "test-cache:task:detail:alice:v3:1"
+        assert OrjsonCoder.decode(value)["title"] == "Task 1"
+        assert redis_pipeline.set.call_args_list[0].kwargs == {"ex": 60}
+
+    async def test_empty_list_skips_redis(self, redis_pipeline: MagicMock):
+        await cache_task_details(username="alice", version=0, tasks=[])
+
+        redis_pipeline.execute.assert_not_awaited()
+
+    async def test_non_redis_backend_falls_back_to_set(self):
+        backend = InMemoryBackend()
+        FastAPICache.init(backend=backend, prefix="test-cache", expire=60)
+        try:
+            await cache_task_details(username="bob", version=0, tasks=make_tasks(2))
+            assert await backend.get("test-cache:task:detail:bob:v0:2") is not None
+        finally:
+            FastAPICache.reset()
+
+
+@pytest.fixture
+def in_memory_cache() -> Iterator[InMemoryBackend]:
+    backend = InMemoryBackend()
+    FastAPICache.init(backend=backend, prefix="test-cache", expire=60)
+    yield backend
+    FastAPICache.reset()
+
+
+async def read_tasks() -> None:
+    pass
+
+
+@pytest.mark.asyncio
+class TestVersionedTaskCache:
+    async def test_redis_invalidation_is_a_single_incr(
+        self, redis_pipeline: MagicMock
+    ):
+        backend = cast(RedisBackend, FastAPICache.get_backend())
+
+        version = await invalidate_task_cache(username="alice")
+
+        assert version == 8
+        cast(AsyncMock, backend.redis.incr).assert_awaited_once_with(
+            "test-cache:task:version:alice"
+        )
+        # No pattern scan over the keyspace.
+        cast(MagicMock, backend.redis.eval).assert_not_called()
+
+    async def test_invalidation_moves_keys_to_new_generation(
+        self,
+        in_memory_cache: InMemoryBackend,
+        make_request: MakeRequest,
+    ):
+        request = make_request({"username": "carol"})
+        list_key = await task_list_cache_key_builder(
+            read_tasks, "test-cache:task:list", request=request, args=(), kwargs={}
+        )
+        detail_key = await task_detail_cache_key_builder(
+            read_tasks,
+            "test-cache:task:detail",
+            request=request,
+            args=(),
+            kwargs={"task_id": 5},
+        )
+
+        assert await invalidate_task_cache(username="carol") == 1
+        assert await invalidate_task_cache(username="carol") == 2
+
+        assert await get_task_cache_version(username="carol") == 2
+        assert list_key == "test-cache:task:list:carol:v0:/tasks/?limit=50"
+        assert detail_key == "test-cache:task:detail:carol:v0:5"
+        assert await task_list_cache_key_builder(
+            read_tasks, "test-cache:task:list", request=request, args=(), kwargs={}
+        ) == "test-cache:task:list:carol:v2:/tasks/?limit=50"
+        # Other users keep their generation.
+        assert await get_task_cache_version(username="dave") == 0
+
+    async def test_list_keys_normalize_filters_and_projection(
+        self,
+        in_memory_cache: InMemoryBackend,
+        make_request: MakeRequest,
+    ):
+        async def key(query: TaskListQuery, after: str | None = None) -> str:
+            return await task_list_cache_key_builder(
+                read_tasks,
+                "test-cache:task:list",
+                request=make_request({"username": "frank"}),
+                args=(),
+                kwargs={"query": query, "after": after, "limit": 50},
+            )
+
+        sparse = await key(TaskListQuery(fields="title,status", sort="-title"))
+
+        assert sparse == await key(TaskListQuery(fields=["status", " title", "id"], sort="-title"))
+        assert sparse == (
+            "test-cache:task:list:frank:v0:/tasks/?fields=id,title,status&limit=50&sort=-title"
+        )
+        assert await key(TaskListQuery(sort="id")) == (
+            "test-cache:task:list:frank:v0:/tasks/?limit=50"
+        )
+        cursor = encode_cursor(9, sort="-title", value="kiwi")
+        assert await key(TaskListQuery(sort="-title"), after=cursor) == (
+            "test-cache:task:list:frank:v0:/tasks/?after=-title:kiwi:9&limit=50&sort=-title"
+        )
+
+    async def test_tiered_backend_broadcasts_the_bump(self):
+        redis = MagicMock()
+        redis.incr = AsyncMock(return_value=2)
+        redis.publish = AsyncMock(return_value=1)
+        FastAPICache.init(
+            backend=TieredRedisBackend(
+                redis=redis,
+                local=LocalCache(max_entries=10, max_bytes=1024, ttl=30),
+                channel="invalidate",
+            ),
+            prefix="test-cache",
+            expire=60,
+        )
+        try:
+            assert await invalidate_task_cache(username="erin") == 2
+        finally:
+            FastAPICache.reset()
+
+        redis.publish.assert_awaited_once_with(
+            "invalidate", "test-cache:task:version:erin"
+        )
+
+
+class TestOrjsonCoder:
+    def test_round_trips_task_models(self):
+        page = TaskPage(items=make_tasks(2), next_cursor="abc")
+
+        decoded = OrjsonCoder.decode(OrjsonCoder.encode(page))
+
+        assert decoded == {
+            "items": [
+                {
+                    "id": i,
+                    "title": f"Task {i}",
+                    "description": None,
+                    "status": "pending",
+                    "user_id": 1,
+                }
+                for i in (1, 2)
+            ],
+            "next_cursor": "abc",
+        }
+
+    def test_decodes_str_from_redis(self):
+        assert OrjsonCoder.decode('{"status": "completed"}') == {"status": "completed"}
+
+    def test_handles_datetimes_and_enums(self):
+        moment = datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+
+        encoded = OrjsonCoder.encode({"at": moment, "status": TaskStatus.COMPLETED})
+
+        assert OrjsonCoder.decode(encoded) == {
+            "at": "2025-01-02T03:04:05+00:00",
+            "status": "completed",
+        }
@@ -0,0 +1,195 @@
+from collections.abc import AsyncIterator
+from pathlib import Path
+from unittest.mock import patch
+import pytest
+import pytest_asyncio
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlmodel import SQLModel
+from app.core.db import (
+    AsyncSessionLocal,
+    InstrumentedAsyncPool,
+    ReplicaSet,
+    engine_options,
+    pool_metrics,
+    pool_stats,
+    replica_cache_expire,
+)
+from app.config import config
+from app.repositories import AuthSQLRepository, TaskSQLRepository
+from app.schemas import Task, TaskCreate, User
+from app.schemas.task_schemas import TaskStatus
+
+
+class TestEngineOptions:
+    def test_pool_settings_come_from_config(self):
+        options = engine_options("sqlite+aiosqlite:///./x.db")
+
+        assert options["poolclass"] is InstrumentedAsyncPool
+        assert {
+            "pool_size", "max_overflow", "pool_timeout", "pool_recycle", "pool_pre_ping"
+        } <= set(options)
+        assert "connect_args" not in options
+
+    def test_asyncpg_gets_statement_cache_size(self):
+        with patch.dict("app.config.config.database", {"statement_cache_size": 0}):
+            options = engine_options("postgresql+asyncpg://u:p@db/app")
+
+        assert options["connect_args"] == {"prepared_statement_cache_size": 0}
+
+
+@pytest.mark.asyncio
+class TestInstrumentedAsyncPool:
+    async def test_counts_checkouts_waits_and_timeouts(self, tmp_path: Path):
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+            poolclass=InstrumentedAsyncPool,
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=0.05,
+        )
+        before = (pool_metrics.checkouts, pool_metrics.timeouts)
+        try:
+            async with engine.connect() as held:
+                _ = await held.execute(text("select 1"))
+                assert engine.pool.checkedout() == 1  # pyright: ignore[reportAttributeAccessIssue, reportUnknownMemberType]
+                with pytest.raises(exc.TimeoutError):
+                    async with engine.connect():
+                        pass
+        finally:
+            await engine.dispose()
+
+        assert pool_metrics.checkouts - before[0] == 2
+        assert pool_metrics.timeouts - before[1] == 1
+        assert pool_metrics.wait_max >= 0.05
+
+    async def test_stats_report_the_app_pool(self):
+        stats = pool_stats()
+
+        assert {"checkouts", "timeouts", "wait_ms_avg", "wait_ms_max"} <= set(stats)
+        assert {"pool_size", "checked_out", "idle", "overflow"} <= set(stats)
+
+
+async def sqlite_file(path: Path, title: str) -> AsyncEngine:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+        _ = await conn.execute(
+            Task.__table__.insert().values(  # pyright: ignore[reportAttributeAccessIssue, reportUnknownMemberType]
+                id=1, title=title, status=TaskStatus.PENDING, user_id=1
+            )
+        )
+    return engine
+
+
+@pytest_asyncio.fixture
+async def databases(tmp_path: Path) -> AsyncIterator[dict[str, AsyncEngine]]:
+    # The same task row, titled after the database that holds it.
+    engines = {
+        name: await sqlite_file(tmp_path / f"{name}.db", title=name)
+        for name in ("primary", "replica-a", "replica-b")
+    }
+    yield engines
+    for engine in engines.values():
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+class TestReplicaRouting:
+    async def read_title(self, primary: AsyncEngine) -> str:
+        async with AsyncSessionLocal(bind=primary) as session:
+            task = await TaskSQLRepository(db=session).get_task_by_id(user_id=1, task_id=1)
+            return task.title
+
+    async def test_reads_go_to_the_replica(self, databases: dict[str, AsyncEngine]):
+        with patch("app.core.db.replicas", ReplicaSet([databases["replica-a"]])):
+            assert await self.read_title(databases["primary"]) == "replica-a"
+
+    async def test_without_replicas_reads_use_the_primary(
+        self, databases: dict[str, AsyncEngine]
+    ):
+        with patch("app.core.db.replicas", ReplicaSet([])):
+            assert await self.read_title(databases["primary"]) == "primary"
+
+    async def test_round_robin_across_replicas(self, databases: dict[str, AsyncEngine]):
+        replicas = ReplicaSet([databases["replica-a"], databases["replica-b"]])
+
+        with patch("app.core.db.replicas", replicas):
+            titles = [await self.read_title(databases["primary"]) for _ in range(4)]
+
+        assert titles == ["replica-a", "replica-b", "replica-a", "replica-b"]
+
+    async def test_failed_replica_is_skipped(self, databases: dict[str, AsyncEngine]):
+        replicas = ReplicaSet([databases["replica-a"], databases["replica-b"]])
+        replicas.mark_down(0)
+
+        with patch("app.core.db.replicas", replicas):
+            titles = [await self.read_title(databases["primary"]) for _ in range(3)]
+
+        assert titles == ["replica-b"] * 3
+
+    async def test_all_replicas_down_falls_back_to_primary(
+        self, databases: dict[str, AsyncEngine]
+    ):
+        replicas = ReplicaSet([databases["replica-a"]])
+        replicas.mark_down(0)
+
+        with patch("app.core.db.replicas", replicas):
+            assert await self.read_title(databases["primary"]) == "primary"
+
+    async def test_auth_reads_stay_on_the_primary(self, databases: dict[str, AsyncEngine]):
+        # Activated on the primary; the replica has not caught up yet.
+        for name, is_active in (("primary", True), ("replica-a", False)):
+            async with databases[name].begin() as conn:
+                _ = await conn.execute(
+                    User.__table__.insert().values(  # pyright: ignore[reportAttributeAccessIssue, reportUnknownMemberType]
+                        id=1, username="alice", email="alice@x.io", hashed_password="x", is_active=is_active
+                    )
+                )
+
+        with patch("app.core.db.replicas", ReplicaSet([databases["replica-a"]])):
+            async with AsyncSessionLocal(bind=databases["primary"]) as session:
+                user = await AuthSQLRepository(session).get_user_by_username("alice")
+
+        assert user.is_active
+
+    async def test_replica_reads_cap_cache_ttls(self, databases: dict[str, AsyncEngine]):
+        max_lag = config.database.get("replica_max_lag")
+        with patch("app.core.db.replicas", ReplicaSet([])):
+            _ = await self.read_title(databases["primary"])
+        assert replica_cache_expire(300) == 300
+
+        with patch("app.core.db.replicas", ReplicaSet([databases["replica-a"]])):
+            _ = await self.read_title(databases["primary"])
+
+        assert replica_cache_expire(300) == max_lag
+        assert replica_cache_expire(None) == max_lag
+
+    async def test_connection_errors_take_a_replica_out(self, tmp_path: Path):
+        broken = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'x.db'}")
+        replicas = ReplicaSet([broken])
+        try:
+            with pytest.raises(exc.OperationalError):
+                async with broken.connect():
+                    pass
+        finally:
+            await broken.dispose()
+
+        assert replicas.pick() is None
+
+    async def test_reads_stick_to_primary_after_a_write(
+        self, databases: dict[str, AsyncEngine]
+    ):
+        with patch("app.core.db.replicas", ReplicaSet([databases["replica-a"]])):
+            async with AsyncSessionLocal(bind=databases["primary"]) as session:
+                repository = TaskSQLRepository(db=session)
+                before = (await repository.get_task_by_id(user_id=1, task_id=1)).title
+                created = await repository.create_task(
+                    user_id=1, task_create=TaskCreate(title="new", status=TaskStatus.PENDING)
+                )
+                after = await repository.get_task_by_id(user_id=1, task_id=created.id)  # pyright: ignore[reportArgumentType]
+                tasks = await repository.get_all_tasks(user_id=1)
+
+        assert before == "replica-a"
+        assert after.title == "new"
+        assert [task.title for task in tasks] == ["primary", "new"]
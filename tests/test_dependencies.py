@@ -0,0 +1,110 @@
+import asyncio
+import random
+from collections.abc import AsyncIterator
+from typing import cast
+from unittest.mock import AsyncMock, Mock, patch
+import pytest
+from fastapi import Depends, FastAPI, Request
+from httpx import ASGITransport, AsyncClient
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core import UnauthorizedException, get_auth_service, get_current_user, get_task_service
+from app.core.db import get_db_session
+from app.core.dependencies import RequestContainer, user_id_cache
+from app.repositories import AuthSQLRepository, TaskSQLRepository
+from app.schemas import User
+from app.services import AuthService, TaskService
+from tests.conftest import MakeRequest
+
+
+@pytest.mark.asyncio
+class TestGetCurrentUser:
+    async def test_uid_claim_skips_user_lookup(
+        self, auth_mock_session: Mock, make_request: MakeRequest
+    ):
+        request = make_request({"username": "uid-user", "email": "u@x.io", "uid": 7})
+
+        current_user = await get_current_user(request=request, session=auth_mock_session)
+
+        assert current_user.id == 7
+        assert current_user.username == "uid-user"
+        assert request.state.current_user is current_user
+        auth_mock_session.exec.assert_not_called()
+
+    async def test_legacy_token_lookup_is_cached(
+        self, auth_mock_session: Mock, make_request: MakeRequest
+    ):
+        request = make_request({"username": "legacy-user", "email": "l@x.io"})
+        lookup = AsyncMock(
+            return_value=User(
+                id=42, username="legacy-user", email="l@x.io", hashed_password="x"
+            )
+        )
+
+        with patch(
+            "app.core.dependencies.AuthSQLRepository.get_user_by_username", lookup
+        ):
+            first = await get_current_user(request=request, session=auth_mock_session)
+            second = await get_current_user(request=request, session=auth_mock_session)
+
+        assert first.id == second.id == 42
+        lookup.assert_awaited_once()
+        assert user_id_cache.get("legacy-user") == 42
+
+    async def test_anonymous_request_is_rejected(
+        self, auth_mock_session: Mock, make_request: MakeRequest
+    ):
+        with pytest.raises(UnauthorizedException):
+            _ = await get_current_user(
+                request=make_request(None), session=auth_mock_session
+            )
+
+
+class FakeSession:
+    def __init__(self, request_no: int) -> None:
+        self.request_no: int = request_no
+
+
+def make_app() -> FastAPI:
+    app = FastAPI()
+
+    async def session_per_request(request: Request) -> AsyncIterator[FakeSession]:
+        # Yield control at random points so requests interleave.
+        await asyncio.sleep(random.random() / 1000)
+        yield FakeSession(int(request.query_params["n"]))
+        await asyncio.sleep(random.random() / 1000)
+
+    @app.get("/")
+    async def handler(
+        task_service: TaskService = Depends(get_task_service),  # pyright: ignore[reportCallInDefaultInitializer]
+        auth_service: AuthService = Depends(get_auth_service),  # pyright: ignore[reportCallInDefaultInitializer]
+    ) -> dict[str, int]:
+        await asyncio.sleep(random.random() / 1000)
+        task_db = cast(TaskSQLRepository, task_service.task_repository).db
+        auth_db = cast(AuthSQLRepository, auth_service.repository).db
+        return {
+            "task_session": cast(FakeSession, task_db).request_no,
+            "auth_session": cast(FakeSession, auth_db).request_no,
+        }
+
+    app.dependency_overrides[get_db_session] = session_per_request
+    return app
+
+
+@pytest.mark.asyncio
+class TestRequestContainer:
+    async def test_interleaved_requests_use_their_own_session(self):
+        transport = ASGITransport(app=make_app())
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            responses = await asyncio.gather(
+                *(client.get("/", params={"n": n}) for n in range(300))
+            )
+
+        for n, response in enumerate(responses):
+            assert response.json() == {"task_session": n, "auth_session": n}
+
+    async def test_services_are_built_once_per_container(self):
+        container = RequestContainer(db=cast(AsyncSession, FakeSession(1)))
+
+        assert container.task_service is container.task_service
+        assert container.auth_service is container.auth_service
+        assert not hasattr(container, "__dict__")
@@ -0,0 +1,72 @@
+import json
+import threading
+from pathlib import Path
+from unittest.mock import patch
+from app.utils import main_logger
+from app.utils.logging import BatchedJsonSink, redact_text
+
+
+def attach(sink: BatchedJsonSink) -> int:
+    return main_logger.add(
+        sink,  # pyright: ignore[reportArgumentType]
+        format="{message}",
+        filter=lambda record: record["extra"].get("sink_id") == id(sink),
+    )
+
+
+class TestBatchedJsonSink:
+    def test_writes_json_lines_and_flushes_on_stop(self, tmp_path: Path):
+        path = tmp_path / "json.log"
+        sink = BatchedJsonSink(str(path))
+        handler_id = attach(sink)
+
+        for i in range(50):
+            main_logger.bind(sink_id=id(sink), n=i).info(f"message {i}")
+        main_logger.remove(handler_id)  # Calls sink.stop()
+
+        lines = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [line["message"] for line in lines] == [f"message {i}" for i in range(50)]
+        assert lines[0]["level"] == "INFO"
+        assert lines[0]["extra"]["n"] == 0
+
+    def test_full_queue_drops_instead_of_blocking(self, tmp_path: Path):
+        sink = BatchedJsonSink(str(tmp_path / "json.log"), max_queue=2)
+        release = threading.Event()
+        handler_id = attach(sink)
+
+        with patch.object(sink, "_write", side_effect=lambda _: release.wait(5)):
+            for i in range(20):
+                main_logger.bind(sink_id=id(sink)).info(f"message {i}")
+            dropped = sink.dropped
+            release.set()
+            main_logger.remove(handler_id)
+
+        # The stuck writer holds at most two records and the queue two more.
+        assert dropped >= 20 - 4
+
+    def test_rotates_by_size(self, tmp_path: Path):
+        path = tmp_path / "json.log"
+        sink = BatchedJsonSink(str(path), max_bytes=200, backup_count=2, batch_size=1)
+        handler_id = attach(sink)
+
+        for i in range(20):
+            main_logger.bind(sink_id=id(sink)).info(f"message {i}")
+        main_logger.remove(handler_id)
+
+        assert (tmp_path / "json.log.1").exists()
+        assert (tmp_path / "json.log.2").exists()
+        assert not (tmp_path / "json.log.3").exists()
+
+
+class TestRedactText:
+    def test_masks_sensitive_members(self):
+        text = '{"username":"a","password":"p","token":{"access_token":"t"}}'
+
+        assert redact_text(text) == (
+            '{"username":"a","password":"***","token":{"access_token":"[REDACTED]"}}'
+        )
+
+    def test_masks_value_cut_by_truncation(self):
+        assert redact_text('{"refresh_token":"eyJhbGciOi') == (
+            '{"refresh_token":"[REDACTED]"'
+        )
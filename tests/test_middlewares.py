@@ -0,0 +1,95 @@
+from collections.abc import AsyncIterator, Iterator
+from typing import Any
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.testclient import TestClient
+from app.middlewares import LoggingMiddleware
+from app.utils import main_logger
+
+# loguru only exposes its Record type to type checkers
+Record = dict[str, Any]  # pyright: ignore[reportExplicitAny]
+
+
+def make_app(**options: object) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/stream")
+    async def stream() -> StreamingResponse:
+        async def chunks() -> AsyncIterator[bytes]:
+            for i in range(5):
+                yield f"chunk-{i};".encode()
+
+        return StreamingResponse(chunks())
+
+    @app.post("/fail")
+    async def fail() -> JSONResponse:
+        return JSONResponse(
+            status_code=400, content={"error": "bad", "password": "hunter2"}
+        )
+
+    @app.get("/boom")
+    async def boom() -> JSONResponse:
+        return JSONResponse(status_code=503, content={"error": "down"})
+
+    app.add_middleware(LoggingMiddleware, **options)  # pyright: ignore[reportArgumentType]
+    return app
+
+
+@pytest.fixture
+def records() -> Iterator[list[Record]]:
+    captured: list[Record] = []
+    handler_id = main_logger.add(
+        lambda message: captured.append(message.record),  # pyright: ignore[reportAttributeAccessIssue, reportUnknownMemberType, reportUnknownArgumentType, reportUnknownLambdaType]
+        format="{message}",
+    )
+    yield captured
+    main_logger.remove(handler_id)
+
+
+def responses(records: list[Record]) -> list[Record]:
+    return [r for r in records if r["message"].startswith("Response sent")]
+
+
+class TestLoggingMiddleware:
+    def test_streaming_body_passes_through_and_is_capped(self, records: list[Record]):
+        client = TestClient(make_app(body_max_bytes=10, body_routes=["/stream"]))
+
+        response = client.get("/stream", headers={"Authorization": "Bearer secret"})
+
+        assert response.text == "".join(f"chunk-{i};" for i in range(5))
+        [incoming] = [r for r in records if r["message"] == "Incoming request"]
+        assert incoming["extra"]["headers"]["authorization"] == "[REDACTED]"
+        [sent] = responses(records)
+        assert "Response sent: chunk-0;ch..." in sent["message"]
+        assert sent["extra"]["req_id"] == incoming["extra"]["req_id"]
+
+    def test_error_bodies_are_logged_redacted(self, records: list[Record]):
+        client = TestClient(make_app())
+
+        _ = client.post("/fail", json={"username": "a", "password": "p4ss"})
+
+        [sent] = responses(records)
+        assert sent["extra"]["status_code"] == 400
+        assert '"password":"***"' in sent["message"]
+        assert "hunter2" not in sent["message"]
+        assert "p4ss" not in sent["message"]
+
+    def test_success_bodies_are_not_logged(self, records: list[Record]):
+        client = TestClient(make_app())
+
+        _ = client.get("/stream")
+
+        [sent] = responses(records)
+        assert sent["message"] == "Response sent"
+
+    def test_unsampled_requests_only_log_failures(self, records: list[Record]):
+        client = TestClient(make_app(sample_rate=0.0))
+
+        _ = client.get("/stream")
+        _ = client.get("/boom")
+
+        [sent] = responses(records)
+        assert sent["extra"]["status_code"] == 503
+        assert sent["level"].name == "ERROR"
+        assert not [r for r in records if r["message"] == "Incoming request"]
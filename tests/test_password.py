@@ -0,0 +1,111 @@
+import asyncio
+import threading
+from unittest.mock import AsyncMock, patch
+import pytest
+from zxcvbn import zxcvbn
+from app.utils import password_validator
+from app.utils.auth.password import WorkerPool
+
+
+@pytest.mark.asyncio
+class TestWorkerPool:
+    async def test_hash_and_verify_round_trip(self):
+        hashed = await password_validator.get_password_hash("s3cure-Passw0rd")
+
+        assert hashed.startswith("$argon2id$")
+        assert await password_validator.verify_password("s3cure-Passw0rd", hashed)
+        assert not await password_validator.verify_password("wrong", hashed)
+
+    async def test_work_runs_off_the_event_loop_thread(self):
+        pool = WorkerPool(max_workers=1, thread_name_prefix="argon2")
+
+        name = await pool.run(lambda: threading.current_thread().name)
+
+        assert name.startswith("argon2")
+        assert name != threading.current_thread().name
+
+    async def test_concurrency_is_capped_and_excess_is_queued(self):
+        pool = WorkerPool(max_workers=2, thread_name_prefix="argon2")
+        release = threading.Event()
+        snapshots: list[dict[str, int]] = []
+
+        calls = [asyncio.ensure_future(pool.run(release.wait, 5)) for _ in range(5)]
+        while pool.snapshot()["running"] < 2:
+            await asyncio.sleep(0.005)
+        snapshots.append(pool.snapshot())
+        release.set()
+        _ = await asyncio.gather(*calls)
+
+        assert snapshots[0]["running"] == 2
+        assert snapshots[0]["queued"] == 3
+        after = pool.snapshot()
+        assert (after["running"], after["queued"], after["completed"]) == (0, 0, 5)
+        assert after["max_queued"] >= 3
+
+    async def test_event_loop_keeps_ticking_while_hashing(self):
+        pool = WorkerPool(max_workers=1, thread_name_prefix="argon2")
+        ticks = 0
+
+        def slow_hash() -> None:
+            threading.Event().wait(0.1)
+
+        async def ticker() -> None:
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.005)
+                ticks += 1
+
+        ticking = asyncio.create_task(ticker())
+        await pool.run(slow_hash)
+        _ = ticking.cancel()
+
+        assert ticks >= 5
+
+
+@pytest.mark.asyncio
+class TestValidatePassword:
+    async def test_strong_password_passes(self):
+        validation = await password_validator.validate_password(
+            password="violet-Harbor-93-lantern", username="alice", email="alice@x.io"
+        )
+
+        assert validation["is_valid"]
+        assert validation["score"] >= password_validator.min_score
+
+    async def test_cheap_failures_skip_zxcvbn(self):
+        run = AsyncMock()
+        with patch.object(password_validator.strength_pool, "run", run):
+            common = await password_validator.validate_password(
+                password="Password", username="alice", email="alice@x.io"
+            )
+            similar = await password_validator.validate_password(
+                password="alice.smith", username="alice.smith", email="a@x.io"
+            )
+            too_long = await password_validator.validate_password(
+                password="x" * 129, username="alice", email="alice@x.io"
+            )
+
+        run.assert_not_awaited()
+        assert common["errors"] == ["Password is too common"]
+        assert similar["errors"][0].startswith("Password is too similar to username")
+        assert too_long["errors"] == ["Password must be at most 128 characters"]
+
+    async def test_zxcvbn_sees_a_capped_prefix(self):
+        with patch("app.utils.auth.password.zxcvbn", wraps=zxcvbn) as spy:
+            validation = await password_validator.validate_password(
+                password="k7#Vq!2mZr@9Lx$4pW&8nB*3tY^6hJ%1cF" * 3,
+                username="alice",
+                email="alice@x.io",
+            )
+
+        assert validation["is_valid"]
+        [call] = spy.call_args_list
+        assert len(call.args[0]) == password_validator.max_strength_length
+
+    async def test_weak_password_is_rejected(self):
+        validation = await password_validator.validate_password(
+            password="aaaaaaaaaa", username="alice", email="alice@x.io"
+        )
+
+        assert not validation["is_valid"]
+        assert validation["errors"][0].startswith("Password is too weak")
@@ -0,0 +1,171 @@
+import asyncio
+import math
+import time
+from collections.abc import Iterator
+from typing import cast
+from unittest.mock import MagicMock
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from redis.asyncio import Redis
+from app.core.revocation import BloomFilter, RevocationList, revocation_list
+from app.middlewares import jwt_decoder
+from app.core import UnauthorizedException
+from app.repositories.base_repository import BaseAuthRepository
+from app.services import AuthService
+from app.utils import jwt_auth_token
+
+
+def make_list(redis: MagicMock | None = None) -> RevocationList:
+    revocations = RevocationList(
+        capacity=1000, error_rate=0.001, channel="auth:revoked", sync_interval=60
+    )
+    revocations.attach(cast(Redis, redis))
+    return revocations
+
+
+class TestBloomFilter:
+    def test_no_false_negatives_and_few_false_positives(self):
+        bloom = BloomFilter(capacity=10_000, error_rate=0.01)
+        for i in range(10_000):
+            bloom.add(f"jti-{i}")
+
+        assert all(f"jti-{i}" in bloom for i in range(10_000))
+        false_positives = sum(f"other-{i}" in bloom for i in range(10_000))
+        assert false_positives < 200
+
+
+@pytest.mark.asyncio
+class TestRevocationList:
+    async def test_local_only_fallback(self):
+        revocations = make_list()
+
+        await revocations.revoke("a", exp=time.time() + 60)
+
+        assert await revocations.is_revoked("a")
+        assert not await revocations.is_revoked("b")
+        assert not await revocations.is_revoked(None)
+
+    async def test_expired_tokens_are_not_recorded(self):
+        revocations = make_list()
+
+        await revocations.revoke("a", exp=time.time() - 1)
+
+        assert not await revocations.is_revoked("a")
+        assert revocations.filter.count == 0
+
+    async def test_filter_negative_skips_redis(self, mock_redis: MagicMock):
+        revocations = make_list(mock_redis)
+
+        assert not await revocations.is_revoked("never-revoked")
+
+        mock_redis.exists.assert_not_awaited()
+
+    async def test_positive_is_confirmed_against_exact_key(self, mock_redis: MagicMock):
+        revocations = make_list(mock_redis)
+        exp = time.time() + 60
+
+        await revocations.revoke("a", exp=exp)
+        pipe = mock_redis.pipeline.return_value
+        pipe.set.assert_called_once_with("revoked:a", 1, exat=math.ceil(exp))
+        pipe.zadd.assert_called_once_with("revoked:index", {"a": exp})
+        pipe.publish.assert_called_once_with("auth:revoked", "a")
+
+        # Redis is the source of truth once the filter says "maybe".
+        assert not await revocations.is_revoked("a")
+        mock_redis.exists.assert_awaited_once_with("revoked:a")
+
+    async def test_sync_learns_other_workers_revocations(self, mock_redis: MagicMock):
+        mock_redis.pipeline.return_value.execute.return_value = [0, ["from-another-worker"]]
+        mock_redis.exists.return_value = 1
+        revocations = make_list(mock_redis)
+
+        await revocations.sync()
+
+        assert await revocations.is_revoked("from-another-worker")
+
+    async def test_overflow_rebuild_keeps_ids_learned_from_redis(self, mock_redis: MagicMock):
+        mock_redis.pipeline.return_value.execute.return_value = [0, ["from-another-worker"]]
+        mock_redis.exists.return_value = 1
+        revocations = RevocationList(
+            capacity=2, error_rate=0.001, channel="auth:revoked", sync_interval=60
+        )
+        revocations.attach(cast(Redis, mock_redis))
+        await revocations.sync()
+        exp = time.time() + 60
+        await revocations.revoke("a", exp=exp)
+        # The index now also holds this worker's revocations.
+        mock_redis.pipeline.return_value.execute.return_value = [
+            0,
+            ["from-another-worker", "a", "b"],
+        ]
+
+        await revocations.revoke("b", exp=exp)
+
+        assert all([await revocations.is_revoked(jti) for jti in ("from-another-worker", "a", "b")])
+        assert revocations.filter.count == 3
+
+
+@pytest.fixture
+def client() -> Iterator[TestClient]:
+    app = FastAPI()
+
+    @app.get("/me")
+    async def me(request: Request) -> dict[str, str | None]:
+        user = request.state.user  # pyright: ignore[reportAny]
+        return {"username": user["username"] if user else None}
+
+    _ = app.middleware("http")(jwt_decoder)
+    yield TestClient(app)
+
+
+class TestJwtDecoderRevocation:
+    def test_revoked_token_is_rejected_even_when_cached(self, client: TestClient):
+        token, _ = jwt_auth_token.access_token(
+            data={"username": "alice", "email": "alice@x.io"}
+        )
+        headers = {"Authorization": f"Bearer {token}"}
+        assert client.get("/me", headers=headers).json() == {"username": "alice"}
+
+        payload = jwt_auth_token.decode_token(token)
+        asyncio.run(revocation_list.revoke(payload["jti"], exp=float(payload["exp"])))
+        response = client.get("/me", headers=headers)
+
+        assert response.status_code == 401
+        assert response.json() == {"error": "Token has been revoked"}
+
+    def test_fresh_tokens_have_distinct_jti(self):
+        data = {"username": "alice", "email": "alice@x.io"}
+        first, _ = jwt_auth_token.access_token(data=data)  # pyright: ignore[reportArgumentType]
+        second, _ = jwt_auth_token.access_token(data=data)  # pyright: ignore[reportArgumentType]
+
+        assert (
+            jwt_auth_token.decode_token(first)["jti"]
+            != jwt_auth_token.decode_token(second)["jti"]
+        )
+
+
+@pytest.mark.asyncio
+class TestLogOut:
+    async def test_revokes_access_and_refresh_tokens(self):
+        service = AuthService(repository=MagicMock(spec=BaseAuthRepository))
+        data = {"username": "bob", "email": "bob@x.io", "uid": 2}
+        access, _ = jwt_auth_token.access_token(data=data)  # pyright: ignore[reportArgumentType]
+        refresh, _ = jwt_auth_token.refresh_token(data=data)  # pyright: ignore[reportArgumentType]
+        access_payload = jwt_auth_token.decode_token(access)
+
+        await service.log_out(access_payload, refresh_token=refresh)  # pyright: ignore[reportArgumentType]
+
+        assert await revocation_list.is_revoked(access_payload["jti"])
+        assert await revocation_list.is_revoked(jwt_auth_token.decode_token(refresh)["jti"])
+        with pytest.raises(UnauthorizedException) as exc_info:
+            _ = await service.get_access_token(token_string=refresh)
+        assert exc_info.value.message == "Token has been revoked"
+
+    async def test_rejects_another_users_refresh_token(self):
+        service = AuthService(repository=MagicMock(spec=BaseAuthRepository))
+        access, _ = jwt_auth_token.access_token(data={"username": "bob", "email": "b@x.io"})
+        refresh, _ = jwt_auth_token.refresh_token(data={"username": "eve", "email": "e@x.io"})
+
+        with pytest.raises(UnauthorizedException):
+            await service.log_out(jwt_auth_token.decode_token(access), refresh_token=refresh)  # pyright: ignore[reportArgumentType]
@@ -1,6 +1,17 @@
 import pytest
+from fastapi import FastAPI, Request
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.inmemory import InMemoryBackend
 from app.main import app
+from app.core import AppException, get_current_user, get_task_service
 from app.core.db import AsyncSessionLocal
+from app.middlewares import app_exception_handler
+from app.repositories import TaskInMemoryRepository
+from app.repositories.in_memory_repository import DictTaskStore
+from app.routers import task_router
+from app.schemas import CurrentUser
+from app.services import TaskService
+from app.utils import jwt_auth_token
 from fastapi.testclient import TestClient
 
 
@@ -63,12 +74,14 @@ class TestTaskRoutes:
         response = client.get("/tasks/")
         assert response.status_code == 200
         data = response.json()
-        assert isinstance(data, list)
-        assert len(data) >= 1  # At least one task should exist from previous test
-        assert "title" in data[0]
-        assert "description" in data[0] or data[0]["description"] is None
-        assert "status" in data[0]
-        assert "id" in data[0]
+        assert isinstance(data["items"], list)
+        assert "next_cursor" in data
+        items = data["items"]
+        assert len(items) >= 1  # At least one task should exist from previous test
+        assert "title" in items[0]
+        assert "description" in items[0] or items[0]["description"] is None
+        assert "status" in items[0]
+        assert "id" in items[0]
 
     def test_get_task(self, client, created_task):
         task_id = created_task["id"]
@@ -155,3 +168,179 @@ class TestTaskRoutes:
         assert response.status_code == 422  # Unprocessable Entity
         data = response.json()
         assert data["detail"][0]["loc"] == ["body", "title"]
+
+
+@pytest.fixture
+def list_client():
+    # The task router alone, over an in-memory repository and cache, as an
+    # authenticated user.
+    list_app = FastAPI()
+    list_app.include_router(router=task_router)
+    list_app.add_exception_handler(AppException, app_exception_handler)  # pyright: ignore[reportArgumentType]
+    user = CurrentUser(id=515151, username="list-user", email="list@example.com")
+
+    @list_app.middleware("http")
+    async def authenticate(request: Request, call_next):  # pyright: ignore[reportMissingParameterType, reportUnknownParameterType]
+        request.state.user = {"username": user.username, "uid": user.id}
+        return await call_next(request)  # pyright: ignore[reportUnknownVariableType]
+
+    repository = TaskInMemoryRepository(store=DictTaskStore())
+    list_app.dependency_overrides[get_current_user] = lambda: user
+    list_app.dependency_overrides[get_task_service] = lambda: TaskService(repository)
+    FastAPICache.init(backend=InMemoryBackend(), prefix="test-list", expire=60)
+    titles = ["banana", "apple", "cherry", "apricot", "blueberry"]
+    with TestClient(list_app) as c:
+        for n, title in enumerate(titles):
+            _ = c.post(
+                "/tasks/",
+                json={
+                    "title": title,
+                    "description": "x" * 1000,
+                    "status": "completed" if n % 2 else "pending",
+                },
+            )
+        yield c
+    FastAPICache.reset()
+
+
+class TestTaskListQuery:
+    def test_filters_sort_and_projection(self, list_client: TestClient):
+        response = list_client.get(
+            "/tasks/",
+            params={"title_prefix": "a", "sort": "-title", "fields": "status,title"},
+        )
+
+        assert response.status_code == 200
+        assert response.json()["items"] == [
+            {"id": 4, "title": "apricot", "status": "completed"},
+            {"id": 2, "title": "apple", "status": "completed"},
+        ]
+
+    def test_status_filter(self, list_client: TestClient):
+        response = list_client.get("/tasks/", params={"status": "pending"})
+
+        assert [task["title"] for task in response.json()["items"]] == [
+            "banana",
+            "cherry",
+            "blueberry",
+        ]
+        assert "description" in response.json()["items"][0]
+
+    def test_title_sorted_pages_follow_the_cursor(self, list_client: TestClient):
+        titles: list[str] = []
+        params: dict[str, str | int] = {"sort": "title", "limit": 2, "fields": "title"}
+        while True:
+            data = list_client.get("/tasks/", params=params).json()
+            titles += [task["title"] for task in data["items"]]
+            if data["next_cursor"] is None:
+                break
+            params["after"] = data["next_cursor"]
+
+        assert titles == ["apple", "apricot", "banana", "blueberry", "cherry"]
+
+    def test_id_pages_follow_the_cursor(self, list_client: TestClient):
+        ids: list[int] = []
+        params: dict[str, str | int] = {"limit": 2}
+        while True:
+            response = list_client.get("/tasks/", params=params)
+            assert response.status_code == 200
+            assert len(response.json()["items"]) <= 2
+            ids += [task["id"] for task in response.json()["items"]]
+            if response.json()["next_cursor"] is None:
+                break
+            params["after"] = response.json()["next_cursor"]
+
+        assert ids == [1, 2, 3, 4, 5]
+
+    def test_malformed_cursor_is_rejected(self, list_client: TestClient):
+        response = list_client.get("/tasks/", params={"after": "not-a-cursor"})
+
+        assert response.status_code == 400
+
+    def test_cursor_of_another_sort_is_rejected(self, list_client: TestClient):
+        cursor = list_client.get("/tasks/", params={"sort": "title", "limit": 1}).json()[
+            "next_cursor"
+        ]
+
+        response = list_client.get("/tasks/", params={"sort": "-title", "after": cursor})
+
+        assert response.status_code == 400
+
+    def test_unknown_field_is_a_validation_error(self, list_client: TestClient):
+        response = list_client.get("/tasks/", params={"fields": "title,secret"})
+
+        assert response.status_code == 422
+
+
+class TestTaskBatchUpdate:
+    def test_null_for_a_required_field_is_a_validation_error(self, list_client: TestClient):
+        response = list_client.patch("/tasks/batch", json={"tasks": [{"id": 1, "title": None}]})
+
+        assert response.status_code == 422
+        assert response.json()["detail"][0]["loc"] == ["body", "tasks", 0, "title"]
+
+    def test_omitted_fields_are_left_unchanged(self, list_client: TestClient):
+        response = list_client.patch(
+            "/tasks/batch", json={"tasks": [{"id": 1, "description": None}]}
+        )
+
+        assert response.status_code == 200
+        assert list_client.get("/tasks/1").json()["title"] == "banana"
+
+
+class TestTaskSearch:
+    def test_ranked_pages_follow_the_cursor(self, list_client: TestClient):
+        titles: list[str] = []
+        params: dict[str, str | int] = {"q": "AP", "limit": 1}
+        while True:
+            response = list_client.get("/tasks/search", params=params)
+            assert response.status_code == 200
+            titles += [task["title"] for task in response.json()["items"]]
+            if response.json()["next_cursor"] is None:
+                break
+            params["after"] = response.json()["next_cursor"]
+
+        assert titles == ["apple", "apricot"]
+
+    def test_query_is_required_and_list_cursors_are_rejected(self, list_client: TestClient):
+        cursor = list_client.get("/tasks/", params={"sort": "title", "limit": 1}).json()[
+            "next_cursor"
+        ]
+
+        assert list_client.get("/tasks/search").status_code == 422
+        assert list_client.get("/tasks/search", params={"q": "ap", "after": cursor}).status_code == 400
+        assert list_client.get("/tasks/search", params={"q": "?!"}).json()["items"] == []
+
+
+class TestTaskStats:
+    def test_counts_follow_writes(self, list_client: TestClient):
+        assert list_client.get("/tasks/stats").json() == {
+            "pending": 3,
+            "in_progress": 0,
+            "completed": 2,
+            "total": 5,
+        }
+
+        _ = list_client.patch("/tasks/1", json={"title": "banana", "status": "in-progress"})
+        _ = list_client.delete("/tasks/2")
+
+        assert list_client.get("/tasks/stats").json() == {
+            "pending": 2,
+            "in_progress": 1,
+            "completed": 1,
+            "total": 4,
+        }
+
+
+class TestDbMetrics:
+    def test_pool_stats_are_mounted_behind_auth(self):
+        # Mounted whatever `features.enable_debug_routes` says.
+        client = TestClient(app)
+        token, _ = jwt_auth_token.access_token(
+            data={"username": "ops", "email": "ops@example.com"}
+        )
+
+        assert client.get("/metrics/db").status_code == 401
+        response = client.get("/metrics/db", headers={"Authorization": f"Bearer {token}"})
+        assert response.status_code == 200
+        assert "checked_out" in response.json()
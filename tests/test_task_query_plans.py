@@ -0,0 +1,90 @@
+from collections.abc import Iterator
+from unittest.mock import Mock
+import pytest
+from sqlalchemy import Engine, create_engine, text
+from sqlalchemy.sql import Executable
+from sqlmodel import SQLModel
+from app.repositories import TaskSQLRepository
+from app.schemas import TaskListQuery
+
+
+@pytest.fixture(scope="module")
+def plan_engine() -> Iterator[Engine]:
+    # Fresh schema built from the model metadata, so the plans reflect the
+    # indexes declared on TaskModel.
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+def query_plan(engine: Engine, statement: Executable) -> list[str]:
+    compiled = statement.compile(
+        dialect=engine.dialect, compile_kwargs={"literal_binds": True}
+    )
+    with engine.connect() as conn:
+        rows = conn.execute(text(f"EXPLAIN QUERY PLAN {compiled}")).all()
+    return [str(row[-1]) for row in rows]
+
+
+def assert_no_table_scan(plan: list[str]) -> None:
+    assert not any(
+        step.startswith("SCAN tasks") for step in plan
+    ), f"tasks query fell back to a full scan: {plan}"
+    assert any(step.startswith("SEARCH tasks USING") for step in plan), plan
+
+
+@pytest.mark.asyncio
+class TestTaskQueryPlans:
+    @pytest.mark.parametrize("after", [None, 10])
+    async def test_list_query_uses_user_index(
+        self, plan_engine: Engine, task_mock_session: Mock, after: int | None
+    ):
+        task_mock_session.exec.return_value = Mock(all=Mock(return_value=[]))
+        repository = TaskSQLRepository(task_mock_session)
+
+        _ = await repository.get_all_tasks(user_id=1, after=after, limit=50)
+
+        plan = query_plan(plan_engine, task_mock_session.exec.call_args[0][0])
+        assert_no_table_scan(plan)
+        # The seek must be driven by user_id; a primary-key range search
+        # still walks every other user's rows.
+        assert any("user_id=?" in step for step in plan), plan
+        # The ORDER BY id must be satisfied by the index, not a sort step.
+        assert not any("TEMP B-TREE" in step for step in plan), plan
+
+    @pytest.mark.parametrize(
+        "query",
+        [
+            TaskListQuery(status="completed"),
+            TaskListQuery(sort="-title", fields="title"),
+            TaskListQuery(title_prefix="Wee", sort="title"),
+        ],
+    )
+    async def test_filtered_and_sorted_lists_use_an_index(
+        self, plan_engine: Engine, task_mock_session: Mock, query: TaskListQuery
+    ):
+        task_mock_session.exec.return_value = Mock(
+            all=Mock(return_value=[]), mappings=Mock(return_value=[])
+        )
+        repository = TaskSQLRepository(task_mock_session)
+
+        _ = await repository.get_all_tasks(
+            user_id=1, after=10, after_value="M", limit=50, query=query
+        )
+
+        plan = query_plan(plan_engine, task_mock_session.exec.call_args[0][0])
+        assert_no_table_scan(plan)
+        assert not any("TEMP B-TREE" in step for step in plan), plan
+
+    async def test_lookup_by_id_is_scoped_to_user(
+        self, plan_engine: Engine, task_mock_session: Mock
+    ):
+        task_mock_session.exec.return_value = Mock(one=Mock(return_value=Mock()))
+        repository = TaskSQLRepository(task_mock_session)
+
+        _ = await repository.get_task_by_id(user_id=1, task_id=10)
+
+        statement = task_mock_session.exec.call_args[0][0]
+        assert "tasks.user_id" in str(statement)
+        assert_no_table_scan(query_plan(plan_engine, statement))
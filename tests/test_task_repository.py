@@ -1,16 +1,31 @@
+import asyncio
 from typing import cast
 import pytest
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
+from sqlalchemy.dialects import postgresql
 from sqlmodel import delete, select
+from app.core import AppException, NotFoundException
+from app.core.pagination import decode_cursor, encode_cursor
 from app.repositories import (
     TaskSQLRepository,
     TaskInMemoryRepository,
     AuthInMemoryRepository,
     AuthSQLRepository,
 )
-from app.schemas import TaskCreate, TaskUpdate, Task, User, UserCreate
+from app.schemas import (
+    TaskBatchUpdateItem,
+    TaskCreate,
+    TaskListQuery,
+    TaskSort,
+    TaskUpdate,
+    Task,
+    User,
+    UserCreate,
+)
+from app.schemas.task_schemas import TaskStatus
 from tests.conftest import TaskTyped, UserTyped
 from collections.abc import Awaitable
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 
 @pytest.fixture
@@ -286,9 +301,12 @@ class TestTaskSQLRepository:
         # Verify the query is a select on Task.__table__
         assert task_mock_session.exec.call_count >= 1
         query = task_mock_session.exec.call_args[0][0]
-        assert query == str(
-            select(Task).where(Task.user_id == cast(int, user.id))
-        ), f"Expected query {select(Task).where(Task.user_id==cast(int,user.id))}, got {query}"
+        expected_query = (
+            select(Task).where(Task.user_id == cast(int, user.id)).order_by(Task.id)
+        )
+        assert str(query) == str(
+            expected_query
+        ), f"Expected query {expected_query}, got {query}"
         assert len(tasks) >= 1
         assert tasks[0].title == task["title"]
 
@@ -329,148 +347,205 @@ class TestTaskSQLRepository:
         assert task is None
 
     async def test_update_task(
-        self, task_repository, task_mock_session, mock_task, create_user
+        self, sqlite_session: AsyncSession, sqlite_user: User, mock_task: TaskTyped
     ):
-        user = await create_user
-        task_ = mock_task
-        mock_tasked = Task(
-            id=task_["id"],
-            title=task_["title"],
-            description=task_["description"],
-            status=task_["status"],
+        repository = TaskSQLRepository(sqlite_session)
+        created_task = await repository.create_task(
+            user_id=cast(int, sqlite_user.id),
+            task_create=TaskCreate(title="Original title", status="pending"),
         )
-        task_updated = mock_task
         task_update = TaskUpdate(
-            title=task_updated["title"],
-            description=task_updated["description"],
-            status=task_updated["status"],
+            title=mock_task["title"],
+            description=mock_task["description"],
+            status=mock_task["status"],
         )
-        task_mock_session.get.return_value = mock_tasked
 
-        updated_task = await task_repository.update_task(
-            user_id=cast(int, user.id), task_id=task_["id"], task_update=task_update
+        task_id = cast(int, created_task.id)
+
+        updated_task = await repository.update_task(
+            user_id=cast(int, sqlite_user.id), task_id=task_id, task_update=task_update
         )
 
-        task_mock_session.add.assert_called_once_with(mock_tasked)
-        task_mock_session.commit.assert_called_once()
-        task_mock_session.refresh.assert_called_once_with(mock_tasked)
-        assert updated_task.title == task_updated["title"]
-        assert updated_task.description == task_updated["description"]
-        assert updated_task.status == task_updated["status"]
+        assert updated_task.id == task_id
+        assert updated_task.title == mock_task["title"]
+        assert updated_task.description == mock_task["description"]
+        assert updated_task.status == mock_task["status"]
 
     async def test_update_task_not_found(
-        self, task_repository, task_mock_session, mock_task, create_user
+        self, sqlite_session: AsyncSession, sqlite_user: User, mock_task: TaskTyped
     ):
-        user = await create_user
-        task_mock_session.get.return_value = None
-        task_updated = mock_task
-        task_update = TaskUpdate(title=task_updated["title"])
+        repository = TaskSQLRepository(sqlite_session)
+        task_update = TaskUpdate(title=mock_task["title"])
+
+        with pytest.raises(NotFoundException):
+            _ = await repository.update_task(
+                user_id=cast(int, sqlite_user.id), task_id=9999, task_update=task_update
+            )
 
-        updated_task = await task_repository.update_task(
-            user_id=cast(int, user.id), task_id=9999, task_update=task_update
+    async def test_update_task_of_another_user_not_found(
+        self, sqlite_session: AsyncSession, sqlite_user: User
+    ):
+        repository = TaskSQLRepository(sqlite_session)
+        created_task = await repository.create_task(
+            user_id=cast(int, sqlite_user.id),
+            task_create=TaskCreate(title="Owned task", status="pending"),
         )
 
-        task_mock_session.add.assert_not_called()
-        task_mock_session.commit.assert_not_called()
-        task_mock_session.refresh.assert_not_called()
-        assert updated_task is None
+        with pytest.raises(NotFoundException):
+            _ = await repository.update_task(
+                user_id=cast(int, sqlite_user.id) + 1,
+                task_id=cast(int, created_task.id),
+                task_update=TaskUpdate(title="Hijacked"),
+            )
 
-    async def test_partial_update_task(
-        self, task_repository, task_mock_session, mock_task, create_user
+    async def test_update_task_without_returning(
+        self, sqlite_session: AsyncSession, sqlite_user: User
     ):
-        user = await create_user
-        task_ = mock_task
-        mock_tasked = Task(
-            id=task_["id"],
-            title=task_["title"],
-            description=task_["description"],
-            status=task_["status"],
+        repository = TaskSQLRepository(sqlite_session)
+        created_task = await repository.create_task(
+            user_id=cast(int, sqlite_user.id),
+            task_create=TaskCreate(title="Original title", status="pending"),
         )
-        task_updated = mock_task
-        task_update = TaskUpdate(description=task_updated["description"])
-        task_mock_session.get.return_value = mock_tasked
 
-        updated_task = await task_repository.partial_update_task(
-            user_id=cast(int, user.id), task_id=task_["id"], task_update=task_update
+        with patch.object(
+            sqlite_session.get_bind().dialect, "update_returning", False
+        ):
+            updated_task = await repository.update_task(
+                user_id=cast(int, sqlite_user.id),
+                task_id=cast(int, created_task.id),
+                task_update=TaskUpdate(title="Fallback title", status="completed"),
+            )
+            with pytest.raises(NotFoundException):
+                _ = await repository.update_task(
+                    user_id=cast(int, sqlite_user.id),
+                    task_id=9999,
+                    task_update=TaskUpdate(title="Missing"),
+                )
+
+        assert updated_task.title == "Fallback title"
+        assert updated_task.status == "completed"
+
+    async def test_postgres_status_update_is_one_statement(
+        self, task_repository: TaskSQLRepository, task_mock_session: Mock
+    ):
+        task_mock_session.get_bind = Mock(return_value=Mock(dialect=postgresql.dialect()))
+        row = {
+            "id": 7,
+            "title": "Done",
+            "description": None,
+            "status": TaskStatus.COMPLETED,
+            "user_id": 1,
+            "previous_status": TaskStatus.PENDING,
+        }
+        task_mock_session.exec.return_value = Mock(
+            mappings=Mock(return_value=Mock(one_or_none=Mock(return_value=row)))
         )
 
-        task_mock_session.add.assert_called_once_with(mock_tasked)
-        task_mock_session.commit.assert_called_once()
-        task_mock_session.refresh.assert_called_once_with(mock_tasked)
-        assert updated_task.description == task_updated["description"]
-        assert updated_task.title == task_["title"]
-        assert updated_task.status == task_["status"]
+        task = await task_repository.update_task(
+            user_id=1, task_id=7, task_update=TaskUpdate(title="Done", status="completed")
+        )
 
-    async def test_partial_update_task_not_found(
-        self, task_repository, task_mock_session, create_user
+        update_sql = str(
+            task_mock_session.exec.call_args_list[0][0][0].compile(dialect=postgresql.dialect())
+        )
+        assert update_sql.startswith('WITH "old" AS') and "FOR UPDATE" in update_sql
+        assert '"old".status AS previous_status' in update_sql
+        # The UPDATE, then the counter upsert; no separate SELECT.
+        assert task_mock_session.exec.call_count == 2
+        assert task.status == TaskStatus.COMPLETED
+
+    async def test_partial_update_task(
+        self, sqlite_session: AsyncSession, sqlite_user: User, mock_task: TaskTyped
     ):
-        user = await create_user
-        task_mock_session.get.return_value = None
-        task_update = TaskUpdate(description="New description")
+        repository = TaskSQLRepository(sqlite_session)
+        created_task = await repository.create_task(
+            user_id=cast(int, sqlite_user.id),
+            task_create=TaskCreate(
+                title=mock_task["title"],
+                description="Old description",
+                status=mock_task["status"],
+            ),
+        )
+        task_update = TaskUpdate.model_construct(description="New description")
 
-        updated_task = await task_repository.partial_update_task(
-            user_id=cast(int, user.id), task_id=9999, task_update=task_update
+        updated_task = await repository.partial_update_task(
+            user_id=cast(int, sqlite_user.id),
+            task_id=cast(int, created_task.id),
+            task_update=task_update,
         )
 
-        task_mock_session.add.assert_not_called()
-        task_mock_session.commit.assert_not_called()
-        task_mock_session.refresh.assert_not_called()
-        assert updated_task is None
+        assert updated_task.description == "New description"
+        assert updated_task.title == mock_task["title"]
+        assert updated_task.status == mock_task["status"]
 
-    async def test_delete_task(self, task_repository, task_mock_session, create_user):
-        user = await create_user
-        task_mock_session.exec.return_value = Mock(rowcount=1)
+    async def test_partial_update_task_not_found(
+        self, sqlite_session: AsyncSession, sqlite_user: User
+    ):
+        repository = TaskSQLRepository(sqlite_session)
+        task_update = TaskUpdate.model_construct(description="New description")
+
+        with pytest.raises(NotFoundException):
+            _ = await repository.partial_update_task(
+                user_id=cast(int, sqlite_user.id), task_id=9999, task_update=task_update
+            )
 
-        result = await task_repository.delete_task(
-            user_id=cast(int, user.id), task_id=1
+    async def test_delete_task(self, sqlite_session: AsyncSession, sqlite_user: User):
+        repository = TaskSQLRepository(sqlite_session)
+        created_task = await repository.create_task(
+            user_id=cast(int, sqlite_user.id),
+            task_create=TaskCreate(title="To delete", status="pending"),
         )
 
-        # Verify the query is a delete statement for Task with the correct ID
-        assert task_mock_session.exec.call_count == 1
-        query = task_mock_session.exec.call_args[0][0]
-        expected_query = delete(Task).where(
-            Task.id == 1 and Task.user_id == cast(int, user.id)
+        result = await repository.delete_task(
+            user_id=cast(int, sqlite_user.id), task_id=cast(int, created_task.id)
         )
-        assert str(query) == str(
-            expected_query
-        ), f"Expected query {expected_query}, got {query}"
-        task_mock_session.commit.assert_called_once()
+
         assert result is True
+        with pytest.raises(NotFoundException):
+            _ = await repository.get_task_by_id(
+                user_id=cast(int, sqlite_user.id), task_id=cast(int, created_task.id)
+            )
 
     async def test_delete_task_not_found(
-        self, task_repository, task_mock_session, create_user
+        self, sqlite_session: AsyncSession, sqlite_user: User
     ):
-        user = await create_user
-        task_mock_session.exec.return_value = Mock(rowcount=0)
+        repository = TaskSQLRepository(sqlite_session)
 
-        result = await task_repository.delete_task(
-            user_id=cast(int, user.id), task_id=9999
-        )
+        with pytest.raises(NotFoundException):
+            _ = await repository.delete_task(
+                user_id=cast(int, sqlite_user.id), task_id=9999
+            )
 
-        # Verify the query is a delete statement for Task with the correct ID
-        assert task_mock_session.exec.call_count == 1
-        query = task_mock_session.exec.call_args[0][0]
-        expected_query = delete(Task).where(
-            Task.id == 9999 and Task.user_id == cast(int, user.id)
+    async def test_delete_task_without_returning(
+        self, sqlite_session: AsyncSession, sqlite_user: User
+    ):
+        repository = TaskSQLRepository(sqlite_session)
+        created_task = await repository.create_task(
+            user_id=cast(int, sqlite_user.id),
+            task_create=TaskCreate(title="To delete", status="pending"),
         )
-        assert str(query) == str(
-            expected_query
-        ), f"Expected query {expected_query}, got {query}"
-        task_mock_session.commit.assert_called_once()
-        assert result is False
 
-    async def test_delete_task_exception(
-        self, task_repository, task_mock_session, create_user
-    ):
-        user = await create_user
+        with patch.object(
+            sqlite_session.get_bind().dialect, "delete_returning", False
+        ):
+            result = await repository.delete_task(
+                user_id=cast(int, sqlite_user.id), task_id=cast(int, created_task.id)
+            )
+            with pytest.raises(NotFoundException):
+                _ = await repository.delete_task(
+                    user_id=cast(int, sqlite_user.id),
+                    task_id=cast(int, created_task.id),
+                )
+
+        assert result is True
+
+    async def test_delete_task_exception(self, task_repository, task_mock_session):
         task_mock_session.exec.side_effect = Exception("DB Error")
 
-        result = await task_repository.delete_task(
-            task_id=1, user_id=cast(int, user.id)
-        )
+        with pytest.raises(Exception):
+            _ = await task_repository.delete_task(task_id=1, user_id=1)
 
         task_mock_session.commit.assert_not_called()
-        assert result is False
 
     async def test_create_task_exception(
         self, task_repository, task_mock_session, mock_task, create_user
@@ -498,3 +573,555 @@ class TestTaskSQLRepository:
         )
         task_mock_session.commit.assert_not_called()
         task_mock_session.refresh.assert_not_called()
+
+
+@pytest.mark.asyncio
+class TestTaskKeysetPagination:
+    user_id: int = 424242
+
+    async def test_cursor_round_trip(self):
+        assert decode_cursor(encode_cursor(1234)) == 1234
+
+    async def test_invalid_cursor(self):
+        with pytest.raises(AppException):
+            _ = decode_cursor("not-a-cursor")
+
+    async def test_in_memory_pages_are_disjoint_and_ordered(
+        self, in_memory_task_repository: TaskInMemoryRepository, mock_task: TaskTyped
+    ):
+        for _ in range(5):
+            _ = await in_memory_task_repository.create_task(
+                user_id=self.user_id,
+                task_create=TaskCreate(
+                    title=mock_task["title"], status=mock_task["status"]
+                ),
+            )
+        first_page = await in_memory_task_repository.get_all_tasks(
+            user_id=self.user_id, limit=2
+        )
+        second_page = await in_memory_task_repository.get_all_tasks(
+            user_id=self.user_id, after=cast(int, first_page[-1].id), limit=2
+        )
+        first_ids = [task.id for task in first_page]
+        second_ids = [task.id for task in second_page]
+        assert len(first_ids) == len(second_ids) == 2
+        assert first_ids == sorted(first_ids)
+        assert max(cast(list[int], first_ids)) < min(cast(list[int], second_ids))
+
+    async def test_sql_page_query_seeks_by_user_and_id(
+        self, task_repository: TaskSQLRepository, task_mock_session: Mock
+    ):
+        task_mock_session.exec.return_value = Mock(all=Mock(return_value=[]))
+
+        tasks = await task_repository.get_all_tasks(
+            user_id=self.user_id, after=10, limit=3
+        )
+
+        query = task_mock_session.exec.call_args[0][0]
+        expected_query = (
+            select(Task)
+            .where(Task.user_id == self.user_id)
+            .where(Task.id > 10)
+            .order_by(Task.id)
+            .limit(3)
+        )
+        assert str(query) == str(expected_query)
+        assert tasks == []
+
+
+@pytest.mark.asyncio
+class TestTaskBatchOperations:
+    user_id: int = 434343
+
+    async def test_sql_create_tasks_returns_rows_in_input_order(
+        self, sqlite_session: AsyncSession, sqlite_user: User
+    ):
+        repository = TaskSQLRepository(sqlite_session)
+        titles = [f"Batch {i}" for i in range(5)]
+
+        created = await repository.create_tasks(
+            user_id=cast(int, sqlite_user.id),
+            task_creates=[TaskCreate(title=title, status="pending") for title in titles],
+        )
+
+        assert [task.title for task in created] == titles
+        assert all(task.id is not None for task in created)
+        assert all(task.user_id == sqlite_user.id for task in created)
+
+    async def test_sql_create_tasks_without_returning(
+        self, sqlite_session: AsyncSession, sqlite_user: User
+    ):
+        repository = TaskSQLRepository(sqlite_session)
+
+        with patch.object(
+            sqlite_session.get_bind().dialect,
+            "insert_executemany_returning_sort_by_parameter_order",
+            False,
+        ):
+            created = await repository.create_tasks(
+                user_id=cast(int, sqlite_user.id),
+                task_creates=[
+                    TaskCreate(title="First", status="pending"),
+                    TaskCreate(title="Second", status="pending"),
+                ],
+            )
+
+        assert [task.title for task in created] == ["First", "Second"]
+        assert all(task.id is not None for task in created)
+
+    async def test_sql_update_tasks_reports_missing_items(
+        self, sqlite_session: AsyncSession, sqlite_user: User
+    ):
+        repository = TaskSQLRepository(sqlite_session)
+        user_id = cast(int, sqlite_user.id)
+        first, second = await repository.create_tasks(
+            user_id=user_id,
+            task_creates=[
+                TaskCreate(title="First", status="pending"),
+                TaskCreate(title="Second", status="pending"),
+            ],
+        )
+
+        updated = await repository.update_tasks(
+            user_id=user_id,
+            task_updates=[
+                TaskBatchUpdateItem(id=cast(int, second.id), status="completed"),
+                TaskBatchUpdateItem(id=9999, title="Missing"),
+                TaskBatchUpdateItem(id=cast(int, first.id), description="Edited"),
+            ],
+        )
+
+        assert updated[1] is None
+        assert updated[0] is not None and updated[0].status == "completed"
+        assert updated[0].title == "Second"
+        assert updated[2] is not None and updated[2].description == "Edited"
+        assert updated[2].status == "pending"
+
+    async def test_sql_update_tasks_ignores_other_users_tasks(
+        self, sqlite_session: AsyncSession, sqlite_user: User
+    ):
+        repository = TaskSQLRepository(sqlite_session)
+        task = await repository.create_task(
+            user_id=cast(int, sqlite_user.id),
+            task_create=TaskCreate(title="Mine", status="pending"),
+        )
+        task_id = cast(int, task.id)
+
+        updated = await repository.update_tasks(
+            user_id=self.user_id,
+            task_updates=[TaskBatchUpdateItem(id=task_id, title="Theirs")],
+        )
+
+        assert updated == [None]
+        fetched = await repository.get_task_by_id(
+            user_id=cast(int, sqlite_user.id), task_id=task_id
+        )
+        assert fetched.title == "Mine"
+
+    @pytest.mark.parametrize("delete_returning", [True, False])
+    async def test_sql_delete_tasks(
+        self,
+        sqlite_session: AsyncSession,
+        sqlite_user: User,
+        delete_returning: bool,
+    ):
+        repository = TaskSQLRepository(sqlite_session)
+        user_id = cast(int, sqlite_user.id)
+        created = await repository.create_tasks(
+            user_id=user_id,
+            task_creates=[
+                TaskCreate(title=f"Delete {i}", status="pending") for i in range(3)
+            ],
+        )
+        ids = [cast(int, task.id) for task in created]
+
+        with patch.object(
+            sqlite_session.get_bind().dialect, "delete_returning", delete_returning
+        ):
+            deleted = await repository.delete_tasks(
+                user_id=user_id, task_ids=[ids[0], ids[2], 9999]
+            )
+
+        assert deleted == {ids[0], ids[2]}
+        remaining = await sqlite_session.exec(
+            select(Task.id).where(Task.user_id == user_id)
+        )
+        assert remaining.all() == [ids[1]]
+
+    async def test_in_memory_batch_round_trip(
+        self, in_memory_task_repository: TaskInMemoryRepository
+    ):
+        created = await in_memory_task_repository.create_tasks(
+            user_id=self.user_id,
+            task_creates=[
+                TaskCreate(title="First", status="pending"),
+                TaskCreate(title="Second", status="pending"),
+            ],
+        )
+        ids = [cast(int, task.id) for task in created]
+
+        updated = await in_memory_task_repository.update_tasks(
+            user_id=self.user_id,
+            task_updates=[
+                TaskBatchUpdateItem(id=ids[0], status="completed"),
+                TaskBatchUpdateItem(id=-1, title="Missing"),
+            ],
+        )
+        deleted = await in_memory_task_repository.delete_tasks(
+            user_id=self.user_id, task_ids=[ids[1], -1]
+        )
+
+        assert updated[0] is not None and updated[0].status == "completed"
+        assert updated[0].title == "First"
+        assert updated[1] is None
+        assert deleted == {ids[1]}
+
+
+@pytest.mark.asyncio
+class TestTaskInMemoryIndexes:
+    user_id: int = 454545
+    other_user_id: int = 464646
+
+    async def test_ids_are_not_reused_after_delete(
+        self, in_memory_task_repository: TaskInMemoryRepository
+    ):
+        first = await in_memory_task_repository.create_task(
+            user_id=self.user_id, task_create=TaskCreate(title="First", status="pending")
+        )
+        _ = await in_memory_task_repository.delete_task(
+            user_id=self.user_id, task_id=cast(int, first.id)
+        )
+        second = await in_memory_task_repository.create_task(
+            user_id=self.user_id, task_create=TaskCreate(title="Second", status="pending")
+        )
+
+        assert cast(int, second.id) > cast(int, first.id)
+
+    async def test_missing_and_foreign_tasks_are_not_found(
+        self, in_memory_task_repository: TaskInMemoryRepository
+    ):
+        task = await in_memory_task_repository.create_task(
+            user_id=self.user_id, task_create=TaskCreate(title="Mine", status="pending")
+        )
+
+        for user_id, task_id in ((self.other_user_id, task.id), (self.user_id, -1)):
+            with pytest.raises(NotFoundException):
+                _ = await in_memory_task_repository.get_task_by_id(
+                    user_id=user_id, task_id=cast(int, task_id)
+                )
+        with pytest.raises(NotFoundException):
+            _ = await in_memory_task_repository.delete_task(
+                user_id=self.other_user_id, task_id=cast(int, task.id)
+            )
+
+    async def test_concurrent_writers_keep_the_user_index_consistent(
+        self, in_memory_task_repository: TaskInMemoryRepository
+    ):
+        user_id = self.user_id + 1
+        batches = await asyncio.gather(
+            *(
+                in_memory_task_repository.create_tasks(
+                    user_id=user_id,
+                    task_creates=[
+                        TaskCreate(title=f"Task {n}", status="pending") for n in range(20)
+                    ],
+                )
+                for _ in range(10)
+            )
+        )
+        created_ids = [cast(int, task.id) for batch in batches for task in batch]
+        deleted = await in_memory_task_repository.delete_tasks(
+            user_id=user_id, task_ids=created_ids[::2]
+        )
+
+        listed_ids = [
+            task.id for task in await in_memory_task_repository.get_all_tasks(user_id=user_id)
+        ]
+        assert len(set(created_ids)) == 200
+        assert len(deleted) == 100
+        assert listed_ids == sorted(set(created_ids) - deleted)
+
+
+@pytest.mark.asyncio
+class TestTaskListQuerySQL:
+    titles: tuple[str, ...] = ("banana", "apple", "cherry", "apricot", "a_b", "axb")
+
+    async def fill(self, repository: TaskSQLRepository, user: User) -> None:
+        _ = await repository.create_tasks(
+            user_id=cast(int, user.id),
+            task_creates=[
+                TaskCreate(
+                    title=title,
+                    description="x" * 1000,
+                    status="completed" if n % 2 else "pending",
+                )
+                for n, title in enumerate(self.titles)
+            ],
+        )
+
+    async def test_projection_loads_only_selected_columns(
+        self, sqlite_session: AsyncSession, sqlite_user: User
+    ):
+        repository = TaskSQLRepository(sqlite_session)
+        await self.fill(repository, sqlite_user)
+
+        with patch.object(sqlite_session, "exec", wraps=sqlite_session.exec) as exec_:
+            tasks = await repository.get_all_tasks(
+                user_id=cast(int, sqlite_user.id),
+                query=TaskListQuery(fields="title", status="completed"),
+            )
+
+        statement = str(exec_.call_args[0][0])
+        assert "tasks.description" not in statement.split("FROM")[0]
+        assert [task.title for task in tasks] == ["apple", "apricot", "axb"]
+        assert "description" not in tasks[0].model_fields_set
+
+    async def test_title_prefix_is_escaped(
+        self, sqlite_session: AsyncSession, sqlite_user: User
+    ):
+        repository = TaskSQLRepository(sqlite_session)
+        await self.fill(repository, sqlite_user)
+
+        tasks = await repository.get_all_tasks(
+            user_id=cast(int, sqlite_user.id), query=TaskListQuery(title_prefix="a_")
+        )
+
+        # "_" is a LIKE wildcard; it must only match itself.
+        assert [task.title for task in tasks] == ["a_b"]
+
+    @pytest.mark.parametrize("sort", [TaskSort.TITLE, TaskSort.TITLE_DESC, TaskSort.ID_DESC])
+    async def test_keyset_pages_follow_the_sort(
+        self, sqlite_session: AsyncSession, sqlite_user: User, sort: TaskSort
+    ):
+        repository = TaskSQLRepository(sqlite_session)
+        await self.fill(repository, sqlite_user)
+        query = TaskListQuery(sort=sort, fields="title")
+        seen: list[Task] = []
+        while True:
+            page = await repository.get_all_tasks(
+                user_id=cast(int, sqlite_user.id),
+                after=cast(int, seen[-1].id) if seen else None,
+                after_value=seen[-1].title if seen else None,
+                limit=2,
+                query=query,
+            )
+            if not page:
+                break
+            seen += page
+
+        everything = await repository.get_all_tasks(user_id=cast(int, sqlite_user.id))
+        by_title = sorted(everything, key=lambda task: (task.title, task.id))
+        expected = {
+            TaskSort.TITLE: by_title,
+            TaskSort.TITLE_DESC: by_title[::-1],
+            TaskSort.ID_DESC: everything[::-1],
+        }[sort]
+        assert [task.id for task in seen] == [task.id for task in expected]
+
+
+@pytest.mark.asyncio
+class TestTaskSearchSQL:
+    tasks: tuple[tuple[str, str | None], ...] = (
+        ("Quarterly report", "Send the report to finance"),
+        ("Buy milk", None),
+        ("Review budget", "Numbers for the quarterly report"),
+        ("Reporting dashboard", "Charts"),
+        ("Call the bank", "About the report"),
+    )
+
+    async def fill(self, repository: TaskSQLRepository, user: User) -> list[Task]:
+        return await repository.create_tasks(
+            user_id=cast(int, user.id),
+            task_creates=[
+                TaskCreate(title=title, description=description)
+                for title, description in self.tasks
+            ],
+        )
+
+    async def search(
+        self, repository: TaskSQLRepository, user: User, *terms: str
+    ) -> list[str | None]:
+        hits = await repository.search_tasks(
+            user_id=cast(int, user.id), terms=list(terms), limit=10
+        )
+        return [task.title for task, _ in hits]
+
+    async def test_title_matches_rank_first_and_last_term_is_a_prefix(
+        self, sqlite_session: AsyncSession, sqlite_user: User
+    ):
+        repository = TaskSQLRepository(sqlite_session)
+        _ = await self.fill(repository, sqlite_user)
+
+        # "Reporting" stems to "report"; both title hits outrank description hits.
+        assert set((await self.search(repository, sqlite_user, "report"))[:2]) == {
+            "Quarterly report",
+            "Reporting dashboard",
+        }
+        assert await self.search(repository, sqlite_user, "quarterly", "rep") == [
+            "Quarterly report",
+            "Review budget",
+        ]
+        assert await self.search(repository, sqlite_user, "mil") == ["Buy milk"]
+
+    async def test_index_follows_updates_deletes_and_owner(
+        self, sqlite_session: AsyncSession, sqlite_user: User
+    ):
+        repository = TaskSQLRepository(sqlite_session)
+        tasks = await self.fill(repository, sqlite_user)
+        _ = await repository.create_task(
+            user_id=cast(int, sqlite_user.id) + 1, task_create=TaskCreate(title="Buy milk too")
+        )
+
+        _ = await repository.update_task(
+            user_id=cast(int, sqlite_user.id),
+            task_id=cast(int, tasks[1].id),
+            task_update=TaskUpdate(title="Buy bread"),
+        )
+        _ = await repository.delete_task(
+            user_id=cast(int, sqlite_user.id), task_id=cast(int, tasks[3].id)
+        )
+
+        assert await self.search(repository, sqlite_user, "milk") == []
+        assert await self.search(repository, sqlite_user, "bread") == ["Buy bread"]
+        assert "Reporting dashboard" not in await self.search(repository, sqlite_user, "report")
+
+    async def test_keyset_pages_cover_every_hit_once(
+        self, sqlite_session: AsyncSession, sqlite_user: User
+    ):
+        repository = TaskSQLRepository(sqlite_session)
+        _ = await self.fill(repository, sqlite_user)
+        everything = await self.search(repository, sqlite_user, "report")
+        seen: list[tuple[Task, float]] = []
+        while True:
+            page = await repository.search_tasks(
+                user_id=cast(int, sqlite_user.id),
+                terms=["report"],
+                limit=2,
+                after=(seen[-1][1], cast(int, seen[-1][0].id)) if seen else None,
+            )
+            if not page:
+                break
+            seen += page
+
+        assert len(everything) == 4
+        assert [task.title for task, _ in seen] == everything
+
+    async def test_unsupported_dialect_is_not_a_server_error(
+        self, sqlite_session: AsyncSession, sqlite_user: User
+    ):
+        repository = TaskSQLRepository(sqlite_session)
+        dialect = Mock()
+        dialect.name = "mysql"
+
+        with patch.object(TaskSQLRepository, "_TaskSQLRepository__dialect", return_value=dialect):
+            with pytest.raises(AppException) as exc_info:
+                _ = await self.search(repository, sqlite_user, "report")
+
+        assert exc_info.value.status_code == 501
+
+
+@pytest.mark.asyncio
+class TestTaskStatsSQL:
+    async def assert_counts_match(self, repository: TaskSQLRepository, user: User) -> None:
+        tasks = await repository.get_all_tasks(user_id=cast(int, user.id))
+        stats = await repository.get_task_stats(user_id=cast(int, user.id))
+        assert stats.model_dump() == {
+            "pending": sum(task.status == "pending" for task in tasks),
+            "in_progress": sum(task.status == "in-progress" for task in tasks),
+            "completed": sum(task.status == "completed" for task in tasks),
+            "total": len(tasks),
+        }
+
+    async def test_counters_follow_every_write(
+        self, sqlite_session: AsyncSession, sqlite_user: User
+    ):
+        repository = TaskSQLRepository(sqlite_session)
+        user_id = cast(int, sqlite_user.id)
+
+        first = await repository.create_task(user_id=user_id, task_create=TaskCreate(title="a"))
+        batch = await repository.create_tasks(
+            user_id=user_id,
+            task_creates=[
+                TaskCreate(title=f"b{n}", status="completed" if n % 2 else "in-progress")
+                for n in range(5)
+            ],
+        )
+        await self.assert_counts_match(repository, sqlite_user)
+
+        _ = await repository.update_task(
+            user_id=user_id,
+            task_id=cast(int, first.id),
+            task_update=TaskUpdate(title="a", status="completed"),
+        )
+        _ = await repository.update_tasks(
+            user_id=user_id,
+            task_updates=[
+                TaskBatchUpdateItem(id=cast(int, batch[0].id), status="pending"),
+                TaskBatchUpdateItem(id=cast(int, batch[1].id), title="renamed only"),
+                TaskBatchUpdateItem(id=9999, status="pending"),
+            ],
+        )
+        await self.assert_counts_match(repository, sqlite_user)
+
+        _ = await repository.delete_task(user_id=user_id, task_id=cast(int, batch[2].id))
+        _ = await repository.delete_tasks(
+            user_id=user_id, task_ids=[cast(int, batch[3].id), 9999]
+        )
+        await self.assert_counts_match(repository, sqlite_user)
+        assert (await repository.get_task_stats(user_id=user_id + 1)).total == 0
+
+    async def test_failed_write_leaves_counters_alone(
+        self, sqlite_session: AsyncSession, sqlite_user: User
+    ):
+        repository = TaskSQLRepository(sqlite_session)
+        _ = await repository.create_task(
+            user_id=cast(int, sqlite_user.id), task_create=TaskCreate(title="a")
+        )
+
+        with pytest.raises(NotFoundException):
+            _ = await repository.delete_task(user_id=cast(int, sqlite_user.id), task_id=9999)
+        await sqlite_session.rollback()
+
+        await self.assert_counts_match(repository, sqlite_user)
+
+    async def test_rebuild_corrects_drift(
+        self, sqlite_session: AsyncSession, sqlite_user: User
+    ):
+        repository = TaskSQLRepository(sqlite_session)
+        _ = await repository.create_tasks(
+            user_id=cast(int, sqlite_user.id),
+            task_creates=[TaskCreate(title="a"), TaskCreate(title="b", status="completed")],
+        )
+        # A change made behind the repository's back.
+        _ = await sqlite_session.exec(delete(Task).where(Task.title == "a"))  # pyright: ignore[reportArgumentType]
+        await sqlite_session.commit()
+
+        assert await repository.rebuild_task_stats() == 1
+
+        await self.assert_counts_match(repository, sqlite_user)
+
+    async def test_rebuild_runs_in_batches_of_users(
+        self, sqlite_session: AsyncSession, sqlite_user: User
+    ):
+        repository = TaskSQLRepository(sqlite_session)
+        others = [
+            User(username=f"user-{n}", email=f"user-{n}@x.io", hashed_password="x")
+            for n in range(2)
+        ]
+        sqlite_session.add_all(others)
+        await sqlite_session.commit()
+        other_id = cast(
+            int, (await sqlite_session.exec(select(User.id).where(User.username == "user-0"))).one()
+        )
+        _ = await repository.create_task(
+            user_id=cast(int, sqlite_user.id), task_create=TaskCreate(title="a")
+        )
+        _ = await repository.create_task(user_id=other_id, task_create=TaskCreate(title="b"))
+        # Every task of the second user went behind the repository's back.
+        _ = await sqlite_session.exec(delete(Task).where(Task.title == "b"))  # pyright: ignore[reportArgumentType]
+        await sqlite_session.commit()
+
+        assert await repository.rebuild_task_stats(batch_size=2) == 3
+
+        assert (await repository.get_task_stats(user_id=cast(int, sqlite_user.id))).total == 1
+        assert (await repository.get_task_stats(user_id=other_id)).total == 0
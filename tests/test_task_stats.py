@@ -0,0 +1,42 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+import pytest
+from app.core.task_stats import RECONCILE_LOCK_KEY, reconcile_leadership
+
+
+def postgres_session(locked: bool) -> MagicMock:
+    conn = MagicMock()
+    conn.scalar = AsyncMock(return_value=locked)
+    conn.execute = AsyncMock()
+    session = MagicMock()
+    session.get_bind.return_value.dialect.name = "postgresql"
+    session.connection = AsyncMock(return_value=conn)
+    session.__aenter__ = AsyncMock(return_value=session)
+    session.__aexit__ = AsyncMock(return_value=None)
+    return session
+
+
+@pytest.mark.asyncio
+class TestReconcileLeadership:
+    async def test_only_the_advisory_lock_holder_leads(self):
+        session = postgres_session(locked=False)
+
+        with patch("app.core.task_stats.AsyncSessionLocal", MagicMock(return_value=session)):
+            async with reconcile_leadership() as leader:
+                assert not leader
+
+        conn = session.connection.return_value
+        assert conn.scalar.await_args.args[1] == {"key": RECONCILE_LOCK_KEY}
+        conn.execute.assert_not_awaited()
+
+    async def test_leader_releases_the_lock(self):
+        session = postgres_session(locked=True)
+
+        with patch("app.core.task_stats.AsyncSessionLocal", MagicMock(return_value=session)):
+            async with reconcile_leadership() as leader:
+                assert leader
+
+        session.connection.return_value.execute.assert_awaited_once()
+
+    async def test_sqlite_always_leads(self):
+        async with reconcile_leadership() as leader:
+            assert leader
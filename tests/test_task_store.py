@@ -0,0 +1,130 @@
+from pathlib import Path
+from typing import cast
+import pytest
+from app.repositories import TaskInMemoryRepository
+from app.repositories.in_memory_repository import CompactTaskStore, DictTaskStore, TaskStore
+from app.schemas import TaskBatchUpdateItem, TaskCreate, TaskUpdate
+from app.schemas.task_schemas import TaskStatus
+
+USER_ID: int = 7
+OTHER_USER_ID: int = 8
+
+
+async def fill(repository: TaskInMemoryRepository) -> list[int]:
+    created = await repository.create_tasks(
+        user_id=USER_ID,
+        task_creates=[
+            TaskCreate(title=f"Task {n}", description=None if n % 2 else f"Détail {n}")
+            for n in range(6)
+        ],
+    )
+    _ = await repository.create_task(
+        user_id=OTHER_USER_ID, task_create=TaskCreate(title="Not yours")
+    )
+    return [cast(int, task.id) for task in created]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("store", [DictTaskStore, CompactTaskStore])
+class TestTaskStores:
+    async def test_repository_behaves_the_same_on_both_stores(
+        self, store: type[TaskStore]
+    ):
+        repository = TaskInMemoryRepository(store=store())
+        ids = await fill(repository)
+
+        _ = await repository.update_task(
+            user_id=USER_ID,
+            task_id=ids[0],
+            task_update=TaskUpdate(title="Renamed", status=TaskStatus.COMPLETED),
+        )
+        [updated] = await repository.update_tasks(
+            user_id=USER_ID,
+            task_updates=[TaskBatchUpdateItem(id=ids[1], description="Added")],
+        )
+        _ = await repository.delete_task(user_id=USER_ID, task_id=ids[2])
+        page = await repository.get_all_tasks(user_id=USER_ID, after=ids[0], limit=2)
+
+        first = await repository.get_task_by_id(user_id=USER_ID, task_id=ids[0])
+        assert (first.title, first.description, first.status) == (
+            "Renamed",
+            None,
+            TaskStatus.COMPLETED,
+        )
+        assert updated is not None and updated.title == "Task 1"
+        assert [task.id for task in page] == [ids[1], ids[3]]
+        assert page[0].description == "Added"
+        assert page[1].description is None
+        assert len(repository.store) == 6
+        assert await repository.delete_tasks(user_id=OTHER_USER_ID, task_ids=ids) == set()
+
+
+@pytest.mark.asyncio
+class TestCompactTaskStore:
+    async def test_snapshot_round_trip(self, tmp_path: Path):
+        store = CompactTaskStore()
+        repository = TaskInMemoryRepository(store=store)
+        ids = await fill(repository)
+        _ = await repository.delete_task(user_id=USER_ID, task_id=ids[-1])
+        _ = await repository.update_task(
+            user_id=USER_ID, task_id=ids[0], task_update=TaskUpdate(title="Renamed")
+        )
+
+        store.snapshot(tmp_path / "tasks.snap")
+        loaded = CompactTaskStore.load(tmp_path / "tasks.snap")
+        restored = TaskInMemoryRepository(store=loaded)
+
+        assert [
+            task.model_dump() for task in await restored.get_all_tasks(user_id=USER_ID)
+        ] == [task.model_dump() for task in await repository.get_all_tasks(user_id=USER_ID)]
+        assert len(loaded) == 6
+        assert loaded.get(ids[-1]) is None
+        created = await restored.create_task(
+            user_id=OTHER_USER_ID, task_create=TaskCreate(title="After restart")
+        )
+        assert cast(int, created.id) > max(ids)
+        assert [task.title for task in await restored.get_all_tasks(user_id=OTHER_USER_ID)] == [
+            "Not yours",
+            "After restart",
+        ]
+
+    async def test_compact_drops_deleted_rows_and_stale_text(self):
+        store = CompactTaskStore()
+        repository = TaskInMemoryRepository(store=store)
+        ids = await fill(repository)
+        for task_id in ids[:3]:
+            _ = await repository.delete_task(user_id=USER_ID, task_id=task_id)
+        _ = await repository.update_task(
+            user_id=USER_ID, task_id=ids[3], task_update=TaskUpdate(title="Renamed")
+        )
+        before = len(store.text)
+
+        store.compact()
+
+        assert list(store.ids) == [*ids[3:], ids[-1] + 1]
+        assert len(store.text) < before
+        assert store.garbage_bytes == 0
+        assert cast(str, store.get(ids[3]).title) == "Renamed"  # pyright: ignore[reportOptionalMemberAccess]
+
+    async def test_load_rejects_truncated_snapshots(self, tmp_path: Path):
+        store = CompactTaskStore()
+        repository = TaskInMemoryRepository(store=store)
+        for n in range(10):
+            _ = await repository.create_task(
+                user_id=1, task_create=TaskCreate(title=f"Task {n}", description="x" * 20)
+            )
+        path = tmp_path / "tasks.snap"
+        store.snapshot(path)
+        data = path.read_bytes()
+
+        for size in (len(data) - 100, 40, len(data) + 1):
+            _ = path.write_bytes((data + b"\0")[:size])
+            with pytest.raises(ValueError):
+                _ = CompactTaskStore.load(path)
+
+    async def test_load_rejects_other_files(self, tmp_path: Path):
+        path = tmp_path / "not-a-snapshot"
+        _ = path.write_bytes(b"\0" * 64)
+
+        with pytest.raises(ValueError):
+            _ = CompactTaskStore.load(path)
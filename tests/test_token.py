@@ -0,0 +1,187 @@
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import cast
+from unittest.mock import patch
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from jose import ExpiredSignatureError, JWTError, jwt
+from app.utils.auth.jwt_backends import JoseBackend, KeySet, get_jwt_backend
+from app.utils.auth.token import (
+    ALGORITHM,
+    SECRET_KEY,
+    JWTAuthToken,
+    VerifiedTokenCache,
+)
+
+
+def make_token(minutes: float = 30) -> str:
+    expire = datetime.now(timezone.utc) + timedelta(minutes=minutes)
+    return jwt.encode(
+        {"username": "alice", "email": "alice@x.io", "uid": 1, "exp": expire},
+        key=cast(str, SECRET_KEY),
+        algorithm=cast(str, ALGORITHM),
+    )
+
+
+class TestVerifiedTokenCache:
+    def test_repeat_decodes_skip_verification(self):
+        auth = JWTAuthToken()
+        token = make_token()
+
+        with patch("app.utils.auth.jwt_backends.jose_jwt.decode", wraps=jwt.decode) as decode:
+            first = auth.decode_token_cached(token)
+            second = auth.decode_token_cached(token)
+
+        assert first == second
+        assert first["username"] == "alice"
+        decode.assert_called_once()
+        assert auth.verified_cache.snapshot() == {"hits": 1, "misses": 1, "entries": 1}
+
+    def test_entry_expires_with_the_token(self):
+        auth = JWTAuthToken()
+        token = make_token(minutes=1)
+        _ = auth.decode_token_cached(token)
+
+        with patch("app.utils.auth.token.time.time", return_value=10**11):
+            assert auth.verified_cache.get(token) is None
+        assert len(auth.verified_cache) == 0
+
+        with patch("jose.jwt.timegm", return_value=10**11):
+            with pytest.raises(ExpiredSignatureError):
+                _ = auth.decode_token_cached(token)
+
+    def test_invalid_tokens_are_not_cached(self):
+        auth = JWTAuthToken()
+
+        for _ in range(2):
+            with pytest.raises(JWTError):
+                _ = auth.decode_token_cached(make_token() + "x")
+
+        assert len(auth.verified_cache) == 0
+        assert auth.verified_cache.misses == 2
+
+    def test_evicts_least_recently_used_and_keys_by_hash(self):
+        cache = VerifiedTokenCache(max_entries=2)
+        cache.set("a", {"exp": 10**11})
+        cache.set("b", {"exp": 10**11})
+        _ = cache.get("a")
+        cache.set("c", {"exp": 10**11})
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert VerifiedTokenCache.key("a") in cache._entries  # pyright: ignore[reportPrivateUsage]
+        assert "a" not in cache._entries  # pyright: ignore[reportPrivateUsage]
+
+    def test_hits_return_a_copy(self):
+        cache = VerifiedTokenCache()
+        cache.set("a", {"exp": 10**11, "username": "alice"})
+
+        payload = cache.get("a")
+        assert payload is not None
+        payload["username"] = "mallory"
+
+        assert cache.get("a") == {"exp": 10**11, "username": "alice"}
+
+
+def write_ec_key(directory: Path, kid: str) -> Path:
+    private = ec.generate_private_key(ec.SECP256R1())
+    _ = (directory / f"{kid}.pem").write_bytes(
+        private.public_key().public_bytes(
+            serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+        )
+    )
+    private_file = directory.parent / f"{kid}.key"
+    _ = private_file.write_bytes(
+        private.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+    )
+    return private_file
+
+
+@pytest.fixture
+def public_keys_dir(tmp_path: Path) -> Path:
+    directory = tmp_path / "public"
+    directory.mkdir()
+    return directory
+
+
+class TestAsymmetricKeys:
+    def test_es256_token_carries_kid_and_verifies_without_private_key(
+        self, public_keys_dir: Path
+    ):
+        private_file = write_ec_key(public_keys_dir, "2025-01")
+        issuer = JWTAuthToken(
+            keys=KeySet.from_files("ES256", str(private_file), "2025-01", str(public_keys_dir))
+        )
+        verifier = JWTAuthToken(
+            keys=KeySet.from_files("ES256", None, None, str(public_keys_dir))
+        )
+
+        token, _ = issuer.access_token(data={"username": "alice", "email": "a@x.io"})
+
+        assert JoseBackend().unverified_kid(token) == "2025-01"
+        assert verifier.decode_token(token)["username"] == "alice"
+        with pytest.raises(RuntimeError):
+            _ = verifier.access_token(data={"username": "alice", "email": "a@x.io"})
+
+    def test_rotated_out_key_still_verifies_old_tokens(self, public_keys_dir: Path):
+        old_private = write_ec_key(public_keys_dir, "old")
+        new_private = write_ec_key(public_keys_dir, "new")
+        old_issuer = JWTAuthToken(
+            keys=KeySet.from_files("ES256", str(old_private), "old", str(public_keys_dir))
+        )
+        new_issuer = JWTAuthToken(
+            keys=KeySet.from_files("ES256", str(new_private), "new", str(public_keys_dir))
+        )
+
+        token, _ = old_issuer.access_token(data={"username": "alice", "email": "a@x.io"})
+
+        assert new_issuer.decode_token(token)["username"] == "alice"
+
+    def test_unknown_kid_and_symmetric_token_are_rejected(self, public_keys_dir: Path):
+        private_file = write_ec_key(public_keys_dir, "k1")
+        verifier = JWTAuthToken(
+            keys=KeySet.from_files("ES256", str(private_file), "k1", str(public_keys_dir))
+        )
+        foreign = jwt.encode(
+            {"username": "mallory"}, "secret", algorithm="HS256", headers={"kid": "k2"}
+        )
+
+        with pytest.raises(JWTError, match="Unknown key id"):
+            _ = verifier.decode_token(foreign)
+        with pytest.raises(JWTError):
+            _ = verifier.decode_token(make_token())
+
+    def test_signing_key_needs_a_matching_public_key(self, public_keys_dir: Path):
+        private_file = write_ec_key(public_keys_dir, "k1")
+
+        with pytest.raises(ValueError):
+            _ = KeySet.from_files("ES256", str(private_file), "k2", str(public_keys_dir))
+
+
+class TestPyJWTBackend:
+    def test_maps_errors_to_jose_exceptions(self):
+        secret = "s" * 32  # PyJWT warns about shorter HMAC keys
+        auth = JWTAuthToken(
+            backend=get_jwt_backend("pyjwt"), keys=KeySet.symmetric(secret)
+        )
+        token, _ = auth.access_token(data={"username": "alice", "email": "a@x.io"})
+        expired = jwt.encode(
+            {"username": "alice", "exp": datetime.now(timezone.utc) - timedelta(minutes=1)},
+            secret,
+            algorithm="HS256",
+        )
+
+        assert auth.decode_token(token)["username"] == "alice"
+        with pytest.raises(ExpiredSignatureError):
+            _ = auth.decode_token(expired)
+        with pytest.raises(JWTError):
+            _ = auth.decode_token(token + "x")
+
+    def test_unknown_backend_is_a_config_error(self):
+        with pytest.raises(ValueError):
+            _ = get_jwt_backend("nope")